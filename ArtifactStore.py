@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class ArtifactStore:
+    """
+    On-disk registry of fitted models (vectorizers, clusterers, salary pipelines).
+    Each artifact is stored under <root>/<name>/<key>/ where the key is a
+    fingerprint of the input data and hyperparameters. Objects are written
+    uncompressed with joblib so their NumPy arrays load as memory maps,
+    next to a meta.json with training metrics and timestamps. Only the
+    newest `keep_versions` keys per name are kept.
+    """
+
+    DEFAULT_ROOT = "artifacts"
+
+    def __init__(self, root=DEFAULT_ROOT, keep_versions=3):
+        self.root = root
+        self.keep_versions = keep_versions
+
+    # ---- fingerprints ----
+    @staticmethod
+    def _update(digest, part):
+        if isinstance(part, pd.DataFrame):
+            for column in part.columns:
+                digest.update(str(column).encode())
+                ArtifactStore._update(digest, part[column])
+        elif isinstance(part, pd.Series):
+            values = part
+            if values.dtype == object:
+                # List-valued cells (e.g. must_have_skills) are not hashable as-is
+                values = values.map(
+                    lambda x: "\x1f".join(map(str, x)) if isinstance(x, (list, tuple, np.ndarray)) else x
+                )
+            digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+        elif sparse.issparse(part):
+            part = part.tocsr()
+            digest.update(str(part.shape).encode())
+            for array in (part.data, part.indices, part.indptr):
+                digest.update(np.ascontiguousarray(array).tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(str(part.shape).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+
+    @classmethod
+    def fingerprint(cls, *parts):
+        """
+        Stable key over data (DataFrame / Series / ndarray / sparse) and parameters (JSON-able).
+        """
+        digest = hashlib.sha1()
+        for part in parts:
+            cls._update(digest, part)
+        return digest.hexdigest()[:16]
+
+    # ---- storage ----
+    def _dir(self, name, key):
+        return os.path.join(self.root, name, key)
+
+    def exists(self, name, key):
+        return os.path.exists(os.path.join(self._dir(name, key), "meta.json"))
+
+    def save(self, name, key, obj, metrics=None, params=None):
+        directory = self._dir(name, key)
+        os.makedirs(directory, exist_ok=True)
+        joblib.dump(obj, os.path.join(directory, "artifact.joblib"))
+        meta = {
+            "name": name,
+            "key": key,
+            "created_at": datetime.now().isoformat(),
+            "metrics": metrics or {},
+            "params": params or {},
+        }
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2, default=str)
+        self._evict(name)
+        return meta
+
+    def load(self, name, key, mmap=True):
+        """
+        :return: (object, meta); large arrays are memory-mapped when `mmap` is True.
+        """
+        directory = self._dir(name, key)
+        obj = joblib.load(os.path.join(directory, "artifact.joblib"), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        return obj, meta
+
+    def versions(self, name):
+        """
+        Metadata of the stored versions of `name`, newest first.
+        """
+        base = os.path.join(self.root, name)
+        if not os.path.isdir(base):
+            return []
+        metas = []
+        for key in os.listdir(base):
+            meta_path = os.path.join(base, key, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    metas.append(json.load(f))
+        return sorted(metas, key=lambda meta: meta["created_at"], reverse=True)
+
+    def load_latest(self, name, mmap=True):
+        """
+        (object, meta) of the newest stored version of `name`, None if there is none.
+        """
+        versions = self.versions(name)
+        if not versions:
+            return None
+        return self.load(name, versions[0]["key"], mmap=mmap)
+
+    def _evict(self, name):
+        for meta in self.versions(name)[self.keep_versions:]:
+            shutil.rmtree(self._dir(name, meta["key"]), ignore_errors=True)
+
+    def load_or_fit(self, name, key, fit_fn, params=None):
+        """
+        Load the artifact stored under `key`, or call `fit_fn` and store its result.
+        :param fit_fn: Returns the fitted object, or (object, metrics dict).
+        :return: (object, meta); meta["cached"] tells whether a refit was avoided.
+        """
+        if self.exists(name, key):
+            obj, meta = self.load(name, key)
+            print(f"📦 Loaded {name} ({key}) trained {meta['created_at']}")
+            return obj, dict(meta, cached=True)
+
+        start = time.perf_counter()
+        result = fit_fn()
+        if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], dict):
+            obj, metrics = result
+        else:
+            obj, metrics = result, {}
+        metrics = dict(metrics, fit_seconds=round(time.perf_counter() - start, 3))
+        meta = self.save(name, key, obj, metrics=metrics, params=params)
+        return obj, dict(meta, cached=False)
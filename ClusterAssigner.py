@@ -0,0 +1,85 @@
+import numpy as np
+from sklearn.metrics import pairwise_distances_argmin_min
+
+
+class ClusterAssigner:
+    """
+    Label new postings against an already fitted clustering.
+    Rows are vectorized with the frozen columns of the fitted SkillTfidf
+    and assigned to the nearest centroid, or first folded into a
+    MiniBatchKMeans with partial_fit. Drift against the training reference
+    (mean centroid distance, out-of-vocabulary skill rate) decides when the
+    caller should fall back to a full refit.
+    """
+
+    UPDATE_MODES = ("nearest", "partial_fit")
+
+    def __init__(self, vectorizer, kmeans, reference, update="nearest",
+                 max_distance_ratio=1.25, max_oov_rate=0.25):
+        """
+        :param reference: Training statistics from `build_reference()`.
+        :param update: "nearest" keeps the centroids fixed, "partial_fit" moves them
+                       with the new rows (MiniBatchKMeans only).
+        :param max_distance_ratio: Refit when the mean distance of new rows exceeds
+                                   the training mean by this factor.
+        :param max_oov_rate: Refit when this share of new skill mentions is unknown.
+        """
+        if update not in self.UPDATE_MODES:
+            raise ValueError(f"Unknown update mode '{update}', expected one of {self.UPDATE_MODES}")
+        if update == "partial_fit" and not hasattr(kmeans, "partial_fit"):
+            raise ValueError("partial_fit updates need a MiniBatchKMeans model (algorithm='minibatch')")
+        self.vectorizer = vectorizer
+        self.kmeans = kmeans
+        self.reference = reference
+        self.update = update
+        self.max_distance_ratio = max_distance_ratio
+        self.max_oov_rate = max_oov_rate
+
+    @staticmethod
+    def build_reference(vectorizer, kmeans, X, skill_lists):
+        """
+        Training statistics the drift of later batches is measured against.
+        :param vectorizer: Fitted SkillTfidf.
+        """
+        _, distances = pairwise_distances_argmin_min(X, kmeans.cluster_centers_)
+        return {
+            "mean_distance": float(np.mean(distances)) if len(distances) else 0.0,
+            "oov_rate": vectorizer.oov_rate(skill_lists),
+        }
+
+    def _writable(self):
+        """
+        Internal helper: Models loaded from the artifact store hold read-only
+        memory maps, partial_fit needs its own arrays.
+        """
+        for name, value in vars(self.kmeans).items():
+            if isinstance(value, np.ndarray) and not value.flags.writeable:
+                setattr(self.kmeans, name, np.array(value))
+
+    def assign(self, skill_lists):
+        """
+        :param skill_lists: must_have_skills lists of the new postings.
+        :return: (labels, drift) where drift holds rows, distance_ratio, oov_rate,
+                 empty_rows and the `refit` verdict.
+        """
+        X = self.vectorizer.transform(skill_lists)
+        if self.update == "partial_fit" and X.shape[0]:
+            self._writable()
+            self.kmeans.partial_fit(X)
+
+        labels, distances = pairwise_distances_argmin_min(X, self.kmeans.cluster_centers_)
+        return labels, self.drift(X, distances, skill_lists)
+
+    def drift(self, X, distances, skill_lists):
+        rows = X.shape[0]
+        baseline = self.reference.get("mean_distance") or 0.0
+        distance_ratio = float(np.mean(distances)) / baseline if rows and baseline else 1.0
+        oov = self.vectorizer.oov_rate(skill_lists)
+        return {
+            "rows": int(rows),
+            "distance_ratio": round(distance_ratio, 4),
+            "oov_rate": round(oov, 4),
+            # Postings without a single known skill land on an arbitrary centroid
+            "empty_rows": int(np.sum(X.getnnz(axis=1) == 0)) if rows else 0,
+            "refit": distance_ratio > self.max_distance_ratio or oov > self.max_oov_rate,
+        }
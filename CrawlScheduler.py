@@ -0,0 +1,192 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from HostLimiter import HostLimiter
+from MongoAccess import MongoAccess
+from SkillEnrichmentPool import SkillEnrichmentPool
+from SkillStatsView import SkillStatsView
+from DetailPageCache import DetailPageCache
+from WebScrapingJustJoin import WebScrapingJustJoin
+from WebScrapingNoFluff import WebScrapingNoFluff
+
+
+class CrawlScheduler:
+    """
+    Crawl a list of keywords on both job boards concurrently.
+    Listing requests share one HostLimiter, so every host gets a fixed
+    concurrency and request-rate budget. Postings returned by several
+    keywords are merged by `jump_url`, stored once with every matching
+    term in `query_terms`, and their detail pages are fetched only once.
+    """
+
+    SOURCES = ("nofluffjobs", "justjoin")
+    FETCHERS = {"nofluffjobs": "_fetch_nofluff", "justjoin": "_fetch_justjoin"}
+    REPOSITORIES = {"nofluffjobs": MongoAccess.jobs_processed, "justjoin": MongoAccess.jobs_processed_jj}
+
+    def __init__(self, keywords, sources=SOURCES, workers=4, max_per_host=2, min_interval=1.0,
+                 clicks=3, max_items=300, enrich=True, enrich_workers=4, enrich_mode="http",
+                 report_interval=5.0):
+        """
+        :param keywords: Query terms to crawl on every source.
+        :param workers: Keyword tasks running concurrently per source.
+        :param max_per_host: Simultaneous requests (or browser sessions) per host.
+        :param min_interval: Minimum delay in seconds between request starts per host.
+        :param clicks: "See more" clicks per NoFluff listing.
+        :param max_items: Cap on JustJoin jobs per keyword.
+        :param enrich: Fetch must-have skills for new NoFluff postings afterwards.
+        :param report_interval: Seconds between progress reports.
+        """
+        self.keywords = list(dict.fromkeys(keywords))
+        self.sources = sources
+        self.workers = workers
+        self.clicks = clicks
+        self.max_items = max_items
+        self.enrich = enrich
+        self.enrich_workers = enrich_workers
+        self.enrich_mode = enrich_mode
+        self.report_interval = report_interval
+        self.limiter = HostLimiter(max_concurrent=max_per_host, min_interval=min_interval)
+
+        self._lock = threading.Lock()
+        self._progress = {}
+
+    # ---- per-source fetch tasks ----
+    def _fetch_nofluff(self, keyword):
+        scraper = WebScrapingNoFluff(query_term=keyword)
+        # One browser session per host slot for the whole "load more" loop
+        with self.limiter.slot(scraper.target_url):
+            scraper.scrape_save_raw_to_db(clicks=self.clicks)
+        return list(scraper.parse_postings(query_term=keyword))
+
+    def _fetch_justjoin(self, keyword):
+        scraper = WebScrapingJustJoin(
+            query_term=keyword, max_items=self.max_items, limiter=self.limiter
+        )
+        return scraper.fetch_jobs()
+
+    # ---- progress reporting ----
+    def _update(self, source, **delta):
+        with self._lock:
+            progress = self._progress[source]
+            for key, value in delta.items():
+                progress[key] += value
+
+    def _snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            report = {}
+            for source, p in self._progress.items():
+                elapsed = max(now - p["started"], 1e-9)
+                report[source] = {
+                    "queued": p["queued"],
+                    "running": p["running"],
+                    "done": p["done"],
+                    "failed": p["failed"],
+                    "postings": p["postings"],
+                    "postings_per_s": round(p["postings"] / elapsed, 2),
+                }
+            return report
+
+    def _report_loop(self, stop):
+        while not stop.wait(self.report_interval):
+            for source, p in self._snapshot().items():
+                print(f"📊 {source}: queue {p['queued']}, running {p['running']}, "
+                      f"done {p['done']}, failed {p['failed']}, "
+                      f"{p['postings']} postings ({p['postings_per_s']}/s)")
+
+    def _run_task(self, source, keyword):
+        self._update(source, queued=-1, running=1)
+        try:
+            docs = getattr(self, self.FETCHERS[source])(keyword)
+        except Exception:
+            self._update(source, running=-1, failed=1)
+            raise
+        self._update(source, running=-1, done=1, postings=len(docs))
+        return docs
+
+    # ---- merge & store ----
+    @staticmethod
+    def _merge(merged, docs):
+        """
+        Internal helper: Fold postings into `merged`, keyed by jump_url,
+        collecting every query term that returned the posting.
+        """
+        for doc in docs:
+            url = doc.get("jump_url")
+            if not url or url == "N/A":
+                continue
+            if url not in merged:
+                merged[url] = dict(doc, query_terms=list(doc.get("query_terms") or []))
+            terms = merged[url]["query_terms"]
+            for term in doc.get("query_terms") or []:
+                if term not in terms:
+                    terms.append(term)
+
+    def _enrich_new_postings(self, urls):
+        repository = self.REPOSITORIES["nofluffjobs"]()
+        jobs = list(repository.find(
+            {"jump_url": {"$in": urls}, "must_have_skills": {"$exists": False}},
+            {field: 1 for field in ("_id", "jump_url") + SkillStatsView.FIELDS},
+        ))
+        print(f"Enriching {len(jobs)} new NoFluff postings")
+        cache = DetailPageCache()
+        try:
+            pool = SkillEnrichmentPool(
+                repository.collection, workers=self.enrich_workers, mode=self.enrich_mode,
+                limiter=self.limiter, cache=cache, on_change=repository.skill_stats().apply,
+            )
+            return pool.run(jobs)
+        finally:
+            cache.close()
+
+    def run(self):
+        """
+        Crawl every (source, keyword) pair, then store and enrich unique postings.
+        :return: per-source report with throughput, dedupe and ingest counts.
+        """
+        started = time.monotonic()
+        self._progress = {
+            source: {"queued": len(self.keywords), "running": 0, "done": 0, "failed": 0,
+                     "postings": 0, "started": started}
+            for source in self.sources
+        }
+        merged = {source: {} for source in self.sources}
+
+        stop = threading.Event()
+        reporter = threading.Thread(target=self._report_loop, args=(stop,), daemon=True)
+        reporter.start()
+
+        executors = {source: ThreadPoolExecutor(max_workers=self.workers) for source in self.sources}
+        try:
+            futures = {
+                executors[source].submit(self._run_task, source, keyword): (source, keyword)
+                for source in self.sources
+                for keyword in self.keywords
+            }
+            for future in as_completed(futures):
+                source, keyword = futures[future]
+                try:
+                    self._merge(merged[source], future.result())
+                except Exception as e:
+                    print(f"❌ {source} crawl for '{keyword}' failed: {e}")
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            stop.set()
+            reporter.join()
+
+        report = self._snapshot()
+        for source in self.sources:
+            report[source]["unique_postings"] = len(merged[source])
+            if not merged[source]:
+                continue
+            repository = self.REPOSITORIES[source]()
+            report[source]["ingest"] = repository.ingest(merged[source].values())
+            print(f"✅ {source}: {report[source]['postings']} postings, "
+                  f"{len(merged[source])} unique, ingest {report[source]['ingest']}")
+
+        if self.enrich and merged.get("nofluffjobs"):
+            report["nofluffjobs"]["enrichment"] = self._enrich_new_postings(list(merged["nofluffjobs"]))
+
+        return report
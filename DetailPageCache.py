@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class DetailPageCache:
+    """
+    Persistent local cache of job detail pages keyed by URL.
+    Stores the page together with its ETag / Last-Modified validators so stale
+    entries can be revalidated with conditional requests, expires entries after
+    `ttl` seconds and evicts least recently used pages beyond `max_bytes`.
+    Safe to share between the worker threads of one process.
+    """
+
+    DEFAULT_PATH = os.path.join(".cache", "detail_pages.sqlite")
+
+    def __init__(self, path=DEFAULT_PATH, ttl=24 * 3600, max_bytes=512 * 1024 * 1024):
+        """
+        :param path: SQLite file holding the cache.
+        :param ttl: Seconds an entry is served without revalidation.
+        :param max_bytes: Upper bound of the stored (compressed) page bytes.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT,"
+            " fetched_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages(last_access)")
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Return the cached entry for `url` as a dict, or None. Refreshes its LRU position.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        body, etag, last_modified, fetched_at = row
+        return {
+            "url": url,
+            "body": zlib.decompress(body).decode("utf-8"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+        }
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Validators to send with a revalidation request for a stale entry.
+        """
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, event):
+        with self._lock:
+            self.stats[event] += 1
+
+    def mark_revalidated(self, url):
+        """
+        The server answered 304: the entry is fresh again for another `ttl`.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+            self.stats["revalidated"] += 1
+
+    def put(self, url, body, etag=None, last_modified=None):
+        body_z = zlib.compress(body.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, fetched_at, last_access, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body_z, etag, last_modified, now, now, len(body_z)),
+            )
+            self.stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Internal helper: Drop least recently used pages until under `max_bytes`.
+        Caller holds the lock.
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    def summary(self):
+        """
+        Hit / miss / revalidation counters plus the current size of the cache.
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+            return dict(self.stats, entries=entries, bytes=size)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,57 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """
+    Per-host politeness limit shared between worker threads.
+    Caps the number of in-flight requests to each host and spaces request
+    starts to the same host at least `min_interval` seconds apart.
+    """
+
+    def __init__(self, max_concurrent=4, min_interval=0.0):
+        """
+        :param max_concurrent: Maximum simultaneous requests per host.
+        :param min_interval: Minimum delay in seconds between two request starts per host.
+        """
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc or url
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._semaphores[host]
+
+    def _wait_turn(self, host):
+        """
+        Internal helper: Reserve the next start slot for `host` and sleep until it.
+        """
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self, url):
+        """
+        Context manager holding one request slot for the host of `url`.
+        """
+        host = self.host_of(url)
+        with self._semaphore(host):
+            self._wait_turn(host)
+            yield
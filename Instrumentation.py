@@ -0,0 +1,361 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+try:
+    import resource
+except ImportError:  # not available on Windows, peak RSS is then omitted
+    resource = None
+
+
+logger = logging.getLogger("pipeline.instrumentation")
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _count_rows(result):
+    """
+    Row count of a stage result: DataFrame / matrix rows, list length, or the
+    inserted + updated counts of an ingest report.
+    """
+    if result is None:
+        return None
+    if hasattr(result, "shape") and len(getattr(result, "shape", ())) >= 1:
+        return int(result.shape[0])
+    if isinstance(result, dict) and "inserted" in result:
+        return int(result["inserted"] + result.get("updated", 0))
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return None
+
+
+class _CommandListener(monitoring.CommandListener):
+    """
+    Internal helper: Counts MongoDB commands and their latency for the stages
+    running on the thread that issued them (pymongo publishes command events
+    on the calling thread).
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        Instrumentation.record_db_call(event.command_name, event.duration_micros / 1e6)
+
+    def failed(self, event):
+        Instrumentation.record_db_call(event.command_name, event.duration_micros / 1e6, failed=True)
+
+
+class Instrumentation:
+    """
+    Process-wide stage metrics for the scrapers and analytics managers.
+    Public methods are wrapped with `@instrumented`; when enabled each call
+    records wall and CPU time, peak memory, rows in / out and the MongoDB
+    commands (count and latency, via a pymongo CommandListener registered in
+    MongoAccess.client) issued while it ran. CPU time and commands are those
+    of the stage's own thread, so concurrent stages do not count each other's
+    work. Finished stages are logged as one JSON line each and aggregated for
+    `prometheus()`.
+
+    Environment (.env):
+    PIPELINE_METRICS=1          enable recording (off: wrappers call straight through)
+    PIPELINE_TRACE_MEMORY=1     add tracemalloc peaks (slower than the RSS high-water mark)
+    PIPELINE_PROFILE=<stages>   comma-separated stage names (or *) to run under cProfile
+    PIPELINE_PROFILE_DIR        where .prof files go (default .cache/profiles)
+    PIPELINE_METRICS_LOG        file for the JSON stage lines (default stderr)
+    """
+
+    enabled = False
+    trace_memory = False
+    profile_stages = frozenset()
+    profile_dir = os.path.join(".cache", "profiles")
+
+    _lock = threading.Lock()
+    # Stack of the running stages of each thread
+    _local = threading.local()
+    _profiling = False
+    _totals = defaultdict(lambda: defaultdict(float))
+    _db_totals = defaultdict(lambda: defaultdict(float))
+    _listener = None
+
+    @classmethod
+    def configure_from_env(cls):
+        load_dotenv()
+        cls.configure(
+            enabled=os.getenv("PIPELINE_METRICS", "0") == "1",
+            trace_memory=os.getenv("PIPELINE_TRACE_MEMORY", "0") == "1",
+            profile=os.getenv("PIPELINE_PROFILE", ""),
+            profile_dir=os.getenv("PIPELINE_PROFILE_DIR") or cls.profile_dir,
+            log_path=os.getenv("PIPELINE_METRICS_LOG"),
+        )
+
+    @classmethod
+    def configure(cls, enabled=None, trace_memory=None, profile=None, profile_dir=None, log_path=None):
+        """
+        :param profile: Comma-separated stage names (or a list) to profile, "*" for all.
+        :param log_path: Write the stage log lines to this file instead of stderr.
+        """
+        if enabled is not None:
+            cls.enabled = enabled
+        if trace_memory is not None:
+            cls.trace_memory = trace_memory
+        if profile is not None:
+            names = profile.split(",") if isinstance(profile, str) else profile
+            cls.profile_stages = frozenset(name.strip() for name in names if name.strip())
+        if profile_dir is not None:
+            cls.profile_dir = profile_dir
+        if cls.enabled and (log_path or not logger.handlers):
+            # One JSON object per line, unless the application configured logging itself
+            handler = logging.FileHandler(log_path) if log_path else logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    @classmethod
+    def event_listeners(cls):
+        """
+        Listeners for MongoClient(event_listeners=...), empty while disabled so
+        an uninstrumented run pays nothing per command.
+        """
+        if not cls.enabled:
+            return []
+        if cls._listener is None:
+            cls._listener = _CommandListener()
+        return [cls._listener]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._totals.clear()
+            cls._db_totals.clear()
+
+    # ---- recording ----
+    @classmethod
+    def _active(cls):
+        """
+        Internal helper: the running stages of the calling thread, outermost first.
+        """
+        if not hasattr(cls._local, "stages"):
+            cls._local.stages = []
+        return cls._local.stages
+
+    @classmethod
+    def record_db_call(cls, command, seconds, failed=False):
+        with cls._lock:
+            totals = cls._db_totals[command]
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["failures"] += failed
+        # Only this thread touches its stage records
+        for record in cls._active():
+            record["db_calls"] += 1
+            record["db_seconds"] += seconds
+
+    @classmethod
+    def _profiled(cls, name):
+        return "*" in cls.profile_stages or name in cls.profile_stages
+
+    @classmethod
+    def _start_profiler(cls):
+        """
+        Internal helper: an enabled cProfile for a stage, or None while another
+        one runs (an enclosing profiled stage, another thread, an external tool).
+        Only one profiler can be active at a time on Python 3.12+.
+        """
+        with cls._lock:
+            if cls._profiling or sys.getprofile() is not None:
+                return None
+            cls._profiling = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # "Another profiling tool is already active"
+            with cls._lock:
+                cls._profiling = False
+            return None
+        return profiler
+
+    @classmethod
+    @contextmanager
+    def stage(cls, name):
+        """
+        Measure the enclosed block as stage `name`; yields the mutable record
+        (set "rows_in" / "rows_out" on it). A no-op while disabled.
+        """
+        if not cls.enabled:
+            yield {}
+            return
+
+        record = {"stage": name, "db_calls": 0, "db_seconds": 0.0, "rows_in": None, "rows_out": None}
+        active = cls._active()
+        active.append(record)
+
+        tracing = cls.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        rss_before = _peak_rss_bytes()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        profiler = cls._start_profiler() if cls._profiled(name) else None
+        try:
+            yield record
+            record["status"] = "ok"
+        except BaseException:
+            record["status"] = "error"
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+                with cls._lock:
+                    cls._profiling = False
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.thread_time() - cpu, 6)
+            rss_after = _peak_rss_bytes()
+            if rss_after is not None:
+                record["peak_rss_mb"] = round(rss_after / 2**20, 1)
+                record["rss_growth_mb"] = round((rss_after - rss_before) / 2**20, 1)
+            if tracing:
+                record["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+                tracemalloc.stop()
+            record["db_seconds"] = round(record["db_seconds"], 6)
+            active[:] = [stage for stage in active if stage is not record]
+            with cls._lock:
+                cls._aggregate(record)
+            if profiler:
+                record["profile"] = cls._dump_profile(name, profiler)
+            logger.info(json.dumps(dict(record, time=datetime.now().isoformat()), default=str))
+
+    @classmethod
+    def _aggregate(cls, record):
+        totals = cls._totals[record["stage"]]
+        totals["calls"] += 1
+        totals["errors"] += record["status"] == "error"
+        for field in ("wall_s", "cpu_s", "db_calls", "db_seconds"):
+            totals[field] += record[field]
+        for field in ("rows_in", "rows_out"):
+            if record[field] is not None:
+                totals[field] += record[field]
+        if "peak_rss_mb" in record:
+            totals["peak_rss_mb"] = max(totals["peak_rss_mb"], record["peak_rss_mb"])
+
+    @classmethod
+    def _dump_profile(cls, name, profiler):
+        os.makedirs(cls.profile_dir, exist_ok=True)
+        path = os.path.join(cls.profile_dir, f"{name}-{datetime.now():%Y%m%d-%H%M%S}.prof")
+        profiler.dump_stats(path)
+        print(f"📈 Profile of {name} saved to {path} (top functions by cumulative time):")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+        return path
+
+    # ---- export ----
+    @classmethod
+    def summary(cls):
+        """
+        Aggregated metrics per stage and per MongoDB command.
+        """
+        with cls._lock:
+            return {
+                "stages": {name: dict(totals) for name, totals in cls._totals.items()},
+                "mongo_commands": {name: dict(totals) for name, totals in cls._db_totals.items()},
+            }
+
+    @staticmethod
+    def _label(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+    @classmethod
+    def prometheus(cls):
+        """
+        The aggregated metrics in the Prometheus text exposition format.
+        """
+        stage_metrics = (
+            ("pipeline_stage_calls_total", "counter", "calls", "Stage invocations"),
+            ("pipeline_stage_errors_total", "counter", "errors", "Stage invocations that raised"),
+            ("pipeline_stage_wall_seconds_total", "counter", "wall_s", "Wall-clock time spent in the stage"),
+            ("pipeline_stage_cpu_seconds_total", "counter", "cpu_s", "CPU time of the stage's thread"),
+            ("pipeline_stage_rows_in_total", "counter", "rows_in", "Rows consumed by the stage"),
+            ("pipeline_stage_rows_out_total", "counter", "rows_out", "Rows produced by the stage"),
+            ("pipeline_stage_db_calls_total", "counter", "db_calls", "MongoDB commands issued during the stage"),
+            ("pipeline_stage_db_seconds_total", "counter", "db_seconds", "MongoDB command latency during the stage"),
+            ("pipeline_stage_peak_rss_megabytes", "gauge", "peak_rss_mb", "Process RSS high-water mark after the stage"),
+        )
+        command_metrics = (
+            ("pipeline_mongo_commands_total", "counter", "calls", "MongoDB commands by name"),
+            ("pipeline_mongo_command_failures_total", "counter", "failures", "Failed MongoDB commands by name"),
+            ("pipeline_mongo_command_seconds_total", "counter", "seconds", "MongoDB command latency by name"),
+        )
+        summary = cls.summary()
+        lines = []
+        for metrics, label, groups in ((stage_metrics, "stage", summary["stages"]),
+                                       (command_metrics, "command", summary["mongo_commands"])):
+            for metric, kind, field, help_text in metrics:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for name, totals in sorted(groups.items()):
+                    if field in totals:
+                        lines.append(f'{metric}{{{label}="{cls._label(name)}"}} {totals[field]:g}')
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def dump_prometheus(cls, path="metrics.prom"):
+        """
+        Write the text dump, e.g. for the node_exporter textfile collector.
+        """
+        with open(path, "w") as f:
+            f.write(cls.prometheus())
+        return path
+
+
+def frame_rows(self, *args, **kwargs):
+    """
+    rows_in helper for managers holding their working DataFrame in `self.df`.
+    """
+    df = getattr(self, "df", None)
+    return len(df) if df is not None else None
+
+
+def instrumented(name=None, rows_in=None, rows_out=_count_rows):
+    """
+    Decorator measuring every call of a function or method as one stage.
+    :param name: Stage name, defaults to the qualified name (Class.method).
+    :param rows_in: Optional callable(*args, **kwargs) giving the input row count.
+    :param rows_out: Callable(result) giving the output row count.
+    """
+    def decorate(fn):
+        stage_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Instrumentation.enabled:
+                return fn(*args, **kwargs)
+            with Instrumentation.stage(stage_name) as record:
+                if rows_in is not None:
+                    record["rows_in"] = rows_in(*args, **kwargs)
+                result = fn(*args, **kwargs)
+                if rows_out is not None:
+                    record["rows_out"] = rows_out(result)
+                return result
+        return wrapper
+    return decorate
+
+
+Instrumentation.configure_from_env()
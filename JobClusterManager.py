@@ -1,170 +1,199 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pymongo import MongoClient
-from collections import defaultdict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from scipy.spatial.distance import cdist
-import matplotlib.patheffects as PathEffects
+from MongoAccess import MongoAccess
+from KSweep import KSweep, build_estimator, distortion
+from ArtifactStore import ArtifactStore
+from ClusterAssigner import ClusterAssigner
+from SkillVocabulary import SkillVocabulary, SkillTfidf
+from SnapshotStore import resolve as resolve_snapshot
+from constant import CollectionEnum
+from Instrumentation import instrumented, frame_rows
+from ReportRenderer import show_figure
+from pymongo import UpdateOne
 
 class JobClusterManager:
-    def __init__(self, mongo_uri="mongodb://localhost:27017/", db_name="BD_final"):
+    # "kmeans": full Lloyd KMeans, "minibatch": MiniBatchKMeans for large corpora
+    CLUSTERING_ALGORITHMS = ("kmeans", "minibatch")
+
+    def __init__(self, mongo_uri=None, db_name=None, artifacts=None, vocabulary=None, snapshot=None):
         """
-        Initialize MongoDB connection and class attributes.
+        Bind to the shared MongoDB access layer and initialize class attributes.
+        mongo_uri / db_name default to the MONGO_MODE / DB_NAME configuration.
+        :param artifacts: ArtifactStore for fitted vectorizers / clusterers (default ./artifacts).
+        :param vocabulary: Shared SkillVocabulary (default: the persisted global one).
+        :param snapshot: Snapshot (or its directory) to read postings from instead of MongoDB;
+                         it is read-only, so save_clusters / assign_new_postings need MongoDB.
         """
-        self.client = MongoClient(mongo_uri)
-        self.db = self.client[db_name]
+        self.client = MongoAccess.client(mongo_uri)
+        self.db = MongoAccess.db(db_name, mongo_uri)
+        self.snapshot = resolve_snapshot(snapshot)
+        if self.snapshot is not None:
+            self.jobs_nf = self.snapshot.jobs_for(CollectionEnum.NO_FLUFF_JOBS)
+            self.jobs_jj = self.snapshot.jobs_for(CollectionEnum.JUST_JOIN)
+        else:
+            self.jobs_nf = MongoAccess.jobs_processed(db_name, mongo_uri)
+            self.jobs_jj = MongoAccess.jobs_processed_jj(db_name, mongo_uri)
+        self.artifacts = artifacts or ArtifactStore()
+        self.vocabulary = vocabulary or SkillVocabulary.load()
         self.df = None
         self.vectorizer = None
         self.X_skills = None
         self.kmeans = None
         self.terms = None
+        self.cluster_reference = None
+        # Parameters of the fitted vectorizer, and meta / training labels of the clustering artifact
+        self.vectorizer_params = None
+        self.clustering_meta = None
+        self.cluster_labels = None
 
+    def _repositories(self):
+        """
+        Internal helper: Processed-jobs repository per source value.
+        """
+        return {"nofluffjobs": self.jobs_nf, "justjoin": self.jobs_jj}
+
+    @instrumented()
     def load_and_preprocess_data(self):
         """
         Retrieve job data from both NoFluffJobs and JustJoin.it, 
         combine them into a pandas DataFrame, and perform basic cleaning.
         (Refers to CELL #8)
         """
-        print("Loading data from MongoDB...")
+        print(f"Loading data from {'snapshot ' + self.snapshot.name if self.snapshot else 'MongoDB'}...")
         
-        # Combine both sources into one dataset
+        # Combine both sources into one dataset, projecting only the needed fields
         query = {"must_have_skills": {"$exists": True, "$ne": []}}
-        jobs_nf = list(self.db.jobs_processed.find(query))
-        jobs_jj = list(self.db.jobs_processed_jj.find(query))
-        jobs = jobs_nf + jobs_jj
-
-        self.df = pd.DataFrame(jobs)[[
-            "job_title", "company_name", "must_have_skills", 
-            "min_salary", "max_salary", "source"
-        ]]
+        fields = [
+            "job_title", "company_name", "must_have_skills",
+            "min_salary", "max_salary", "source", "jump_url"
+        ]
+        self.df = pd.concat(
+            [self.jobs_nf.load_frame(fields, query), self.jobs_jj.load_frame(fields, query)],
+            ignore_index=True
+        )
 
         # Drop rows with empty or missing skills
         self.df = self.df[self.df["must_have_skills"].apply(
-            lambda x: isinstance(x, list) and len(x) > 0
+            lambda x: isinstance(x, (list, np.ndarray)) and len(x) > 0
         )].copy()
-
-        # Lowercase all skills and join into a single string per job
-        self.df["skills_text"] = self.df["must_have_skills"].apply(
-            lambda x: " ".join([s.lower() for s in x])
-        )
         
         print(f"Loaded {len(self.df)} jobs with standardized skills.")
         return self.df
 
-    def get_skill_frequency_analysis(self):
+    @instrumented()
+    def get_skill_frequency_analysis(self, top_n=None, source=None, rebuild=False):
         """
-        Perform advanced aggregation pipeline to analyze skill frequency 
-        and salary context across job sources.
+        Skill frequency and salary context across job sources, served from the
+        incrementally maintained `skill_stats` view (built on first use).
         (Refers to CELL #9)
+        :param top_n: Return only the N most frequent skills, None for all.
+        :param source: "nofluffjobs" or "justjoin" to rank within one source.
+        :param rebuild: Force a full recomputation of the view.
         """
-        pipeline = [
-            {"$match": {"must_have_skills": {"$exists": True, "$ne": []}}},
-            {"$unwind": "$must_have_skills"},
-            {
-                "$group": {
-                    "_id": "$must_have_skills",
-                    "job_count": {"$sum": 1},
-                    "avg_min_salary": {"$avg": "$min_salary"},
-                    "avg_max_salary": {"$avg": "$max_salary"},
-                    "example_titles": {"$addToSet": "$job_title"}
-                }
-            },
-            {"$addFields": {"unique_titles_count": {"$size": "$example_titles"}}}
-        ]
-
-        skill_analysis_1 = list(self.db.jobs_processed.aggregate(pipeline))
-        skill_analysis_2 = list(self.db.jobs_processed_jj.aggregate(pipeline))
-
-        combined_skills = defaultdict(lambda: {
-            "job_count": 0, "salary_sum_min": 0, "salary_sum_max": 0,
-            "salary_count": 0, "example_titles": set()
-        })
-
-        def merge_results(analysis_list):
-            for skill in analysis_list:
-                name = skill["_id"]
-                combined_skills[name]["job_count"] += skill["job_count"]
-                if skill.get("avg_min_salary") is not None:
-                    combined_skills[name]["salary_sum_min"] += skill["avg_min_salary"] * skill["job_count"]
-                    combined_skills[name]["salary_count"] += skill["job_count"]
-                if skill.get("avg_max_salary") is not None:
-                    combined_skills[name]["salary_sum_max"] += skill["avg_max_salary"] * skill["job_count"]
-                combined_skills[name]["example_titles"].update(skill["example_titles"])
-
-        merge_results(skill_analysis_1)
-        merge_results(skill_analysis_2)
-
-        final_analysis = []
-        for name, data in combined_skills.items():
-            doc = {
-                "_id": name, "job_count": data["job_count"],
-                "unique_titles_count": len(data["example_titles"]),
-                "example_titles": list(data["example_titles"])
-            }
-            if data["salary_count"] > 0:
-                doc["avg_min_salary"] = data["salary_sum_min"] / data["salary_count"]
-                doc["avg_max_salary"] = data["salary_sum_max"] / data["salary_count"]
-            final_analysis.append(doc)
-
-        final_analysis.sort(key=lambda x: x["job_count"], reverse=True)
-        return final_analysis
+        view = self.jobs_nf.skill_stats()
+        if rebuild or not view.is_built():
+            view.rebuild()
+        return view.top(top_n, source=source)
 
+    @instrumented(rows_in=frame_rows)
     def vectorize_skills(self, min_df=0.015, max_df=0.99):
         """
         Transform job skills into a numerical TF-IDF matrix.
+        Skills are encoded through the shared SkillVocabulary and the CSR matrix
+        is built directly from their ids, so multi-word and symbolic skills
+        ("spring boot", "c#") stay whole. The fitted vectorizer and matrix are
+        reused from the artifact store while the skills and parameters are unchanged.
         (Refers to CELL #10)
         """
-        self.vectorizer = TfidfVectorizer(min_df=min_df, max_df=max_df)
-        self.X_skills = self.vectorizer.fit_transform(self.df["skills_text"])
+        params = {"min_df": min_df, "max_df": max_df}
+        key = ArtifactStore.fingerprint(self.df["must_have_skills"], params)
+
+        def fit():
+            vectorizer = SkillTfidf(self.vocabulary, min_df=min_df, max_df=max_df)
+            X = vectorizer.fit_transform(self.df["must_have_skills"])
+            self.vocabulary.save()
+            return (vectorizer, X), {"rows": X.shape[0], "terms": X.shape[1]}
+
+        (self.vectorizer, self.X_skills), _ = self.artifacts.load_or_fit("skill_vectorizer", key, fit, params)
+        self.vectorizer_params = params
         self.terms = self.vectorizer.get_feature_names_out()
         print(f"Skill matrix shape: {self.X_skills.shape}")
         return self.X_skills
 
-    def plot_optimal_k(self, k_range=range(2, 20)):
+    @classmethod
+    def make_kmeans(cls, k, algorithm="kmeans", n_init=10, max_iter=300, batch_size=4096):
+        """
+        Build the clustering estimator; both variants accept CSR input directly.
+        """
+        if algorithm not in cls.CLUSTERING_ALGORITHMS:
+            raise ValueError(f"Unknown clustering algorithm '{algorithm}', expected one of {cls.CLUSTERING_ALGORITHMS}")
+        return build_estimator(k, algorithm, n_init=n_init, max_iter=max_iter, batch_size=batch_size)
+
+    @staticmethod
+    def distortion(X, centers):
+        """
+        Mean Euclidean distance of each row to its nearest center.
+        Works on CSR rows without materializing the dense matrix.
+        """
+        return distortion(X, centers)
+
+    def _clustering_input(self, sparse):
+        """
+        Internal helper: X_skills as CSR (default) or the legacy dense copy.
+        """
+        return self.X_skills.tocsr() if sparse else self.X_skills.toarray()
+
+    @instrumented(rows_in=frame_rows)
+    def evaluate_k_range(self, k_range=range(2, 20), algorithm="kmeans", sparse=True,
+                         sample_size=5000, workers=None, n_init=10):
+        """
+        Elbow and Silhouette metrics for every k, computed in parallel worker
+        processes and cached per k (see KSweep). Returns a DataFrame.
+        :param sample_size: Rows of the stratified silhouette sample, None for exact.
+        """
+        sweep = KSweep(self._clustering_input(sparse), algorithm=algorithm, n_init=n_init,
+                       sample_size=sample_size, workers=workers)
+        return sweep.run(k_range)
+
+    @instrumented(rows_in=frame_rows)
+    def plot_optimal_k(self, k_range=range(2, 20), algorithm="kmeans", sparse=True,
+                       sample_size=5000, workers=None, plot=True):
         """
         Identify the optimal number of clusters using Elbow and Silhouette methods.
         (Refers to CELL #11 & #12)
+        :param plot: Draw the Elbow / Silhouette charts; the metrics are returned either way.
         """
-        X_dense = self.X_skills.toarray()
-        distortions = []
-        silhouette_scores = []
-
-        print("Evaluating K values...")
-        for k in k_range:
-            km = KMeans(n_clusters=k, random_state=42, n_init=10, max_iter=300)
-            labels = km.fit_predict(X_dense)
-            dist = np.mean(np.min(cdist(X_dense, km.cluster_centers_, 'euclidean'), axis=1))
-            distortions.append(dist)
-            sil = silhouette_score(X_dense, labels)
-            silhouette_scores.append(sil)
-            print(f"k={k}, silhouette score={sil:.3f}")
-
-        plt.figure(figsize=(12, 5))
-        plt.subplot(1, 2, 1)
-        plt.plot(k_range, distortions, 'bx-')
-        plt.xlabel("k")
-        plt.ylabel("Distortion")
-        plt.title("Elbow Method")
-
-        plt.subplot(1, 2, 2)
-        plt.plot(k_range, silhouette_scores, 'ro-')
-        plt.xlabel("k")
-        plt.ylabel("Silhouette Score")
-        plt.title("Silhouette Analysis")
-        plt.show()
-
-    def run_clustering(self, k_optimal=12):
+        metrics = self.evaluate_k_range(k_range, algorithm, sparse, sample_size, workers)
+        if plot:
+            show_figure("optimal_k", metrics)
+        return metrics
+
+    @instrumented(rows_in=frame_rows)
+    def run_clustering(self, k_optimal=12, algorithm="kmeans", sparse=True, n_init=10):
         """
         Apply KMeans with the chosen optimal k and identify key skills in each group.
         (Refers to CELL #13)
+        :param algorithm: "kmeans" or "minibatch" (for large corpora).
+        :param sparse: Cluster the CSR matrix directly (False densifies first).
+        The fitted model is reused from the artifact store for an unchanged matrix.
         """
-        X_dense = self.X_skills.toarray()
-        self.kmeans = KMeans(n_clusters=k_optimal, random_state=42, n_init=10)
-        self.df["cluster"] = self.kmeans.fit_predict(X_dense)
+        params = {"k": k_optimal, "algorithm": algorithm, "sparse": sparse, "n_init": n_init}
+        key = ArtifactStore.fingerprint(self.X_skills, params)
+
+        def fit():
+            kmeans = self.make_kmeans(k_optimal, algorithm, n_init=n_init)
+            labels = kmeans.fit_predict(self._clustering_input(sparse))
+            reference = ClusterAssigner.build_reference(
+                self.vectorizer, kmeans, self.X_skills, self.df["must_have_skills"]
+            )
+            return (kmeans, labels), dict(
+                reference, inertia=float(kmeans.inertia_), n_iter=int(kmeans.n_iter_)
+            )
+
+        (self.kmeans, labels), meta = self.artifacts.load_or_fit("skill_kmeans", key, fit, params)
+        self.cluster_reference = meta["metrics"]
+        self.clustering_meta, self.cluster_labels = meta, labels
+        self.df["cluster"] = np.asarray(labels)
 
         cluster_sizes = self.df["cluster"].value_counts().sort_index()
         print("\nJobs distribution per cluster:")
@@ -175,10 +204,112 @@ class JobClusterManager:
             top_skills = [self.terms[i] for i in top_idx]
             print(f"  Representative skills: {', '.join(top_skills)}")
 
-    def analyze_salaries(self):
+    @staticmethod
+    def _write_clusters(repository, urls, labels, chunk_size=1000):
         """
-        Analyze salary distribution across skill clusters using IQR for outlier removal.
-        (Refers to CELL #14)
+        Internal helper: Bulk-write cluster ids keyed by jump_url.
+        """
+        operations = [
+            UpdateOne({"jump_url": url}, {"$set": {"cluster": int(label)}})
+            for url, label in zip(urls, labels)
+        ]
+        for i in range(0, len(operations), chunk_size):
+            repository.bulk_write(operations[i:i + chunk_size])
+        return len(operations)
+
+    @instrumented(rows_in=frame_rows)
+    def save_clusters(self, chunk_size=1000):
+        """
+        Persist the labels of the last run_clustering to both job collections.
+        """
+        written = 0
+        for source, repository in self._repositories().items():
+            rows = self.df[self.df["source"] == source]
+            written += self._write_clusters(repository, rows["jump_url"], rows["cluster"], chunk_size)
+        print(f"Saved cluster labels for {written} jobs.")
+        return written
+
+    def load_fitted_clustering(self):
+        """
+        Load the newest stored vectorizer and clustering (with its drift reference)
+        from the artifact store, without reading the corpus.
+        :return: False when either artifact was never stored.
+        """
+        vectorizer = self.artifacts.load_latest("skill_vectorizer")
+        clustering = self.artifacts.load_latest("skill_kmeans")
+        if vectorizer is None or clustering is None:
+            return False
+        (self.vectorizer, _), vectorizer_meta = vectorizer
+        (self.kmeans, self.cluster_labels), self.clustering_meta = clustering
+        self.vectorizer_params = vectorizer_meta["params"]
+        self.terms = self.vectorizer.get_feature_names_out()
+        self.cluster_reference = self.clustering_meta["metrics"]
+        print(f"📦 Loaded skill_kmeans ({self.clustering_meta['key']}) trained {self.clustering_meta['created_at']}")
+        return True
+
+    @instrumented(rows_in=frame_rows)
+    def assign_new_postings(self, update="nearest", max_distance_ratio=1.25, max_oov_rate=0.25,
+                            refit=True, chunk_size=1000):
+        """
+        Label postings that have skills but no `cluster` yet, without refitting:
+        they are vectorized with the frozen vocabulary and assigned to the nearest
+        centroid (see ClusterAssigner). Only the new rows are read and written; a
+        fresh process loads the newest fitted models from the artifact store.
+        When the drift thresholds are crossed and `refit` is set, the whole corpus
+        is reloaded, re-vectorized, re-clustered with the same parameters and saved instead.
+        :param update: "nearest" or "partial_fit" (MiniBatchKMeans models, which
+                       are stored back as the newest skill_kmeans version).
+        :return: Drift report with the number of labels written.
+        """
+        if (self.kmeans is None or self.vectorizer is None) and not self.load_fitted_clustering():
+            raise RuntimeError("No fitted clustering: call vectorize_skills() and run_clustering() first.")
+
+        assigner = ClusterAssigner(
+            self.vectorizer, self.kmeans, self.cluster_reference or {}, update=update,
+            max_distance_ratio=max_distance_ratio, max_oov_rate=max_oov_rate,
+        )
+        query = {"must_have_skills": {"$exists": True, "$ne": []}, "cluster": {"$exists": False}}
+        frames = {
+            source: repository.load_frame(["jump_url", "must_have_skills"], query)
+            for source, repository in self._repositories().items()
+        }
+        new_rows = pd.concat(frames.values(), ignore_index=True)
+        if new_rows.empty:
+            print("No new postings to label.")
+            return {"rows": 0, "written": 0, "refit": False}
+
+        labels, drift = assigner.assign(new_rows["must_have_skills"])
+        print(f"Drift on {drift['rows']} new jobs: distance ratio {drift['distance_ratio']:.2f}, "
+              f"OOV rate {drift['oov_rate']:.1%}")
+
+        if drift["refit"] and refit:
+            print("⚠️ Drift threshold crossed, refitting on the full dataset...")
+            params = self.clustering_meta["params"]
+            self.load_and_preprocess_data()
+            self.vectorize_skills(**self.vectorizer_params)
+            self.run_clustering(params["k"], algorithm=params["algorithm"], sparse=params["sparse"],
+                                n_init=params["n_init"])
+            return dict(drift, written=self.save_clusters(chunk_size))
+
+        if update == "partial_fit":
+            # The moved centroids are the starting point of the next daily run
+            params = self.clustering_meta["params"]
+            key = ArtifactStore.fingerprint(self.clustering_meta["key"], new_rows["must_have_skills"], params)
+            self.clustering_meta = self.artifacts.save("skill_kmeans", key, (self.kmeans, self.cluster_labels),
+                                                       metrics=self.cluster_reference, params=params)
+
+        written = 0
+        offset = 0
+        for source, frame in frames.items():
+            batch = labels[offset:offset + len(frame)]
+            offset += len(frame)
+            written += self._write_clusters(self._repositories()[source], frame["jump_url"], batch, chunk_size)
+        print(f"Labeled {written} new jobs.")
+        return dict(drift, written=written)
+
+    def _salary_frame(self):
+        """
+        Internal helper: Jobs with both salary bounds and avg_salary, IQR outliers removed.
         """
         salary_df = self.df[self.df["min_salary"].notna() & self.df["max_salary"].notna()].copy()
         salary_df["avg_salary"] = (salary_df["min_salary"] + salary_df["max_salary"]) / 2
@@ -186,7 +317,16 @@ class JobClusterManager:
         # Filter outliers using IQR
         Q1, Q3 = salary_df["avg_salary"].quantile([0.25, 0.75])
         IQR = Q3 - Q1
-        salary_df_filtered = salary_df[salary_df["avg_salary"] <= (Q3 + 1.5 * IQR)]
+        return salary_df[salary_df["avg_salary"] <= (Q3 + 1.5 * IQR)]
+
+    @instrumented(rows_in=frame_rows)
+    def analyze_salaries(self, plot=True):
+        """
+        Analyze salary distribution across skill clusters using IQR for outlier removal.
+        (Refers to CELL #14)
+        :param plot: Show the boxplot; the statistics are returned either way.
+        """
+        salary_df_filtered = self._salary_frame()
 
         stats = salary_df_filtered.groupby("cluster")["avg_salary"].agg(
             ["count", "mean", "median", "std"]
@@ -194,71 +334,57 @@ class JobClusterManager:
         print("\nSalary Statistics by Cluster (Sorted by Median):")
         print(stats)
 
-        # Plotting
-        plt.figure(figsize=(14, 8))
-        sns.boxplot(x="cluster", y="avg_salary", data=salary_df_filtered, order=stats.index)
-        plt.title("Salary Distribution by Skill Cluster (Outliers Removed)")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
+        if plot:
+            show_figure("salary_by_cluster", salary_df_filtered, stats.index.tolist())
         return stats
 
-    def analyze_skill_gap(self, cluster_stats):
+    @instrumented(rows_in=frame_rows)
+    def analyze_skill_gap(self, cluster_stats, plot=True):
         """
         Identify high-value skills by correlating skill presence with cluster salaries.
         (Refers to CELL #15)
+        :param plot: Show the scatter chart; the analysis is returned either way.
         """
         k_clusters = self.kmeans.n_clusters
-        skill_importance = {}
-        for term_idx, term in enumerate(self.terms):
-            weights = [self.kmeans.cluster_centers_[c][term_idx] for c in range(k_clusters)]
-            skill_importance[term] = weights
 
-        skill_df = pd.DataFrame(skill_importance).T
-        median_salaries = cluster_stats["median"].to_dict()
+        # Weighted importance of each skill based on median salaries of clusters it appears in:
+        # (terms x clusters) center weights times the per-cluster median salary vector
+        median_salaries = cluster_stats["median"].reindex(range(k_clusters), fill_value=0)
+        salary_corr = self.kmeans.cluster_centers_.T @ median_salaries.to_numpy(dtype=float)
 
-        salary_corr = {}
-        for skill in skill_df.index:
-            # Weighted importance of each skill based on median salaries of clusters it appears in
-            weighted_val = sum(skill_df.loc[skill, i] * median_salaries.get(i, 0) for i in range(k_clusters))
-            salary_corr[skill] = weighted_val
+        # Demand (normalized frequency): column sums of the binary job x skill matrix
+        job_counts = np.asarray((self.X_skills != 0).sum(axis=0)).ravel()
 
         analysis = pd.DataFrame({
-            "skill": list(salary_corr.keys()),
-            "salary_correlation": list(salary_corr.values())
+            "skill": self.terms,
+            "salary_correlation": salary_corr,
+            "demand": job_counts / self.X_skills.shape[0],
         })
-        
-        # Calculate demand (normalized frequency)
-        analysis["demand"] = analysis["skill"].apply(
-            lambda s: self.df["skills_text"].str.contains(r'\b' + s + r'\b').sum() / len(self.df)
-        )
-        
+
         # Filter skills with at least 5% market presence
         analysis = analysis[analysis["demand"] >= 0.05].sort_values("salary_correlation", ascending=False)
         
         # Visualization
-        self._plot_gap_analysis(analysis)
+        if plot:
+            self._plot_gap_analysis(analysis)
         return analysis
 
     def _plot_gap_analysis(self, analysis):
         """
         Helper method to plot High-Value Skills (Salary Correlation vs Demand).
         """
-        plt.figure(figsize=(14, 10))
-        scatter = plt.scatter(analysis["demand"], analysis["salary_correlation"], 
-                             c=analysis["salary_correlation"], cmap='viridis', s=80, alpha=0.8)
-        plt.colorbar(scatter, label="Salary Correlation")
-        
-        # Annotate top 20 skills
-        top_20 = analysis.head(20)
-        for i, row in top_20.iterrows():
-            plt.annotate(
-                row["skill"], (row["demand"], row["salary_correlation"]),
-                textcoords="offset points", xytext=(5,5), fontsize=10, fontweight='bold',
-                path_effects=[PathEffects.withStroke(linewidth=3, foreground='white')]
-            )
-        plt.title("Top 20 High-Value Skills: Market Demand vs. Salary Potential")
-        plt.xlabel("Demand (% of Jobs)")
-        plt.ylabel("Salary Correlation Index")
-        plt.grid(True, alpha=0.3)
-        plt.show()
\ No newline at end of file
+        show_figure("skill_gap", analysis)
+
+    def add_report_figures(self, renderer, k_metrics=None, cluster_stats=None, skill_gap=None):
+        """
+        Queue the clustering figures on a ReportRenderer (headless report mode).
+        Arguments are the results of plot_optimal_k / analyze_salaries /
+        analyze_skill_gap called with plot=False; missing ones are left out.
+        """
+        if k_metrics is not None:
+            renderer.add("optimal_k", "optimal_k", k_metrics[["k", "distortion", "silhouette"]])
+        if cluster_stats is not None:
+            renderer.add("salary_by_cluster", "salary_by_cluster",
+                         self._salary_frame()[["cluster", "avg_salary"]], cluster_stats.index.tolist())
+        if skill_gap is not None:
+            renderer.add("skill_gap", "skill_gap", skill_gap)
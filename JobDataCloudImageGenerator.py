@@ -1,21 +1,26 @@
-import pandas as pd
-import numpy as np               
 import matplotlib.pyplot as plt  
 from collections import Counter  
-from wordcloud import WordCloud  
+from concurrent.futures import ThreadPoolExecutor
 
 from enum import Enum            
-from constant import CollectionEnum
-from pymongo import MongoClient
+from MongoAccess import MongoAccess
+from SnapshotStore import resolve as resolve_snapshot
+from Instrumentation import instrumented
+from ReportRenderer import WORD_CLOUD_CACHE_DIR, draw_word_cloud, draw_word_clouds, word_cloud_images
 
 class JobDataCloudImageGenerator:
-    def __init__(self):
+    def __init__(self, cache_dir=WORD_CLOUD_CACHE_DIR, workers=None, snapshot=None, mongo_uri=None, db_name=None):
         """
-        Initialize the visualization class.
-        :param db_client: An active MongoDB database instance.
+        Initialize the visualization class on the shared database
+        (honours MONGO_MODE / DB_NAME like the other classes, mongo_uri / db_name override them).
+        :param cache_dir: Cache of rendered clouds keyed by counts and wc_params (None disables it).
+        :param workers: Processes laying out the clouds of compare_platforms in parallel.
+        :param snapshot: Snapshot (or its directory) to count skills from instead of MongoDB.
         """
-        client = MongoClient('mongodb://localhost:27017/')
-        self.db = client['BD_final']
+        self.db = MongoAccess.db(db_name, mongo_uri)
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.snapshot = resolve_snapshot(snapshot)
         # Standard configuration for WordCloud generation
         self.max_words=15
         self.wc_params = {
@@ -25,81 +30,55 @@ class JobDataCloudImageGenerator:
             'colormap': 'viridis'
         }
 
-    def _get_data_from_db(self, platform_name):
+    def skill_frequencies(self, platform_name, limit=None):
         """
-        Internal method: Fetches raw data from MongoDB based on platform enum
-        and converts it into a pandas DataFrame.
+        Skill -> count of one platform (data only, nothing is drawn).
+        Counted by a MongoDB aggregation (or Arrow kernels on a snapshot);
+        `limit` keeps the top skills only.
         """
-        if platform_name == CollectionEnum.JUST_JOIN:
-            data = list(self.db.jobs_processed_jj.find())
-        elif platform_name == CollectionEnum.NO_FLUFF_JOBS:
-            data = list(self.db.jobs_processed.find())
+        if self.snapshot:
+            repository = self.snapshot.jobs_for(platform_name)
         else:
-            raise NameError(f"Unknown collection name for: {platform_name}")
+            repository = MongoAccess.jobs_for(platform_name, db=self.db)
+        return Counter(dict(repository.skill_counts(limit)))
 
-        return pd.DataFrame(data)
-
-    def _extract_skills(self, df):
+    def _platform_frequencies(self, platforms):
         """
-        Internal method: Cleans and extracts the list of skills from the DataFrame.
-        Handles both list-type and string-type entries in 'must_have_skills' columns.
+        Internal method: Top max_words counts per platform label, queried concurrently.
         """
-        skill_cols = [col for col in df.columns if 'must_have_skills' in col]
-        raw_skills = df[skill_cols].values.flatten()
-
-        all_skills = []
-        for item in raw_skills:
-            if isinstance(item, (list, np.ndarray)):
-                for s in item:
-                    if pd.notna(s) and str(s).strip() != '':
-                        all_skills.append(str(s).strip().lower())
-            elif pd.notna(item) and str(item).strip() != '':
-                all_skills.append(str(item).strip().lower())
-        return all_skills
+        platforms = list(platforms)
+        with ThreadPoolExecutor(max_workers=max(1, len(platforms))) as executor:
+            counts = executor.map(lambda platform: self.skill_frequencies(platform, self.max_words), platforms)
+            return {platform.value: dict(c) for platform, c in zip(platforms, counts)}
 
+    @instrumented()
     def draw_word_cloud(self, platform_name, ax, ):
         """
         Core method: Generates and renders a word cloud onto a specific Matplotlib axis.
         """
-        df = self._get_data_from_db(platform_name)
-
-        if df.empty:
-            ax.set_title(f"{platform_name.value} (No Data Found)")
-            ax.axis('off')
-            return
-
-        all_skills = self._extract_skills(df)
-        skill_counts = Counter(all_skills)
-
-        # Generate WordCloud object from frequency dictionary
-        wc = WordCloud(
-            **self.wc_params,
-            max_words=self.max_words
-        ).generate_from_frequencies(skill_counts)
-
-        # Render settings
-        ax.imshow(wc, interpolation='bilinear')
-        ax.set_title(f"Platform: {platform_name.value}", fontsize=18, fontweight='bold')
-        ax.axis('off')
+        draw_word_cloud(ax, platform_name.value, self.skill_frequencies(platform_name, self.max_words),
+                        self.wc_params, self.max_words, cache_dir=self.cache_dir)
 
+    @instrumented()
     def compare_platforms(self, platforms, save_path='combined_skills_comparison.png'):
         """
         High-level method: Creates a side-by-side comparison chart for multiple platforms.
         : param platforms: A list of platform enums, e.g., [Enum1, Enum2]
         : param save_path: File path to save the generated image.
         """
-        n = len(platforms)
-        fig, axes = plt.subplots(1, n, figsize=(10 * n, 10))
+        frequencies = self._platform_frequencies(platforms)
+        # Unchanged counts reuse the cached clouds, the others are laid out in parallel
+        images = word_cloud_images(frequencies, self.wc_params, self.max_words, self.cache_dir, self.workers)
+        fig = draw_word_clouds(frequencies, self.wc_params, self.max_words, images=images)
 
-        # Ensure axes is iterable even if only one platform is provided
-        if n == 1:
-            axes = [axes]
-
-        for platform, ax in zip(platforms, axes):
-            self.draw_word_cloud(platform, ax)
-
-        plt.tight_layout()
-        plt.savefig(save_path)
+        fig.savefig(save_path)
         print(f"\nThe most important {self.max_words} skills\n")
         plt.show()
-        print(f"Comparison chart saved successfully to: {save_path}")
\ No newline at end of file
+        print(f"Comparison chart saved successfully to: {save_path}")
+
+    def add_report_figures(self, renderer, platforms, name="combined_skills_comparison"):
+        """
+        Queue the comparison chart on a ReportRenderer (headless report mode).
+        """
+        renderer.add(name, "word_clouds", self._platform_frequencies(platforms), self.wc_params, self.max_words,
+                     cache_dir=self.cache_dir)
@@ -0,0 +1,200 @@
+import hashlib
+import json
+from datetime import datetime
+from itertools import islice
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+
+class JobIngestor:
+    """
+    Incremental ingestion of processed job documents into a MongoDB collection.
+    Documents are upserted by `jump_url` in chunked, unordered `bulk_write`
+    batches. A content hash stored next to each posting lets re-runs skip
+    unchanged postings and write only the fields that actually changed.
+    """
+
+    KEY = "jump_url"
+    # Fields that change on every run and must not influence the content hash
+    VOLATILE_FIELDS = ("_id", "processed_at", "content_hash")
+    # Keyword tags: a posting found by several query terms keeps all of them
+    TAG_FIELDS = ("query_term", "query_terms")
+    # Labels derived from the skills, dropped when the skills change
+    SKILL_DERIVED_FIELDS = ("cluster",)
+
+    # (database, collection) pairs whose unique index was already ensured
+    _indexed = set()
+
+    def __init__(self, collection, chunk_size=500, on_change=None, watch_fields=()):
+        """
+        :param collection: Target pymongo collection, e.g. db.jobs_processed.
+        :param chunk_size: Number of postings per bulk_write round-trip.
+        :param on_change: Optional callback receiving the (old_doc, new_doc) pairs
+                          of every chunk after it was written, e.g. SkillStatsView.apply.
+        :param watch_fields: Fields the callback needs in old_doc/new_doc.
+        """
+        self.collection = collection
+        self.chunk_size = chunk_size
+        self.on_change = on_change
+        self.watch_fields = tuple(watch_fields)
+
+    def _ensure_index(self):
+        """
+        Internal helper: Create the unique `jump_url` index on first use.
+        """
+        key = (self.collection.database.name, self.collection.name)
+        if key in JobIngestor._indexed:
+            return
+        try:
+            self.collection.create_index(self.KEY, unique=True)
+        except OperationFailure as e:
+            if e.code != 11000:
+                print(f"❌ Could not create unique index on {self.collection.name}.{self.KEY}: {e}")
+                raise
+            # Collections filled by the old drop-and-insert runs may hold duplicates
+            removed = self._dedupe()
+            print(f"🧹 Removed {removed} duplicate postings from {self.collection.name} "
+                  f"before indexing {self.KEY}")
+            self.collection.create_index(self.KEY, unique=True)
+        JobIngestor._indexed.add(key)
+
+    def _dedupe(self):
+        """
+        Internal helper: Keep only the newest document per `jump_url`.
+        Removed postings are passed to `on_change` as deletions.
+        :return: Number of removed documents.
+        """
+        groups = self.collection.aggregate([
+            {"$sort": {"processed_at": -1, "_id": -1}},
+            {"$group": {"_id": f"${self.KEY}", "ids": {"$push": "$_id"}}},
+            {"$match": {"ids.1": {"$exists": True}}},
+        ], allowDiskUse=True)
+        stale = [doc_id for group in groups for doc_id in group["ids"][1:]]
+
+        removed = 0
+        for i in range(0, len(stale), self.chunk_size):
+            ids = stale[i:i + self.chunk_size]
+            old_docs = []
+            if self.on_change:
+                projection = {field: 1 for field in self.watch_fields} or None
+                old_docs = list(self.collection.find({"_id": {"$in": ids}}, projection))
+            removed += self.collection.delete_many({"_id": {"$in": ids}}).deleted_count
+            if old_docs:
+                self.on_change([(doc, None) for doc in old_docs])
+        return removed
+
+    @classmethod
+    def content_hash(cls, doc):
+        """
+        Stable hash over the non-volatile, non-tag fields of a job document.
+        """
+        ignored = cls.VOLATILE_FIELDS + cls.TAG_FIELDS
+        payload = {k: v for k, v in doc.items() if k not in ignored}
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
+
+    def _chunks(self, docs):
+        iterator = iter(docs)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def ingest(self, docs):
+        """
+        Upsert an iterable of job documents. The iterable is consumed lazily,
+        one chunk at a time, so generators keep memory flat.
+        :return: dict with inserted / updated / unchanged / tagged / skipped counts,
+                 where tagged postings were unchanged but matched a new query term.
+        """
+        self._ensure_index()
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "tagged": 0, "skipped": 0}
+
+        for chunk in self._chunks(docs):
+            self._ingest_chunk(chunk, stats)
+
+        return stats
+
+    @staticmethod
+    def _query_terms(doc):
+        terms = list(doc.get("query_terms") or [])
+        if doc.get("query_term") and doc["query_term"] not in terms:
+            terms.insert(0, doc["query_term"])
+        return terms
+
+    def _ingest_chunk(self, chunk, stats):
+        # Deduplicate inside the chunk, the last occurrence of a posting wins
+        incoming = {}
+        for doc in chunk:
+            url = doc.get(self.KEY)
+            if not url or url == "N/A":
+                stats["skipped"] += 1
+                continue
+            incoming[url] = doc
+
+        if not incoming:
+            return
+
+        fields = {field for doc in incoming.values() for field in doc}
+        projection = {field: 1 for field in fields | {"content_hash", "query_terms"} | set(self.watch_fields)}
+        existing = {
+            doc[self.KEY]: doc
+            for doc in self.collection.find({self.KEY: {"$in": list(incoming)}}, projection)
+        }
+
+        operations = []
+        changes = []
+        # (operation index, doc) of the upserts, reported once they really inserted
+        inserts = []
+        tag_only = 0
+        for url, doc in incoming.items():
+            doc_hash = self.content_hash(doc)
+            terms = self._query_terms(doc)
+            current = existing.get(url)
+
+            if current is None:
+                # jump_url itself is seeded from the upsert filter
+                new_doc = {k: v for k, v in doc.items() if k not in ("_id", self.KEY)}
+                new_doc["content_hash"] = doc_hash
+                new_doc["query_terms"] = terms
+                new_doc.setdefault("processed_at", datetime.now())
+                inserts.append((len(operations), doc))
+                operations.append(UpdateOne({self.KEY: url}, {"$setOnInsert": new_doc}, upsert=True))
+                continue
+
+            new_terms = [t for t in terms if t not in (current.get("query_terms") or [])]
+            tag_update = {"$addToSet": {"query_terms": {"$each": new_terms}}} if new_terms else {}
+
+            if current.get("content_hash") == doc_hash:
+                stats["unchanged"] += 1
+                if tag_update:
+                    operations.append(UpdateOne({self.KEY: url}, tag_update))
+                    tag_only += 1
+                continue
+
+            ignored = self.VOLATILE_FIELDS + self.TAG_FIELDS
+            changed = {
+                k: v for k, v in doc.items()
+                if k not in ignored and current.get(k) != v
+            }
+            changed["content_hash"] = doc_hash
+            changed["processed_at"] = doc.get("processed_at", datetime.now())
+            update = {"$set": changed, **tag_update}
+            if "must_have_skills" in changed:
+                update["$unset"] = {field: "" for field in self.SKILL_DERIVED_FIELDS}
+            operations.append(UpdateOne({self.KEY: url}, update))
+            changes.append((current, {**current, **changed}))
+
+        if operations:
+            result = self.collection.bulk_write(operations, ordered=False)
+            stats["inserted"] += result.upserted_count
+            stats["updated"] += result.modified_count - tag_only
+            stats["tagged"] += tag_only
+            # A concurrent crawl worker may have inserted the same URL first,
+            # then the $setOnInsert upsert matched it and changed nothing
+            changes += [(None, doc) for index, doc in inserts if index in result.upserted_ids]
+
+        if self.on_change and changes:
+            self.on_change(changes)
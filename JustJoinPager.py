@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from HostLimiter import HostLimiter
+
+
+class JustJoinPager:
+    """
+    Paging engine for the JustJoin.it `by-cursor` offers API.
+    Reuses keep-alive connections from a pooled session, retries transient
+    failures with exponential backoff (honouring `Retry-After` on 429) and
+    fetches the remaining pages concurrently once the total is known.
+    """
+
+    DEFAULT_BASE_URL = "https://api.justjoin.it/v2/user-panel/offers/by-cursor"
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, page_size=100, max_items=300,
+                 max_workers=4, timeout=10, retries=5, backoff_factor=0.5, session=None,
+                 limiter=None):
+        """
+        :param base_url: API endpoint, override to point at a local stub server.
+        :param page_size: Jobs requested per page (API maximum is 100).
+        :param max_items: Cap on the number of jobs returned, None for no cap.
+        :param max_workers: Number of pages fetched concurrently.
+        :param timeout: Per-request timeout in seconds.
+        :param limiter: HostLimiter shared with other crawlers to enforce per-host
+                        concurrency and request-rate budgets.
+        """
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_items = max_items
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = limiter or HostLimiter(max_concurrent=max_workers)
+        self.session = session or self._build_session(retries, backoff_factor)
+
+    def _build_session(self, retries, backoff_factor):
+        """
+        Internal helper: Session whose connection pool matches the worker count.
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _params(self, query_term, start):
+        return {
+            "cityRadiusKm": 30,
+            "currency": "pln",
+            "from": start,
+            "itemsCount": self.page_size,
+            "keywords[]": query_term,
+            "orderBy": "DESC",
+            "sortBy": "published",
+        }
+
+    def fetch_page(self, query_term, start):
+        """
+        Fetch a single page starting at offset `start` and return the decoded JSON.
+        """
+        with self.limiter.slot(self.base_url):
+            response = self.session.get(
+                self.base_url, params=self._params(query_term, start), timeout=self.timeout
+            )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _total_items(page):
+        meta = page.get("meta") or {}
+        total = meta.get("totalItems")
+        return int(total) if total is not None else None
+
+    @staticmethod
+    def _next_cursor(page, fetched):
+        """
+        Internal helper: Offset of the next page. Falls back to the number of
+        jobs fetched so far when the response carries no cursor.
+        """
+        meta = page.get("meta") or {}
+        next_page = meta.get("next") or {}
+        cursor = next_page.get("cursor")
+        if cursor is None and page.get("data"):
+            cursor = fetched
+        return int(cursor) if cursor is not None else None
+
+    def fetch(self, query_term):
+        """
+        Return every raw job for `query_term`, up to `max_items`.
+        The first page tells us the real total and the next cursor; the remaining
+        offsets are then fetched concurrently. Without a total we fall back to
+        following the cursor page by page until the API runs dry.
+        """
+        first = self.fetch_page(query_term, 0)
+        jobs = list(first.get("data", []))
+
+        total = self._total_items(first)
+        limit = total
+        if self.max_items is not None:
+            limit = self.max_items if total is None else min(total, self.max_items)
+
+        cursor = self._next_cursor(first, len(jobs))
+
+        if cursor is not None and total is not None:
+            offsets = range(cursor, limit, self.page_size)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for page in executor.map(lambda start: self.fetch_page(query_term, start), offsets):
+                    jobs.extend(page.get("data", []))
+        else:
+            while cursor is not None and (limit is None or len(jobs) < limit):
+                page = self.fetch_page(query_term, cursor)
+                data = page.get("data", [])
+                if not data:
+                    break
+                jobs.extend(data)
+                cursor = self._next_cursor(page, len(jobs))
+
+        return jobs if limit is None else jobs[:limit]
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score, pairwise_distances_argmin_min
+from threadpoolctl import threadpool_limits
+
+from ProcessPools import mp_context
+
+
+def build_estimator(k, algorithm="kmeans", n_init=10, max_iter=300, batch_size=4096,
+                    random_state=42, copy_x=True):
+    """
+    KMeans ("kmeans") or MiniBatchKMeans ("minibatch"); both accept CSR input.
+    """
+    if algorithm == "kmeans":
+        return KMeans(n_clusters=k, random_state=random_state, n_init=n_init,
+                      max_iter=max_iter, copy_x=copy_x)
+    if algorithm == "minibatch":
+        return MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=n_init,
+                               max_iter=max_iter, batch_size=batch_size)
+    raise ValueError(f"Unknown clustering algorithm '{algorithm}', expected 'kmeans' or 'minibatch'")
+
+
+def distortion(X, centers):
+    """
+    Mean Euclidean distance of each row to its nearest center, CSR-friendly.
+    """
+    _, distances = pairwise_distances_argmin_min(X, centers)
+    return float(np.mean(distances))
+
+
+def stratified_sample(labels, sample_size, random_state=42):
+    """
+    Row indices of a sample drawn per cluster in proportion to cluster size
+    (at least two rows per cluster so every cluster keeps a silhouette).
+    """
+    n = len(labels)
+    if sample_size is None or n <= sample_size:
+        return np.arange(n)
+
+    rng = np.random.default_rng(random_state)
+    picked = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        take = min(len(members), max(2, int(round(sample_size * len(members) / n))))
+        picked.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+# ---- worker side ----
+def _load_matrix(matrix_dir):
+    """
+    Memory-map the matrix written by KSweep._spill so workers share the OS page
+    cache instead of receiving a pickled copy each.
+    """
+    with open(os.path.join(matrix_dir, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["format"] == "csr":
+        arrays = [np.load(os.path.join(matrix_dir, f"{name}.npy"), mmap_mode="r")
+                  for name in ("data", "indices", "indptr")]
+        return sparse.csr_matrix(tuple(arrays), shape=tuple(meta["shape"]), copy=False)
+    return np.load(os.path.join(matrix_dir, "dense.npy"), mmap_mode="r")
+
+
+def _evaluate_k(matrix_dir, k, params, threads):
+    X = _load_matrix(matrix_dir)
+    with threadpool_limits(limits=threads):
+        start = time.perf_counter()
+        # Sparse rows are never centered, so the read-only map need not be copied
+        km = build_estimator(k, params["algorithm"], params["n_init"], params["max_iter"],
+                             random_state=params["random_state"], copy_x=not sparse.issparse(X))
+        labels = km.fit_predict(X)
+        fit_s = time.perf_counter() - start
+
+        idx = stratified_sample(labels, params["sample_size"], params["random_state"])
+        sil = silhouette_score(X[idx], labels[idx]) if len(np.unique(labels[idx])) > 1 else float("nan")
+
+    return {
+        "k": k,
+        "distortion": distortion(X, km.cluster_centers_),
+        "inertia": float(km.inertia_),
+        "silhouette": float(sil),
+        "silhouette_rows": int(len(idx)),
+        "fit_s": round(fit_s, 3),
+    }
+
+
+class KSweep:
+    """
+    Evaluate a range of k for KMeans in parallel worker processes.
+    The matrix is written once as .npy files and memory-mapped by every
+    worker, silhouette is estimated on a stratified sample, and per-k results
+    are cached on disk under a fingerprint of the matrix and parameters, so a
+    wider k range only computes the new values. The matrix copy is shared by
+    every parameter set, and only the `keep_versions` most recently used
+    matrices and result sets are kept.
+    """
+
+    DEFAULT_CACHE_DIR = os.path.join(".cache", "ksweep")
+    MATRICES = "matrices"
+
+    def __init__(self, X, algorithm="kmeans", n_init=10, max_iter=300, sample_size=5000,
+                 random_state=42, workers=None, cache_dir=DEFAULT_CACHE_DIR, keep_versions=3):
+        """
+        :param X: CSR (or dense) feature matrix.
+        :param sample_size: Rows used for the silhouette estimate, None for exact.
+        :param workers: Worker processes, defaults to the CPU count.
+        :param keep_versions: Matrices and result sets kept in `cache_dir`.
+        """
+        self.X = X.tocsr() if sparse.issparse(X) else np.asarray(X)
+        self.params = {
+            "algorithm": algorithm,
+            "n_init": n_init,
+            "max_iter": max_iter,
+            "sample_size": sample_size,
+            "random_state": random_state,
+        }
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.keep_versions = keep_versions
+        self._fingerprint = None
+
+    def matrix_fingerprint(self):
+        digest = hashlib.sha1(str(self.X.shape).encode())
+        if sparse.issparse(self.X):
+            for array in (self.X.data, self.X.indices, self.X.indptr):
+                digest.update(np.ascontiguousarray(array).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(self.X).tobytes())
+        return digest.hexdigest()
+
+    def fingerprint(self):
+        if self._fingerprint is None:
+            digest = hashlib.sha1(self.matrix_fingerprint().encode())
+            digest.update(json.dumps(self.params, sort_keys=True).encode())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def _result_dir(self):
+        return os.path.join(self.cache_dir, self.fingerprint())
+
+    def _result_path(self, k):
+        return os.path.join(self._result_dir(), f"k_{k}.json")
+
+    def _spill(self):
+        """
+        Internal helper: Write the matrix once for the workers to memory-map.
+        """
+        matrix_dir = os.path.join(self.cache_dir, self.MATRICES, self.matrix_fingerprint()[:16])
+        meta_path = os.path.join(matrix_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.utime(matrix_dir)
+            return matrix_dir
+
+        os.makedirs(matrix_dir, exist_ok=True)
+        if sparse.issparse(self.X):
+            for name in ("data", "indices", "indptr"):
+                np.save(os.path.join(matrix_dir, f"{name}.npy"), getattr(self.X, name))
+            meta = {"format": "csr", "shape": list(self.X.shape)}
+        else:
+            np.save(os.path.join(matrix_dir, "dense.npy"), self.X)
+            meta = {"format": "dense", "shape": list(self.X.shape)}
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        return matrix_dir
+
+    def _evict(self):
+        """
+        Internal helper: Drop all but the `keep_versions` most recently used
+        matrices and result sets.
+        """
+        for base, skip in ((os.path.join(self.cache_dir, self.MATRICES), None), (self.cache_dir, self.MATRICES)):
+            if not os.path.isdir(base):
+                continue
+            entries = [os.path.join(base, entry) for entry in os.listdir(base) if entry != skip]
+            entries = sorted(filter(os.path.isdir, entries), key=os.path.getmtime, reverse=True)
+            for path in entries[self.keep_versions:]:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def cached(self, k):
+        path = self._result_path(k)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def run(self, k_range):
+        """
+        Metrics for every k in `k_range` as a DataFrame (k, distortion, inertia,
+        silhouette, silhouette_rows, fit_s, cached).
+        """
+        results = {}
+        missing = []
+        for k in k_range:
+            hit = self.cached(k)
+            if hit is not None:
+                results[k] = dict(hit, cached=True)
+            else:
+                missing.append(k)
+
+        if missing:
+            print(f"Evaluating K values {missing} on {min(self.workers, len(missing))} worker(s)...")
+            matrix_dir = self._spill()
+            os.makedirs(self._result_dir(), exist_ok=True)
+            workers = min(self.workers, len(missing))
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context()) as executor:
+                futures = [executor.submit(_evaluate_k, matrix_dir, k, self.params, threads) for k in missing]
+                for future in futures:
+                    result = future.result()
+                    with open(self._result_path(result["k"]), "w") as f:
+                        json.dump(result, f)
+                    results[result["k"]] = dict(result, cached=False)
+                    print(f"k={result['k']}, silhouette score={result['silhouette']:.3f}")
+
+        if os.path.isdir(self._result_dir()):
+            os.utime(self._result_dir())
+        self._evict()
+        return pd.DataFrame([results[k] for k in k_range])
@@ -0,0 +1,248 @@
+import os
+import threading
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from constant import CollectionEnum
+from Instrumentation import Instrumentation
+from JobIngestor import JobIngestor
+from MongoFrameLoader import load_frame
+from RawPageArchive import RawPageArchive
+from SkillStatsView import SkillStatsView
+
+
+class JobsRepository:
+    """
+    Repository for a processed-jobs collection (jobs_processed / jobs_processed_jj).
+    """
+
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+
+    @property
+    def collection(self):
+        return self.db[self.name]
+
+    def find(self, query=None, projection=None, limit=0):
+        return self.collection.find(query or {}, projection).limit(limit)
+
+    def aggregate(self, pipeline, **kwargs):
+        return self.collection.aggregate(pipeline, **kwargs)
+
+    def bulk_write(self, operations, ordered=False):
+        return self.collection.bulk_write(operations, ordered=ordered)
+
+    def load_frame(self, fields, query=None):
+        """
+        Server-side projected, columnar DataFrame of `fields`, see MongoFrameLoader.
+        """
+        return load_frame(self.collection, fields, query)
+
+    def skill_stats(self):
+        return SkillStatsView(self.db)
+
+    def state(self):
+        """
+        Cheap server-side summary of the collection for change detection:
+        posting count, newest processed_at, salary sums and skill coverage.
+        """
+        skills_size = {"$cond": [{"$isArray": "$must_have_skills"}, {"$size": "$must_have_skills"}, 0]}
+        docs = list(self.aggregate([{"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "latest": {"$max": "$processed_at"},
+            "min_salary_sum": {"$sum": "$min_salary"},
+            "max_salary_sum": {"$sum": "$max_salary"},
+            "with_skills": {"$sum": {"$cond": [{"$gt": [skills_size, 0]}, 1, 0]}},
+            "skill_mentions": {"$sum": skills_size},
+        }}]))
+        state = docs[0] if docs else {"count": 0}
+        state.pop("_id", None)
+        return state
+
+    def skill_counts(self, limit=None):
+        """
+        (skill, posting count) pairs, most frequent first, counted on the server.
+        Skills are trimmed and lowercased; only the top `limit` rows are transferred.
+        """
+        pipeline = [
+            # Blank elements are dropped after the $unwind, not with their whole posting
+            {"$match": {"must_have_skills": {"$exists": True, "$ne": []}}},
+            {"$project": {"_id": 0, "must_have_skills": 1}},
+            # A plain string skill field unwinds as a single skill
+            {"$unwind": "$must_have_skills"},
+            {"$project": {"skill": {"$toLower": {"$trim": {"input": {"$toString": "$must_have_skills"}}}}}},
+            {"$match": {"skill": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$skill", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        if limit:
+            pipeline.append({"$limit": limit})
+        return [(doc["_id"], doc["count"]) for doc in self.aggregate(pipeline, allowDiskUse=True)]
+
+    def ingest(self, docs, chunk_size=500):
+        """
+        Incrementally upsert job documents, see JobIngestor.
+        The skill_stats view receives the per-posting deltas of every chunk.
+        """
+        view = self.skill_stats()
+        ingestor = JobIngestor(
+            self.collection, chunk_size=chunk_size,
+            on_change=view.apply, watch_fields=SkillStatsView.FIELDS,
+        )
+        return ingestor.ingest(docs)
+
+
+class RawPagesRepository:
+    """
+    Repository for the versioned raw listing pages in jobs_raw.
+    """
+
+    def __init__(self, db, name="jobs_raw"):
+        self.db = db
+        self.name = name
+
+    def archive(self, keep_versions=5):
+        return RawPageArchive(self.db, collection=self.name, keep_versions=keep_versions)
+
+    def save(self, url, html, query_term, keep_versions=5):
+        return self.archive(keep_versions).save(url, html, query_term)
+
+    def load(self, query_term=None, version=0):
+        return self.archive().load(query_term=query_term, version=version)
+
+    def versions(self, query_term=None):
+        return self.archive().versions(query_term)
+
+
+class MongoAccess:
+    """
+    Process-wide MongoDB access shared by the scrapers and analytics classes.
+    One pooled MongoClient per URI is created on first use with connect=False,
+    so constructors never block; the pool connects on the first real query.
+
+    MONGO_MODE from .env:
+    "local": connect with local mongodb
+    "atlas": connect with remote mongodb (ATLAS_MONGO_URI)
+    Optional tuning: DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_TIMEOUT_MS
+    """
+
+    _clients = {}
+    _settings = None
+    _lock = threading.Lock()
+
+    PLATFORM_COLLECTIONS = {
+        CollectionEnum.NO_FLUFF_JOBS: "jobs_processed",
+        CollectionEnum.JUST_JOIN: "jobs_processed_jj",
+    }
+
+    @classmethod
+    def settings(cls):
+        """
+        Connection settings read once from the environment / .env.
+        """
+        if cls._settings is None:
+            load_dotenv()
+            mode = os.getenv("MONGO_MODE", "local")
+            if mode == "atlas":
+                uri = os.getenv("ATLAS_MONGO_URI")
+                if not uri:
+                    raise ValueError("❌ Error: ATLAS_MONGO_URI not found in .env while mode is 'atlas'")
+            else:
+                uri = "mongodb://localhost:27017/"
+
+            cls._settings = {
+                "mode": mode,
+                "uri": uri,
+                "db_name": os.getenv("DB_NAME", "BD_final"),
+                "max_pool_size": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+                "timeout_ms": int(os.getenv("MONGO_TIMEOUT_MS", "5000")),
+            }
+        return cls._settings
+
+    @classmethod
+    def configure(cls, **overrides):
+        """
+        Override settings (uri, db_name, max_pool_size, timeout_ms) before first use.
+        """
+        settings = dict(cls.settings())
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        cls._settings = settings
+
+    @classmethod
+    def client(cls, uri=None):
+        """
+        Shared pooled client for `uri` (default: the configured URI), created lazily.
+        """
+        settings = cls.settings()
+        uri = uri or settings["uri"]
+        with cls._lock:
+            if uri not in cls._clients:
+                cls._clients[uri] = MongoClient(
+                    uri,
+                    connect=False,
+                    maxPoolSize=settings["max_pool_size"],
+                    serverSelectionTimeoutMS=settings["timeout_ms"],
+                    connectTimeoutMS=settings["timeout_ms"],
+                    event_listeners=Instrumentation.event_listeners(),
+                )
+            return cls._clients[uri]
+
+    @classmethod
+    def use_client(cls, client, uri=None):
+        """
+        Register a ready-made client for `uri`, e.g. an in-memory mongomock
+        client for benchmarks; later lookups of that URI return it.
+        """
+        uri = uri or cls.settings()["uri"]
+        with cls._lock:
+            cls._clients[uri] = client
+        return client
+
+    @classmethod
+    def db(cls, db_name=None, uri=None):
+        return cls.client(uri)[db_name or cls.settings()["db_name"]]
+
+    @classmethod
+    def ping(cls, uri=None):
+        """
+        Explicit connectivity check, raises if the server is unreachable.
+        """
+        cls.client(uri).admin.command('ping')
+        return True
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            for client in cls._clients.values():
+                client.close()
+            cls._clients.clear()
+
+    # ---- repositories ----
+    @classmethod
+    def jobs_processed(cls, db_name=None, uri=None):
+        return JobsRepository(cls.db(db_name, uri), "jobs_processed")
+
+    @classmethod
+    def jobs_processed_jj(cls, db_name=None, uri=None):
+        return JobsRepository(cls.db(db_name, uri), "jobs_processed_jj")
+
+    @classmethod
+    def jobs_raw(cls, db_name=None, uri=None):
+        return RawPagesRepository(cls.db(db_name, uri))
+
+    @classmethod
+    def skill_stats(cls, db_name=None, uri=None):
+        return SkillStatsView(cls.db(db_name, uri))
+
+    @classmethod
+    def jobs_for(cls, platform_name, db_name=None, uri=None, db=None):
+        """
+        Processed-jobs repository of a platform enum.
+        :param db: Database the caller already holds (overrides db_name / uri).
+        """
+        if platform_name not in cls.PLATFORM_COLLECTIONS:
+            raise NameError(f"Collection for {platform_name} not found.")
+        return JobsRepository(cls.db(db_name, uri) if db is None else db, cls.PLATFORM_COLLECTIONS[platform_name])
@@ -0,0 +1,107 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+from pymongo.collection import Collection
+
+try:
+    from pymongoarrow.api import Schema, find_arrow_all
+    import pyarrow as pa
+except ImportError:  # pymongoarrow is optional, the columnar fallback needs only pymongo
+    find_arrow_all = None
+
+
+# Column types of the processed-jobs documents
+FIELD_TYPES = {
+    "_id": "object",
+    "source": "str",
+    "job_title": "str",
+    "company_name": "str",
+    "location": "str",
+    "jump_url": "str",
+    "query_term": "str",
+    "min_salary": "float",
+    "max_salary": "float",
+    "cluster": "float",
+    "must_have_skills": "list",
+    "processed_at": "object",
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _arrow_schema(fields):
+    arrow_types = {
+        "str": pa.string(),
+        "float": pa.float64(),
+        "list": pa.list_(pa.string()),
+    }
+    return Schema({field: arrow_types[FIELD_TYPES.get(field, "str")] for field in fields})
+
+
+def _load_arrow(collection, fields, query):
+    """
+    Decode straight into Arrow columns with pymongoarrow (no per-row dicts at all).
+    """
+    table = find_arrow_all(collection, query, schema=_arrow_schema(fields))
+    columns = {}
+    for field in fields:
+        column = table.column(field)
+        if FIELD_TYPES.get(field) == "list":
+            # Keep the Python-list contract the analytics code relies on
+            columns[field] = pd.Series(column.to_pylist(), dtype=object)
+        else:
+            columns[field] = column.to_pandas()
+    return pd.DataFrame(columns, columns=fields)
+
+
+def _load_columnar(collection, fields, query, batch_size):
+    """
+    Stream cursor batches into per-field columns. Documents are consumed as
+    they arrive, numeric fields go into packed C arrays and list fields keep
+    a reference to the decoded list instead of being copied.
+    """
+    columns = {}
+    for field in fields:
+        columns[field] = array("d") if FIELD_TYPES.get(field) == "float" else []
+
+    projection = {field: 1 for field in fields}
+    if "_id" not in fields:
+        projection["_id"] = 0
+
+    appenders = [(field, columns[field].append) for field in fields]
+    for doc in collection.find(query, projection, batch_size=batch_size):
+        for field, append in appenders:
+            value = doc.get(field)
+            if value is None and isinstance(columns[field], array):
+                value = np.nan
+            append(value)
+
+    frame = {}
+    for field in fields:
+        values = columns[field]
+        if isinstance(values, array):
+            frame[field] = np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+        else:
+            frame[field] = pd.Series(values, dtype=object)
+    return pd.DataFrame(frame, columns=fields)
+
+
+def load_frame(collection, fields, query=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Load only `fields` of the documents matching `query` into a DataFrame.
+    The projection is applied on the server (`_id` excluded unless requested),
+    so URLs, timestamps and other unused fields never cross the wire.
+    Uses pymongoarrow when installed, a streaming columnar loader otherwise.
+    :param collection: pymongo collection.
+    :param fields: Field names, become the DataFrame columns in this order.
+    :param query: MongoDB filter, e.g. {"must_have_skills": {"$ne": []}}.
+    """
+    query = query or {}
+    fields = list(fields)
+    # pymongoarrow needs a real pymongo collection (not e.g. a mongomock stand-in)
+    if find_arrow_all is not None and isinstance(collection, Collection) and "_id" not in fields and all(
+        FIELD_TYPES.get(field, "str") in ("str", "float", "list") for field in fields
+    ):
+        return _load_arrow(collection, fields, query)
+    return _load_columnar(collection, fields, query, batch_size)
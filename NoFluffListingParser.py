@@ -0,0 +1,208 @@
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+
+BASE_DOMAIN = "https://nofluffjobs.com"  # Used to concatenate the full URL
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+# parse and split salary to min and max two value
+def parse_salary(salary_str):
+    """
+    Parse salary string
+    Example input: "10 000 - 15 000 PLN", "20 000 PLN", "Undisclosed"
+    Output: (min_salary, max_salary)
+    """
+    if not salary_str or "Undisclosed" in salary_str or "Agreement" in salary_str:
+        return None, None
+
+    # Remove spaces and thousands separators
+    clean_str = salary_str.replace('\xa0', '').replace(' ', '')
+
+    # Match all digits
+    numbers = re.findall(r'\d+', clean_str)
+
+    try:
+        if len(numbers) >= 2:
+            # Range salary: [10000, 15000]
+            return float(numbers[0]), float(numbers[1])
+        elif len(numbers) == 1:
+            # Fixed salary: [20000]
+            return float(numbers[0]), float(numbers[0])
+    except Exception:
+        pass
+
+    return None, None
+
+
+def normalize_location(loc_text):
+    """
+    Map the raw location text of a card to a city name, "Remote" or "Unknown".
+    """
+    if loc_text is None:
+        return "Unknown"
+
+    # Special case handling: Remote work
+    if "Remote" in loc_text or "Zdalna" in loc_text:
+        return "Remote"
+
+    # Extract city name (some include '+1', filter via split)
+    return loc_text.split('+')[0].strip()
+
+
+def _posting(job_title, company_name, salary_str, loc_text, relative_url):
+    min_sal, max_sal = parse_salary(salary_str)
+    return {
+        "source": "nofluffjobs",
+        'job_title': job_title,
+        'company_name': company_name,
+        'min_salary': min_sal,
+        'max_salary': max_sal,
+        'location': normalize_location(loc_text),
+        'jump_url': BASE_DOMAIN + relative_url if relative_url else "N/A",
+    }
+
+
+# ---- BeautifulSoup path (reference implementation) ----
+def iter_postings_bs4(html):
+    """
+    Parse every `a.posting-list-item` card with a full html.parser soup.
+    Kept as the reference the fast path is benchmarked and verified against.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for post in soup.select('a.posting-list-item'):
+        try:
+            title_el = post.select_one('h3.posting-title__position, .posting-title__can-hide')
+            if title_el:
+                # NFJ's badge class names usually contain title-badge
+                for badge in title_el.select('.title-badge, .title-badge--new'):
+                    badge.decompose()
+                job_title = title_el.get_text(strip=True)
+            else:
+                job_title = "N/A"
+
+            company_el = post.select_one('span.d-block, .company-name')
+            salary_el = post.select_one('span.text-truncate, nfj-posting-item-salary')
+            location_el = post.select_one('span.posting-info__location, nfj-posting-item-city')
+
+            yield _posting(
+                job_title,
+                company_el.get_text(strip=True) if company_el else "N/A",
+                salary_el.get_text(strip=True) if salary_el else "",
+                location_el.get_text(strip=True) if location_el else None,
+                post.get('href'),
+            )
+        except Exception as e:
+            print(f"Error parsing a single post: {e}")
+            continue
+
+
+# ---- lxml streaming path ----
+def _classes(el):
+    return el.get("class", "").split()
+
+
+def _is_title(el):
+    classes = _classes(el)
+    return (el.tag == "h3" and "posting-title__position" in classes) or "posting-title__can-hide" in classes
+
+
+def _is_badge(el):
+    classes = _classes(el)
+    return "title-badge" in classes or "title-badge--new" in classes
+
+
+def _is_company(el):
+    classes = _classes(el)
+    return (el.tag == "span" and "d-block" in classes) or "company-name" in classes
+
+
+def _is_salary(el):
+    return el.tag == "nfj-posting-item-salary" or (el.tag == "span" and "text-truncate" in _classes(el))
+
+
+def _is_location(el):
+    return el.tag == "nfj-posting-item-city" or (el.tag == "span" and "posting-info__location" in _classes(el))
+
+
+def _first(el, predicate):
+    """
+    First descendant in document order matching `predicate` (like select_one).
+    """
+    for child in el.iterdescendants():
+        if isinstance(child.tag, str) and predicate(child):
+            return child
+    return None
+
+
+def _strings(el, skip=None):
+    # Comments and processing instructions contribute their tail but not their text
+    if el.text and isinstance(el.tag, str):
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and not (skip and skip(child)):
+            yield from _strings(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+def _text(el, skip=None):
+    """
+    Equivalent of BeautifulSoup's get_text(strip=True).
+    """
+    return "".join(s.strip() for s in _strings(el, skip) if s.strip())
+
+
+def _parse_card(post):
+    title_el = _first(post, _is_title)
+    company_el = _first(post, _is_company)
+    salary_el = _first(post, _is_salary)
+    location_el = _first(post, _is_location)
+
+    return _posting(
+        _text(title_el, skip=_is_badge) if title_el is not None else "N/A",
+        _text(company_el) if company_el is not None else "N/A",
+        _text(salary_el) if salary_el is not None else "",
+        _text(location_el) if location_el is not None else None,
+        post.get('href'),
+    )
+
+
+def iter_postings(html, chunk_size=FEED_CHUNK_SIZE):
+    """
+    Stream `a.posting-list-item` cards out of a listing page with lxml.
+    The page is fed to a pull parser in chunks and each card is released
+    as soon as it has been parsed, so memory stays flat in the page size
+    and callers can insert cards while the rest is still being parsed.
+    Output matches iter_postings_bs4 field for field.
+    """
+    parser = etree.HTMLPullParser(events=("end",), tag="a")
+
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        yield from _drain(parser)
+
+    parser.close()
+    yield from _drain(parser)
+
+
+def _drain(parser):
+    for _, el in parser.read_events():
+        if "posting-list-item" not in _classes(el):
+            continue
+        try:
+            yield _parse_card(el)
+        except Exception as e:
+            print(f"Error parsing a single post: {e}")
+        # Free the parsed card and the cards before it
+        el.clear(keep_tail=True)
+        parent = el.getparent()
+        if parent is not None:
+            while el.getprevious() is not None:
+                del parent[0]
+
+
+PARSERS = {"lxml": iter_postings, "bs4": iter_postings_bs4}
@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import matplotlib
+
+from ArtifactStore import ArtifactStore
+from Instrumentation import Instrumentation
+from MongoAccess import MongoAccess
+from ReportRenderer import ReportRenderer
+from SkillVocabulary import SkillVocabulary
+from constant import CollectionEnum
+
+
+class Stage:
+    """
+    One node of the pipeline DAG.
+    :param run: Callable doing the work, returns a JSON-able summary.
+    :param inputs: Callable returning a JSON-able description of the data the
+                   stage reads; with the params it forms the stage fingerprint.
+    :param outputs: Paths that must exist for the stage to count as up to date.
+    :param max_age: Seconds a successful run stays current (scrapers read the
+                    live job boards, which have no fingerprint).
+    """
+
+    def __init__(self, name, deps, run, params, inputs=None, outputs=(), max_age=None):
+        self.name = name
+        self.deps = tuple(deps)
+        self.run = run
+        self.params = params
+        self.inputs = inputs or (lambda: None)
+        self.outputs = tuple(outputs)
+        self.max_age = max_age
+
+
+class PipelineOrchestrator:
+    """
+    Headless driver of the whole system, the command-line counterpart of
+    running main.ipynb top to bottom. Stages form a DAG:
+
+        scrape_nofluff -> enrich_skills --+--> cluster
+        scrape_justjoin ------------------+--> salary_model
+                                          +--> word_cloud
+
+    Stages whose dependencies are done run concurrently on a thread pool. A
+    stage is skipped when its fingerprint (params + a server-side summary of
+    the collections it reads) matches its last successful run and its outputs
+    exist. Results are recorded in a state file after every stage, so a
+    re-run after a failure resumes with the failed stage and what depends on it.
+    """
+
+    STATE_PATH = os.path.join(".cache", "pipeline_state.json")
+
+    def __init__(self, query_term="backend", clicks=3, max_items=300, enrich_workers=4, enrich_mode="http",
+                 k=12, algorithm="kmeans", scrape_max_age=24 * 3600, output_dir="reports", workers=None,
+                 state_path=STATE_PATH, artifacts=None, vocabulary=None):
+        """
+        :param scrape_max_age: Seconds before the scrape stages are due again.
+        :param output_dir: Report figures, one sub-directory per analytics stage.
+        :param workers: Stages running at once (default: all independent ones).
+        """
+        self.query_term = query_term
+        self.clicks = clicks
+        self.max_items = max_items
+        self.enrich_workers = enrich_workers
+        self.enrich_mode = enrich_mode
+        self.k = k
+        self.algorithm = algorithm
+        self.scrape_max_age = scrape_max_age
+        self.output_dir = output_dir
+        self.workers = workers
+        self.state_path = state_path
+        self.artifacts = artifacts or ArtifactStore()
+        # One vocabulary for the concurrent cluster and salary stages keeps skill ids consistent
+        self.vocabulary = vocabulary or SkillVocabulary.load()
+        self.platforms = [CollectionEnum.NO_FLUFF_JOBS, CollectionEnum.JUST_JOIN]
+        self.stages = self._stages()
+        self._lock = threading.Lock()
+
+    # ---- the DAG ----
+    def _stages(self):
+        analytics_deps = ("enrich_skills", "scrape_justjoin")
+        stages = [
+            Stage("scrape_nofluff", (), self._scrape_nofluff,
+                  {"query_term": self.query_term, "clicks": self.clicks}, max_age=self.scrape_max_age),
+            Stage("enrich_skills", ("scrape_nofluff",), self._enrich_skills,
+                  {"workers": self.enrich_workers, "mode": self.enrich_mode},
+                  inputs=lambda: MongoAccess.jobs_processed().state()),
+            Stage("scrape_justjoin", (), self._scrape_justjoin,
+                  {"query_term": self.query_term, "max_items": self.max_items}, max_age=self.scrape_max_age),
+            Stage("cluster", analytics_deps, self._cluster,
+                  {"k": self.k, "algorithm": self.algorithm}, inputs=self._jobs_state,
+                  outputs=[self._report_dir("cluster")]),
+            Stage("salary_model", analytics_deps, self._salary_model, {}, inputs=self._jobs_state,
+                  outputs=[self._report_dir("salary_model")]),
+            Stage("word_cloud", analytics_deps, self._word_cloud, {}, inputs=self._jobs_state,
+                  outputs=[self._report_dir("word_cloud")]),
+        ]
+        return {stage.name: stage for stage in stages}
+
+    def _jobs_state(self):
+        return {platform.name: MongoAccess.jobs_for(platform).state() for platform in self.platforms}
+
+    def _report_dir(self, stage_name):
+        return os.path.join(self.output_dir, stage_name)
+
+    def _renderer(self, stage_name):
+        # A directory per stage: concurrent stages never share a report state file
+        return ReportRenderer(self._report_dir(stage_name))
+
+    # ---- stage bodies ----
+    def _scrape_nofluff(self):
+        # Imported here: the scrapers pull in selenium, not needed by the analytics stages
+        from WebScrapingNoFluff import WebScrapingNoFluff
+        scraper = WebScrapingNoFluff(query_term=self.query_term)
+        scraper.scrape_save_raw_to_db(clicks=self.clicks, headless=True)
+        return scraper.process_and_save()
+
+    def _enrich_skills(self):
+        from WebScrapingNoFluff import WebScrapingNoFluff
+        scraper = WebScrapingNoFluff(query_term=self.query_term)
+        return scraper.scrape_must_have_skills(workers=self.enrich_workers, mode=self.enrich_mode)
+
+    def _scrape_justjoin(self):
+        from WebScrapingJustJoin import WebScrapingJustJoin
+        return WebScrapingJustJoin(query_term=self.query_term, max_items=self.max_items).scrape_and_process()
+
+    def _cluster(self):
+        from JobClusterManager import JobClusterManager
+        manager = JobClusterManager(artifacts=self.artifacts, vocabulary=self.vocabulary)
+        manager.load_and_preprocess_data()
+        manager.vectorize_skills()
+        manager.run_clustering(self.k, algorithm=self.algorithm)
+        manager.save_clusters()
+        cluster_stats = manager.analyze_salaries(plot=False)
+        skill_gap = manager.analyze_skill_gap(cluster_stats, plot=False)
+
+        renderer = self._renderer("cluster")
+        manager.add_report_figures(renderer, cluster_stats=cluster_stats, skill_gap=skill_gap)
+        renderer.render()
+        return {"postings": len(manager.df), "k": self.k}
+
+    def _salary_model(self):
+        from SalaryModelManager import SalaryModelManager
+        manager = SalaryModelManager(artifacts=self.artifacts, vocabulary=self.vocabulary)
+        models = manager.train_all(self.platforms, plot=False)
+
+        renderer = self._renderer("salary_model")
+        manager.add_report_figures(renderer)
+        renderer.render()
+        return {platform.value: model is not None for platform, model in models.items()}
+
+    def _word_cloud(self):
+        from JobDataCloudImageGenerator import JobDataCloudImageGenerator
+        renderer = self._renderer("word_cloud")
+        JobDataCloudImageGenerator().add_report_figures(renderer, self.platforms)
+        return renderer.render()
+
+    # ---- state ----
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _record(self, name, record):
+        with self._lock:
+            state = self._load_state()
+            state[name] = record
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, indent=2, default=str)
+            os.replace(tmp_path, self.state_path)
+
+    def _fingerprint(self, stage):
+        return ArtifactStore.fingerprint(stage.params, stage.inputs())
+
+    def is_current(self, name, fingerprint=None):
+        """
+        Whether stage `name` is up to date with its inputs, outputs and max_age.
+        """
+        stage = self.stages[name]
+        record = self._load_state().get(name)
+        if not record or record.get("status") != "ok":
+            return False
+        if stage.max_age is not None and time.time() - record["finished_ts"] > stage.max_age:
+            return False
+        if not all(os.path.exists(path) for path in stage.outputs):
+            return False
+        return record["fingerprint"] == (fingerprint or self._fingerprint(stage))
+
+    # ---- selection ----
+    def downstream(self, name):
+        """
+        Stage `name` and every stage depending on it, in DAG order.
+        """
+        selected = {name}
+        for stage in self.stages.values():
+            if selected.intersection(stage.deps):
+                selected.add(stage.name)
+        return [stage_name for stage_name in self.stages if stage_name in selected]
+
+    def select(self, only=None, start=None):
+        for name in list(only or []) + ([start] if start else []):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}', expected one of {list(self.stages)}")
+        if only:
+            return [name for name in self.stages if name in only]
+        if start:
+            return self.downstream(start)
+        return list(self.stages)
+
+    # ---- execution ----
+    def _run_stage(self, name, force):
+        stage = self.stages[name]
+        try:
+            fingerprint = self._fingerprint(stage)
+            if not force and self.is_current(name, fingerprint):
+                print(f"⏭️ {name}: up to date")
+                return "skipped"
+
+            print(f"▶️ {name}: running")
+            started = time.perf_counter()
+            with Instrumentation.stage(f"PipelineOrchestrator.{name}"):
+                summary = stage.run()
+            seconds = time.perf_counter() - started
+            # Stages may change what they read (enrichment writes skills), so the
+            # fingerprint of record is the one after the run
+            self._record(name, {
+                "status": "ok",
+                "fingerprint": self._fingerprint(stage),
+                "finished_at": datetime.now().isoformat(),
+                "finished_ts": time.time(),
+                "seconds": round(seconds, 3),
+                "summary": summary,
+            })
+            print(f"✅ {name}: done in {seconds:.1f}s")
+            return "ok"
+        except Exception as e:
+            traceback.print_exc()
+            self._record(name, {"status": "failed", "error": repr(e), "finished_at": datetime.now().isoformat()})
+            print(f"❌ {name}: failed ({e})")
+            return "failed"
+
+    def plan(self, only=None, start=None, force=False):
+        """
+        What a run would do with the current data: stage -> "run" / "up to date".
+        Stages downstream of one that runs may still turn out stale once it has.
+        """
+        return {name: "run" if force or not self.is_current(name) else "up to date"
+                for name in self.select(only, start)}
+
+    def run(self, only=None, start=None, force=False):
+        """
+        Run the selected stages, independent ones concurrently.
+        :param only: Run just these stages; their dependencies are taken as done.
+        :param start: Run this stage and everything downstream of it.
+        :param force: Ignore fingerprints and run every selected stage.
+        :return: stage -> "ok" / "skipped" / "failed" / "blocked" (a dependency failed).
+        """
+        selected = self.select(only, start)
+        pending = list(selected)
+        statuses = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers or len(selected) or 1) as executor:
+            while pending or running:
+                for name in list(pending):
+                    deps = [dep for dep in self.stages[name].deps if dep in selected]
+                    if any(statuses.get(dep) in ("failed", "blocked") for dep in deps):
+                        pending.remove(name)
+                        statuses[name] = "blocked"
+                        print(f"⛔ {name}: blocked by a failed dependency")
+                    elif all(dep in statuses for dep in deps):
+                        pending.remove(name)
+                        running[executor.submit(self._run_stage, name, force)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    statuses[running.pop(future)] = future.result()
+
+        print("\n--- Pipeline summary ---")
+        for name in selected:
+            print(f"{name:<18}{statuses[name]}")
+        return {name: statuses[name] for name in selected}
+
+
+def main():
+    matplotlib.use("Agg")
+
+    arg_parser = argparse.ArgumentParser(description="Run the scraping and analytics pipeline")
+    selection = arg_parser.add_mutually_exclusive_group()
+    selection.add_argument("--only", nargs="+", metavar="STAGE", help="Run just these stages")
+    selection.add_argument("--from", dest="start", metavar="STAGE", help="Run this stage and its downstream")
+    arg_parser.add_argument("--force", action="store_true", help="Run selected stages even if up to date")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Only print which stages would run")
+    arg_parser.add_argument("--query", default="backend", help="Search keyword of both scrapers")
+    arg_parser.add_argument("--clicks", type=int, default=3)
+    arg_parser.add_argument("--max-items", type=int, default=300)
+    arg_parser.add_argument("--enrich-workers", type=int, default=4)
+    arg_parser.add_argument("--enrich-mode", default="http", choices=["browser", "http", "offline"])
+    arg_parser.add_argument("--k", type=int, default=12, help="Number of clusters")
+    arg_parser.add_argument("--algorithm", default="kmeans", choices=["kmeans", "minibatch"])
+    arg_parser.add_argument("--scrape-max-age", type=float, default=24.0, help="Hours before re-scraping")
+    arg_parser.add_argument("--output", default="reports")
+    arg_parser.add_argument("--workers", type=int)
+    arg_parser.add_argument("--state", default=PipelineOrchestrator.STATE_PATH)
+    args = arg_parser.parse_args()
+
+    orchestrator = PipelineOrchestrator(
+        query_term=args.query, clicks=args.clicks, max_items=args.max_items,
+        enrich_workers=args.enrich_workers, enrich_mode=args.enrich_mode, k=args.k, algorithm=args.algorithm,
+        scrape_max_age=args.scrape_max_age * 3600, output_dir=args.output, workers=args.workers,
+        state_path=args.state,
+    )
+    try:
+        if args.dry_run:
+            for name, action in orchestrator.plan(args.only, args.start, args.force).items():
+                print(f"{name:<18}{action}")
+            return
+        statuses = orchestrator.run(args.only, args.start, args.force)
+    except ValueError as e:
+        arg_parser.error(str(e))
+    sys.exit(1 if any(status in ("failed", "blocked") for status in statuses.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import multiprocessing
+
+
+def mp_context():
+    """
+    Multiprocessing context for the ProcessPoolExecutors of the pipeline.
+    Workers are started fresh (forkserver, or spawn where it is unavailable)
+    instead of forking a caller whose MongoClient monitor threads, Selenium
+    drivers and thread pools are not fork-safe.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
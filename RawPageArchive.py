@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+from datetime import datetime
+
+import gridfs
+from bson import Binary, ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+
+class RawPageArchive:
+    """
+    Versioned archive of raw listing pages in `jobs_raw`.
+    Pages are compressed (zstd when installed, gzip otherwise), identical
+    captures are deduplicated by content hash, pages too large for a
+    document go to GridFS, and only the newest `keep_versions` captures
+    per query term are retained so any of them can be re-parsed later.
+    """
+
+    # Compressed pages above this size are stored in GridFS (document limit is 16 MB)
+    GRIDFS_THRESHOLD = 8 * 1024 * 1024
+
+    _indexed = set()
+
+    def __init__(self, db, collection="jobs_raw", keep_versions=5, codec=None):
+        """
+        :param db: pymongo database.
+        :param keep_versions: Captures kept per query term, older ones are evicted.
+        :param codec: "zstd" or "gzip", defaults to zstd when available.
+        """
+        self.collection = db[collection]
+        self.fs = gridfs.GridFS(db, collection=f"{collection}_fs")
+        self.keep_versions = keep_versions
+        self.codec = codec or ("zstd" if zstandard else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise ValueError("❌ codec 'zstd' requires the zstandard package")
+
+    def _ensure_indexes(self):
+        key = (self.collection.database.name, self.collection.name)
+        if key in RawPageArchive._indexed:
+            return
+        self.collection.create_index([("query_term", ASCENDING), ("date", DESCENDING)])
+        self.collection.create_index([("query_term", ASCENDING), ("content_hash", ASCENDING)])
+        RawPageArchive._indexed.add(key)
+
+    # ---- compression ----
+    def _compress(self, data):
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data, codec):
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("❌ This capture is zstd-compressed, install zstandard to read it")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    # ---- write path ----
+    def save(self, url, html, query_term, date=None):
+        """
+        Archive one capture and evict versions beyond retention.
+        :return: (document id, True if the capture was new, False if deduplicated)
+        """
+        self._ensure_indexes()
+        date = date or datetime.now()
+        raw = html.encode("utf-8")
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        # Identical capture: just mark it as the latest one
+        existing = self.collection.find_one(
+            {"query_term": query_term, "content_hash": content_hash}, {"_id": 1}
+        )
+        if existing:
+            self.collection.update_one(
+                {"_id": existing["_id"]},
+                {"$set": {"date": date, "url": url}, "$inc": {"capture_count": 1}}
+            )
+            return existing["_id"], False
+
+        compressed = self._compress(raw)
+        document = {
+            'url': url,
+            'date': date,
+            'first_seen': date,
+            'query_term': query_term,
+            'content_hash': content_hash,
+            'codec': self.codec,
+            'size': len(raw),
+            'compressed_size': len(compressed),
+            'capture_count': 1,
+        }
+        if len(compressed) > self.GRIDFS_THRESHOLD:
+            document['gridfs_id'] = self.fs.put(compressed, filename=f"{query_term}-{content_hash}")
+        else:
+            document['content_z'] = Binary(compressed)
+
+        inserted_id = self.collection.insert_one(document).inserted_id
+        self._evict(query_term)
+        return inserted_id, True
+
+    def _evict(self, query_term):
+        """
+        Internal helper: Delete captures of `query_term` beyond the newest `keep_versions`.
+        """
+        stale = list(
+            self.collection.find({"query_term": query_term}, {"_id": 1, "gridfs_id": 1})
+            .sort("date", DESCENDING)
+            .skip(self.keep_versions)
+        )
+        for doc in stale:
+            if doc.get("gridfs_id"):
+                self.fs.delete(doc["gridfs_id"])
+        if stale:
+            self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in stale]}})
+
+    # ---- read path ----
+    def versions(self, query_term=None):
+        """
+        Metadata of the stored captures, newest first, without page content.
+        """
+        query = {} if query_term is None else {"query_term": query_term}
+        projection = {"content": 0, "content_z": 0}
+        return list(self.collection.find(query, projection).sort("date", DESCENDING))
+
+    def load(self, query_term=None, version=0):
+        """
+        Return a stored capture with its decoded HTML in 'content'.
+        :param query_term: Restrict to captures of this term, None for any term.
+        :param version: 0 for the latest capture, 1 for the one before, ...
+                        or the ObjectId of a specific capture.
+        """
+        if isinstance(version, ObjectId):
+            document = self.collection.find_one({"_id": version})
+        else:
+            query = {} if query_term is None else {"query_term": query_term}
+            matches = list(self.collection.find(query).sort("date", DESCENDING).skip(version).limit(1))
+            document = matches[0] if matches else None
+
+        if not document:
+            return None
+
+        # Captures written before the archive existed hold plain HTML
+        if "content" not in document:
+            if document.get("gridfs_id"):
+                compressed = self.fs.get(document["gridfs_id"]).read()
+            else:
+                compressed = document["content_z"]
+            document["content"] = self._decompress(compressed, document.get("codec")).decode("utf-8")
+            document.pop("content_z", None)
+        return document
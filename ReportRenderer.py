@@ -0,0 +1,350 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.patheffects as PathEffects
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from wordcloud import WordCloud
+
+from ArtifactStore import ArtifactStore
+from ProcessPools import mp_context
+
+
+# Rendered word-cloud bitmaps, keyed by a fingerprint of the counts and WordCloud parameters
+WORD_CLOUD_CACHE_DIR = os.path.join(".cache", "word_clouds")
+WORD_CLOUD_CACHE_SIZE = 64
+
+
+# ---- figure builders: data in, matplotlib Figure out ----
+def draw_optimal_k(metrics):
+    """
+    Elbow and Silhouette charts of a k sweep (DataFrame with k, distortion, silhouette).
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    ax1.plot(metrics["k"], metrics["distortion"], 'bx-')
+    ax1.set_xlabel("k")
+    ax1.set_ylabel("Distortion")
+    ax1.set_title("Elbow Method")
+
+    ax2.plot(metrics["k"], metrics["silhouette"], 'ro-')
+    ax2.set_xlabel("k")
+    ax2.set_ylabel("Silhouette Score")
+    ax2.set_title("Silhouette Analysis")
+    return fig
+
+
+def draw_salary_by_cluster(salary_df, order):
+    """
+    Boxplot of avg_salary per cluster, clusters in `order`.
+    """
+    fig, ax = plt.subplots(figsize=(14, 8))
+    sns.boxplot(x="cluster", y="avg_salary", data=salary_df, order=order, ax=ax)
+    ax.set_title("Salary Distribution by Skill Cluster (Outliers Removed)")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def draw_skill_gap(analysis):
+    """
+    High-Value Skills scatter (Salary Correlation vs Demand), top 20 annotated.
+    """
+    fig, ax = plt.subplots(figsize=(14, 10))
+    scatter = ax.scatter(analysis["demand"], analysis["salary_correlation"],
+                         c=analysis["salary_correlation"], cmap='viridis', s=80, alpha=0.8)
+    fig.colorbar(scatter, ax=ax, label="Salary Correlation")
+
+    for _, row in analysis.head(20).iterrows():
+        ax.annotate(
+            row["skill"], (row["demand"], row["salary_correlation"]),
+            textcoords="offset points", xytext=(5, 5), fontsize=10, fontweight='bold',
+            path_effects=[PathEffects.withStroke(linewidth=3, foreground='white')]
+        )
+    ax.set_title("Top 20 High-Value Skills: Market Demand vs. Salary Potential")
+    ax.set_xlabel("Demand (% of Jobs)")
+    ax.set_ylabel("Salary Correlation Index")
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def draw_salary_distribution(df, platform_label):
+    """
+    Salary histogram and salary-by-level boxplot of one platform.
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    ax1.hist(df["avg_salary"], bins=30, color='skyblue', edgecolor='black')
+    ax1.set_title(f"{platform_label}: Salary Distribution")
+    ax1.set_xlabel("Salary (PLN)")
+
+    df.boxplot(column="avg_salary", by="job_level", ax=ax2)
+    ax2.set_title(f"Salary by Level ({platform_label})")
+    fig.suptitle("")  # Clear automatic title
+    fig.tight_layout()
+    return fig
+
+
+def word_cloud_image(frequencies, wc_params, max_words, cache_dir=WORD_CLOUD_CACHE_DIR):
+    """
+    RGB array of the word cloud of {skill: count}. The WordCloud layout is the
+    expensive part, so the array is cached in `cache_dir` (None disables it).
+    """
+    path = _word_cloud_path(cache_dir, frequencies, wc_params, max_words)
+    if path and os.path.exists(path):
+        os.utime(path)  # recently used entries survive the pruning
+        return np.load(path)
+
+    image = WordCloud(**wc_params, max_words=max_words).generate_from_frequencies(frequencies).to_array()
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, image)
+        os.replace(tmp_path, path)
+        _prune_word_clouds(cache_dir)
+    return image
+
+
+def _word_cloud_path(cache_dir, frequencies, wc_params, max_words):
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{ArtifactStore.fingerprint(dict(frequencies), wc_params, max_words)}.npy")
+
+
+def _prune_word_clouds(cache_dir, keep=WORD_CLOUD_CACHE_SIZE):
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".npy")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # pruned concurrently
+
+
+def word_cloud_images(frequencies, wc_params, max_words, cache_dir=WORD_CLOUD_CACHE_DIR, workers=None):
+    """
+    Word-cloud arrays of several platforms, label -> array (None without data).
+    Clouds missing from the cache are laid out in parallel Agg worker processes.
+    """
+    images = {label: None for label in frequencies}
+    missing = []
+    for label, counts in frequencies.items():
+        if not counts:
+            continue
+        path = _word_cloud_path(cache_dir, counts, wc_params, max_words)
+        if path and os.path.exists(path):
+            images[label] = word_cloud_image(counts, wc_params, max_words, cache_dir)
+        else:
+            missing.append(label)
+
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 mp_context=mp_context()) as executor:
+            futures = {
+                label: executor.submit(word_cloud_image, frequencies[label], wc_params, max_words, cache_dir)
+                for label in missing
+            }
+            images.update({label: future.result() for label, future in futures.items()})
+    else:
+        images.update({label: word_cloud_image(frequencies[label], wc_params, max_words, cache_dir)
+                       for label in missing})
+    return images
+
+
+def draw_word_cloud(ax, label, frequencies, wc_params, max_words, image=None, cache_dir=WORD_CLOUD_CACHE_DIR):
+    """
+    Render one platform's skill frequencies (or its precomputed `image`) onto `ax`.
+    """
+    if not frequencies:
+        ax.set_title(f"{label} (No Data Found)")
+        ax.axis('off')
+        return
+    if image is None:
+        image = word_cloud_image(frequencies, wc_params, max_words, cache_dir)
+    ax.imshow(image, interpolation='bilinear')
+    ax.set_title(f"Platform: {label}", fontsize=18, fontweight='bold')
+    ax.axis('off')
+
+
+def draw_word_clouds(frequencies, wc_params, max_words, images=None, cache_dir=WORD_CLOUD_CACHE_DIR):
+    """
+    Side-by-side word clouds, `frequencies` maps platform label -> {skill: count}.
+    :param images: Precomputed label -> array, see word_cloud_images.
+    """
+    images = images or {}
+    n = len(frequencies)
+    fig, axes = plt.subplots(1, n, figsize=(10 * n, 10))
+    axes = [axes] if n == 1 else axes
+    for (label, counts), ax in zip(frequencies.items(), axes):
+        draw_word_cloud(ax, label, counts, wc_params, max_words, images.get(label), cache_dir)
+    fig.tight_layout()
+    return fig
+
+
+FIGURES = {
+    "optimal_k": draw_optimal_k,
+    "salary_by_cluster": draw_salary_by_cluster,
+    "skill_gap": draw_skill_gap,
+    "salary_distribution": draw_salary_distribution,
+    "word_clouds": draw_word_clouds,
+}
+
+
+def show_figure(kind, *args, **kwargs):
+    """
+    Interactive path used by the managers: build the figure and show it inline.
+    """
+    fig = FIGURES[kind](*args, **kwargs)
+    plt.show()
+    return fig
+
+
+# ---- worker side ----
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+def _render(kind, args, kwargs, paths):
+    fig = FIGURES[kind](*args, **kwargs)
+    try:
+        for path in paths:
+            fig.savefig(path)
+    finally:
+        plt.close(fig)
+    return paths
+
+
+class ReportRenderer:
+    """
+    Headless renderer for the report figures. Figures are queued with `add`
+    as (name, figure kind, data) and written by `render` as PNG/SVG into the
+    output directory, in parallel Agg worker processes. A figure whose data
+    fingerprint matches the previous run and whose files exist is skipped.
+    """
+
+    STATE_FILE = ".report_state.json"
+
+    def __init__(self, output_dir="reports", formats=("png", "svg"), workers=None):
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.workers = workers or os.cpu_count() or 1
+        self._jobs = {}
+
+    def add(self, name, kind, *args, **kwargs):
+        """
+        Queue figure `name` drawn by FIGURES[kind](*args, **kwargs).
+        """
+        if kind not in FIGURES:
+            raise ValueError(f"Unknown figure kind '{kind}', expected one of {sorted(FIGURES)}")
+        self._jobs[name] = (kind, args, kwargs)
+
+    def _paths(self, name):
+        return [os.path.join(self.output_dir, f"{name}.{fmt}") for fmt in self.formats]
+
+    def _load_state(self):
+        path = os.path.join(self.output_dir, self.STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        with open(os.path.join(self.output_dir, self.STATE_FILE), "w") as f:
+            json.dump(state, f, indent=2)
+
+    def render(self, force=False):
+        """
+        Render every queued figure whose data changed. A figure that fails does
+        not stop the others; the state of the rendered ones is saved before the
+        failures are raised as one RuntimeError.
+        :return: {"rendered": [names], "skipped": [names]}
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        state = self._load_state()
+        result = {"rendered": [], "skipped": []}
+        errors = {}
+
+        pending = {}
+        for name, (kind, args, kwargs) in self._jobs.items():
+            fingerprint = ArtifactStore.fingerprint(kind, self.formats, *args, kwargs)
+            paths = self._paths(name)
+            if not force and state.get(name) == fingerprint and all(os.path.exists(p) for p in paths):
+                result["skipped"].append(name)
+            else:
+                pending[name] = (fingerprint, kind, args, kwargs, paths)
+
+        if pending:
+            workers = min(self.workers, len(pending))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     mp_context=mp_context()) as executor:
+                futures = {
+                    name: executor.submit(_render, kind, args, kwargs, paths)
+                    for name, (_, kind, args, kwargs, paths) in pending.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors[name] = e
+                        state.pop(name, None)
+                        continue
+                    state[name] = pending[name][0]
+                    result["rendered"].append(name)
+            self._save_state(state)
+
+        self._jobs.clear()
+        print(f"🖼️ Report in {self.output_dir}: {len(result['rendered'])} rendered, "
+              f"{len(result['skipped'])} unchanged" + (f", {len(errors)} failed" if errors else ""))
+        if errors:
+            details = "; ".join(f"{name}: {e!r}" for name, e in errors.items())
+            raise RuntimeError(f"Failed to render {len(errors)} figure(s): {details}") from next(iter(errors.values()))
+        return result
+
+
+def main():
+    """
+    Nightly headless report: compute every analysis and render its figures.
+    """
+    matplotlib.use("Agg")
+    # Imported here: the managers import this module for their figure builders
+    from JobClusterManager import JobClusterManager
+    from SalaryModelManager import SalaryModelManager
+    from JobDataCloudImageGenerator import JobDataCloudImageGenerator
+    from constant import CollectionEnum
+
+    arg_parser = argparse.ArgumentParser(description="Render all report figures headlessly")
+    arg_parser.add_argument("--output", default="reports")
+    arg_parser.add_argument("--formats", nargs="+", default=["png", "svg"])
+    arg_parser.add_argument("--k", type=int, default=12, help="Number of clusters")
+    arg_parser.add_argument("--k-max", type=int, default=20, help="Upper bound of the k sweep")
+    arg_parser.add_argument("--workers", type=int)
+    arg_parser.add_argument("--force", action="store_true", help="Re-render unchanged figures")
+    args = arg_parser.parse_args()
+
+    renderer = ReportRenderer(args.output, formats=args.formats, workers=args.workers)
+    platforms = [CollectionEnum.NO_FLUFF_JOBS, CollectionEnum.JUST_JOIN]
+
+    clusters = JobClusterManager()
+    clusters.load_and_preprocess_data()
+    clusters.vectorize_skills()
+    k_metrics = clusters.plot_optimal_k(range(2, args.k_max), plot=False)
+    clusters.run_clustering(args.k)
+    cluster_stats = clusters.analyze_salaries(plot=False)
+    skill_gap = clusters.analyze_skill_gap(cluster_stats, plot=False)
+    clusters.add_report_figures(renderer, k_metrics, cluster_stats, skill_gap)
+
+    salaries = SalaryModelManager()
+    salaries.train_all(platforms, plot=False)
+    salaries.add_report_figures(renderer)
+
+    JobDataCloudImageGenerator().add_report_figures(renderer, platforms)
+
+    renderer.render(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,157 +1,314 @@
 import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from enum import Enum
-from pymongo import MongoClient
-from dotenv import load_dotenv
+from MongoAccess import MongoAccess
 
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split, GridSearchCV, KFold
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
+from threadpoolctl import threadpool_limits
 
 from enum import Enum            
-from constant import CollectionEnum
+from ArtifactStore import ArtifactStore
+from SkillVocabulary import SkillVocabulary, SkillMultiHot
+from SnapshotStore import resolve as resolve_snapshot
+from Instrumentation import instrumented
+from ReportRenderer import show_figure
 
 
 class SalaryModelManager:
-    def __init__(self):
+    BACKENDS = ("forest", "hist_gb")
+    # Grids of the cross-validated hyperparameter search, per backend
+    PARAM_GRIDS = {
+        "forest": {
+            "regressor__n_estimators": [100, 300],
+            "regressor__max_depth": [None, 20],
+            "regressor__min_samples_leaf": [1, 3],
+        },
+        "hist_gb": {
+            "regressor__learning_rate": [0.05, 0.1],
+            "regressor__max_iter": [200, 400],
+            "regressor__max_leaf_nodes": [15, 31],
+        },
+    }
+    # Seniority keywords of job titles, the first match wins
+    LEVEL_PATTERNS = (("senior", "senior"), ("junior", "junior"), ("mid", "mid|regular"))
+    SKILL_FEATURE = "must_have_skills"
+
+    def __init__(self, artifacts=None, vocabulary=None, min_skill_count=5, snapshot=None,
+                 mongo_uri=None, db_name=None):
         """
-        Initialize the manager by automatically connecting to the database
-        using environment variables.
+        Initialize the manager with the shared database configured
+        through environment variables (mongo_uri / db_name override them).
+        :param artifacts: ArtifactStore for the fitted pipelines (default ./artifacts).
+        :param vocabulary: SkillVocabulary giving the skill feature columns (default: the persisted one).
+        :param min_skill_count: Skills listed in fewer training postings get no feature column.
+        :param snapshot: Snapshot (or its directory) to read postings from instead of MongoDB.
         """
-        load_dotenv()
-        self.db = self._init_db()
+        self.db = self._init_db(db_name, mongo_uri)
+        self.artifacts = artifacts or ArtifactStore()
+        self.vocabulary = vocabulary or SkillVocabulary.load()
+        self.min_skill_count = min_skill_count
+        self.snapshot = resolve_snapshot(snapshot)
         self.categorical_features = ["location", "source", "job_level"]
+        # train_all trains platforms on threads sharing the vocabulary: this lock
+        # serializes growing it against saving it, see _grow_vocabulary
+        self._vocabulary_lock = threading.Lock()
+        # Salary data of the last training run per platform, for the report figures
+        self.frames = {}
 
-    def _init_db(self):
+    def _init_db(self, db_name=None, mongo_uri=None):
         """
-        Internal method to establish connection with MongoDB (Atlas or Local).
+        Internal method: Shared, lazily connected database (Atlas or Local) from MongoAccess.
         """
-        mode = os.getenv("MONGO_MODE", "local")
-        db_name = os.getenv("DB_NAME", "BD_final")
-
-        if mode == "atlas":
-            uri = os.getenv("ATLAS_MONGO_URI")
-            if not uri:
-                raise ValueError("❌ ATLAS_MONGO_URI not found in .env")
-            print(f"🌐 Connecting to MongoDB Atlas...")
-        else:
-            uri = "mongodb://localhost:27017/"
-            print(f"🏠 Connecting to Local MongoDB...")
-
-        try:
-            client = MongoClient(uri)
-            # Send a ping to confirm a successful connection
-            client.admin.command('ping')
-            print(f"✅ Successfully connected to database: {db_name}")
-            return client[db_name]
-        except Exception as e:
-            print(f"❌ Database connection failed: {e}")
-            raise
+        return MongoAccess.db(db_name, mongo_uri)
 
-    @staticmethod
-    def _categorize_job_level(title):
+    @classmethod
+    def _categorize_job_level(cls, title):
         """
-        Internal helper to map job titles to seniority levels.
+        Internal helper to map one job title to a seniority level.
         """
         title = str(title).lower()
-        if "senior" in title:
-            return "senior"
-        if "junior" in title:
-            return "junior"
-        if "mid" in title or "regular" in title:
-            return "mid"
+        for level, pattern in cls.LEVEL_PATTERNS:
+            if re.search(pattern, title):
+                return level
         return "Other"
 
+    @classmethod
+    def _job_levels(cls, titles):
+        """
+        Internal helper: seniority levels of a Series of job titles, vectorized.
+        """
+        titles = titles.astype(str).str.lower()
+        conditions = [titles.str.contains(pattern, regex=True).to_numpy() for _, pattern in cls.LEVEL_PATTERNS]
+        levels = np.select(conditions, [level for level, _ in cls.LEVEL_PATTERNS], default="Other")
+        return pd.Series(levels, index=titles.index, dtype=object)
+
     def _fetch_and_clean_data(self, platform_name):
         """
         Retrieve data from MongoDB and perform initial cleaning/feature engineering.
         """
-        if platform_name == CollectionEnum.JUST_JOIN:
-            data = list(self.db.jobs_processed_jj.find())
-        elif platform_name == CollectionEnum.NO_FLUFF_JOBS:
-            data = list(self.db.jobs_processed.find())
+        # Only the required columns are projected and loaded
+        required_cols = ["source", "job_title", "min_salary", "max_salary", "location", self.SKILL_FEATURE]
+        if self.snapshot:
+            repository = self.snapshot.jobs_for(platform_name)
         else:
-            raise NameError(f"Collection for {platform_name} not found.")
-
-        df = pd.DataFrame(data)
-
-        # Select and validate required columns
-        required_cols = ["source", "job_title", "min_salary", "max_salary", "location"]
-        df = df[[col for col in required_cols if col in df.columns]]
+            repository = MongoAccess.jobs_for(platform_name, db=self.db)
+        df = repository.load_frame(required_cols)
 
         # Clean salary data
         df = df.dropna(subset=["min_salary", "max_salary"])
         df["avg_salary"] = (df["min_salary"] + df["max_salary"]) / 2
 
         # Engineering the 'job_level' feature
-        df["job_level"] = df["job_title"].apply(self._categorize_job_level)
+        df["job_level"] = self._job_levels(df["job_title"])
+        if self.SKILL_FEATURE not in df:
+            df[self.SKILL_FEATURE] = [[] for _ in range(len(df))]
 
         return df
 
-    def train_and_evaluate(self, platform_name):
+    def _build_pipeline(self, backend="forest", n_jobs=-1, memory=None, skills=None):
+        """
+        One-hot preprocessing, optional multi-hot skills and the regressor of `backend`.
+        :param memory: Cache directory for the fitted preprocessing (reused across CV fits).
+        :param skills: Add the skill columns (default: for the forest, which trains on sparse input).
+        """
+        skills = self._use_skills(backend, skills)
+        if backend == "forest":
+            encoder = OneHotEncoder(handle_unknown="ignore")
+            regressor = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+        elif backend == "hist_gb":
+            # Histogram boosting takes dense input only; the one-hot block is narrow
+            encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False)
+            regressor = HistGradientBoostingRegressor(random_state=42)
+        else:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+
+        transformers = [("cat", encoder, self.categorical_features)]
+        if skills:
+            transformers.append(
+                ("skills", SkillMultiHot(self.vocabulary, min_count=self.min_skill_count), self.SKILL_FEATURE)
+            )
+        # sparse_threshold=1.0: the job x (category + skill) matrix is never densified
+        preprocessor = ColumnTransformer(transformers=transformers, sparse_threshold=1.0)
+        return Pipeline(steps=[
+            ("preprocessor", preprocessor),
+            ("regressor", regressor)
+        ], memory=memory)
+
+    def _use_skills(self, backend, skills):
+        """
+        Internal helper: resolve the `skills` option of a backend.
+        """
+        if skills is None:
+            return backend == "forest"
+        if skills and backend == "hist_gb":
+            raise ValueError("The hist_gb backend needs dense input; use backend='forest' for skill features")
+        return skills
+
+    def _grow_vocabulary(self, skill_lists):
+        """
+        Internal helper: register unseen skills in the shared vocabulary before
+        fitting, so the fitted pipelines (and CV workers) only read it. Pickling
+        or cloning a pipeline on another thread meanwhile is safe: the vocabulary
+        copies its terms under the same lock it grows under.
+        """
+        with self._vocabulary_lock:
+            n_terms = len(self.vocabulary)
+            self.vocabulary.encode(skill_lists, grow=True)
+            if len(self.vocabulary) > n_terms:
+                self.vocabulary.save()
+
+    @instrumented()
+    def train_and_evaluate(self, platform_name, plot=True, backend="forest", search=False,
+                           param_grid=None, cv=5, n_jobs=-1, skills=None):
         """
         Main pipeline: Load data, train RandomForest model, and print metrics.
+        :param plot: Show the salary plots; see add_report_figures for headless runs.
+        :param backend: "forest" (RandomForest) or "hist_gb" (HistGradientBoosting, faster).
+        :param skills: Multi-hot must_have_skills features (default on for the forest).
+        :param search: Cross-validated grid search over `param_grid` (default PARAM_GRIDS[backend]);
+                       the preprocessing of each fold is fitted once and cached.
+        :param n_jobs: Cores for the forest, or for the search candidates when searching.
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        skills = self._use_skills(backend, skills)
         df = self._fetch_and_clean_data(platform_name)
 
         if df.empty:
             print(f"⚠️ No data available for {platform_name.value}. Skipping...")
             return None
 
-        X = df[self.categorical_features]
+        features = self.categorical_features + ([self.SKILL_FEATURE] if skills else [])
+        X = df[features]
         y = df["avg_salary"]
+        params = {
+            "platform": platform_name.value,
+            "features": features,
+            "min_skill_count": self.min_skill_count if skills else None,
+            "backend": backend,
+            "search": (param_grid or self.PARAM_GRIDS[backend]) if search else None,
+            "cv": cv if search else None,
+            "test_size": 0.2,
+            "random_state": 42,
+        }
 
-        # Build Pipeline
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ("cat", OneHotEncoder(handle_unknown="ignore"), self.categorical_features)
-            ]
-        )
+        def fit():
+            # Split and Train
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=params["test_size"], random_state=42
+            )
+            if skills:
+                self._grow_vocabulary(X_train[self.SKILL_FEATURE])
+            details = {}
+            # HistGradientBoosting ignores n_jobs and runs OpenMP on every core. The
+            # OpenMP thread count is a per-thread setting, so each platform thread
+            # of train_all gets its own share of the cores
+            with threadpool_limits(limits=n_jobs if n_jobs > 0 else None, user_api="openmp"):
+                if search:
+                    # Fold matrices are cached for this search only
+                    cache_dir = tempfile.mkdtemp(prefix="salary_pipeline_")
+                    try:
+                        # Candidates run in parallel, so each forest stays single-threaded
+                        grid = GridSearchCV(
+                            self._build_pipeline(backend, n_jobs=1, memory=cache_dir, skills=skills),
+                            params["search"],
+                            cv=KFold(n_splits=cv, shuffle=True, random_state=42),
+                            scoring="neg_mean_absolute_error",
+                            n_jobs=n_jobs,
+                        )
+                        grid.fit(X_train, y_train)
+                    finally:
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    model_pipeline = grid.best_estimator_
+                    # The refitted best pipeline must not point at the removed cache
+                    model_pipeline.set_params(memory=None)
+                    details = {"best_params": grid.best_params_, "cv_mae": float(-grid.best_score_)}
+                else:
+                    model_pipeline = self._build_pipeline(backend, n_jobs=n_jobs, skills=skills)
+                    model_pipeline.fit(X_train, y_train)
 
-        model_pipeline = Pipeline(steps=[
-            ("preprocessor", preprocessor),
-            ("regressor", RandomForestRegressor(n_estimators=100, random_state=42))
-        ])
+            # Evaluation
+            y_pred = model_pipeline.predict(X_test)
+            n_features = len(model_pipeline.named_steps["preprocessor"].get_feature_names_out())
+            return model_pipeline, dict(
+                details,
+                n_features=n_features,
+                mae=float(mean_absolute_error(y_test, y_pred)),
+                r2=float(r2_score(y_test, y_pred)),
+            )
 
-        # Split and Train
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        model_pipeline.fit(X_train, y_train)
-
-        # Evaluation
-        y_pred = model_pipeline.predict(X_test)
-        print(f"\n--- Result: {platform_name.value} ---")
-        print(f"MAE: {mean_absolute_error(y_test, y_pred):.2f} PLN")
-        print(f"R²: {r2_score(y_test, y_pred):.2f}")
+        # Unchanged data and parameters load the stored pipeline instead of refitting
+        key = ArtifactStore.fingerprint(X, y, params)
+        model_pipeline, meta = self.artifacts.load_or_fit(
+            f"salary_model_{platform_name.name.lower()}", key, fit, params
+        )
+        metrics = meta["metrics"]
+        print(f"\n--- Result: {platform_name.value} ({backend}) ---")
+        print(f"MAE: {metrics['mae']:.2f} PLN")
+        print(f"R²: {metrics['r2']:.2f}")
+        if "n_features" in metrics:
+            print(f"Features: {metrics['n_features']} (sparse)" if skills else f"Features: {metrics['n_features']}")
+        print(f"Fit time: {metrics['fit_seconds']:.2f} s" + (" (cached)" if meta["cached"] else ""))
+        if "best_params" in metrics:
+            print(f"Best parameters: {metrics['best_params']} (CV MAE {metrics['cv_mae']:.2f} PLN)")
 
         # Visualization
-        self._run_visualizations(df, platform_name)
+        self.frames[platform_name] = df[["avg_salary", "job_level"]]
+        if plot:
+            self._run_visualizations(df, platform_name)
 
         return model_pipeline
 
-    def _run_visualizations(self, df, platform_name):
+    @instrumented()
+    def train_all(self, platforms, plot=True, max_workers=None, **train_kwargs):
         """
-        Generates statistical plots.
+        Train the per-platform models concurrently, splitting the cores between them.
+        Plots are drawn afterwards on the calling thread.
+        :param train_kwargs: backend / search / param_grid / cv / n_jobs / skills of train_and_evaluate.
+        :return: dict platform -> fitted pipeline (None when the platform had no data).
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-        # Histogram
-        ax1.hist(df["avg_salary"], bins=30, color='skyblue', edgecolor='black')
-        ax1.set_title(f"{platform_name.value}: Salary Distribution")
-        ax1.set_xlabel("Salary (PLN)")
-
-        # Boxplot
-        df.boxplot(column="avg_salary", by="job_level", ax=ax2)
-        ax2.set_title(f"Salary by Level ({platform_name.value})")
-        plt.suptitle("") # Clear automatic title
-
-        plt.tight_layout()
-        plt.show()
+        platforms = list(platforms)
+        if not platforms:
+            return {}
+        workers = max_workers or len(platforms)
+        train_kwargs.setdefault("n_jobs", max(1, (os.cpu_count() or 1) // workers))
 
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                platform: executor.submit(self.train_and_evaluate, platform, plot=False, **train_kwargs)
+                for platform in platforms
+            }
+            models = {platform: future.result() for platform, future in futures.items()}
 
+        if plot:
+            for platform in platforms:
+                if models[platform] is not None:
+                    self._run_visualizations(self.frames[platform], platform)
+        return models
 
+    def _run_visualizations(self, df, platform_name):
+        """
+        Generates statistical plots.
+        """
+        show_figure("salary_distribution", df, platform_name.value)
 
+    def add_report_figures(self, renderer):
+        """
+        Queue the salary plots of every platform trained so far on a
+        ReportRenderer (headless report mode).
+        """
+        for platform_name, df in self.frames.items():
+            renderer.add(f"salary_distribution_{platform_name.name.lower()}", "salary_distribution",
+                         df, platform_name.value)
@@ -0,0 +1,325 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from ArtifactStore import ArtifactStore
+from SalaryModelManager import SalaryModelManager
+from constant import CollectionEnum
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used map with a fixed capacity.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SalaryPredictionService:
+    """
+    Serve salary estimates from a fitted SalaryModelManager pipeline.
+    Concurrent requests are queued and a single worker thread folds them into
+    micro-batches (up to `max_batch` rows, waiting at most `max_wait_ms` for
+    more), so each batch costs one vectorized `predict`. Results are cached
+    per feature tuple (location, source, job_level, skills) in an LRU, and
+    request latency / throughput counters are exposed by `stats()`.
+    """
+
+    FEATURES = ("location", "source", "job_level", SalaryModelManager.SKILL_FEATURE)
+
+    def __init__(self, pipeline, max_batch=256, max_wait_ms=2.0, cache_size=10000, latency_window=10000):
+        self.pipeline = pipeline
+        # Micro-batches are small: starting a joblib pool per predict costs more than it saves
+        if "regressor__n_jobs" in pipeline.get_params():
+            pipeline.set_params(regressor__n_jobs=1)
+        # Input columns the pipeline was fitted on (models without skill features skip them)
+        self.columns = list(getattr(pipeline, "feature_names_in_", self.FEATURES))
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache = LRUCache(cache_size)
+
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._counters = {"requests": 0, "cache_hits": 0, "batches": 0, "batched_rows": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stopping = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="salary-batcher", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def load(cls, platform_name, artifacts=None, **kwargs):
+        """
+        Service over the newest stored salary pipeline of a platform enum.
+        """
+        artifacts = artifacts or ArtifactStore()
+        stored = artifacts.load_latest(f"salary_model_{platform_name.name.lower()}")
+        if stored is None:
+            raise LookupError(f"No trained salary model for {platform_name.value}: "
+                              f"run SalaryModelManager.train_and_evaluate first.")
+        pipeline, meta = stored
+        print(f"📦 Serving salary model for {platform_name.value} trained {meta['created_at']}")
+        return cls(pipeline, **kwargs)
+
+    # ---- request side ----
+    @classmethod
+    def features(cls, location, source, job_level=None, job_title=None, skills=None):
+        """
+        Feature tuple of a posting; job_level is derived from the title when missing.
+        Skills are normalized and sorted, so equal skill sets share a cache entry.
+        """
+        if job_level is None:
+            job_level = SalaryModelManager._categorize_job_level(job_title)
+        skills = tuple(sorted({" ".join(str(skill).lower().split()) for skill in skills or ()}))
+        return (location, source, job_level, skills)
+
+    @classmethod
+    def posting_features(cls, posting):
+        """
+        Feature tuple of a posting dict (location, source, job_level or job_title,
+        and optionally must_have_skills).
+        """
+        return cls.features(posting.get("location"), posting.get("source"), posting.get("job_level"),
+                            posting.get("job_title"), posting.get(SalaryModelManager.SKILL_FEATURE))
+
+    def submit(self, features):
+        """
+        Asynchronous prediction of one feature tuple, returns a Future.
+        """
+        if self._stopping.is_set():
+            raise RuntimeError("Salary prediction service closed")
+        start = time.perf_counter()
+        future = Future()
+        future.started_at = start
+        cached = self.cache.get(features)
+        if cached is not None:
+            future.set_result(cached)
+            self._record(start, cache_hit=True)
+            return future
+        self._queue.put((features, future))
+        return future
+
+    def predict(self, location, source, job_level=None, job_title=None, skills=None, timeout=5.0):
+        """
+        Estimated average monthly salary (PLN) of one posting.
+        """
+        return self.submit(self.features(location, source, job_level, job_title, skills)).result(timeout)
+
+    def predict_many(self, postings, timeout=5.0):
+        """
+        Estimates for an iterable of dicts with location, source, job_level or job_title,
+        and optionally must_have_skills.
+        """
+        futures = [self.submit(self.posting_features(p)) for p in postings]
+        return [future.result(timeout) for future in futures]
+
+    # ---- batching worker ----
+    def _collect(self):
+        """
+        Internal helper: Block for the first request, then gather more until the
+        batch is full or the wait budget is spent.
+        """
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            # Identical tuples inside one batch are predicted once
+            unique = list(dict.fromkeys(features for features, _ in batch))
+            try:
+                frame = self._frame(unique)
+                predictions = dict(zip(unique, (float(v) for v in self.pipeline.predict(frame))))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                with self._lock:
+                    self._counters["errors"] += len(batch)
+                continue
+
+            for features, value in predictions.items():
+                self.cache.put(features, value)
+            with self._lock:
+                self._counters["batches"] += 1
+                self._counters["batched_rows"] += len(unique)
+            for features, future in batch:
+                future.set_result(predictions[features])
+                self._record(future.started_at)
+
+    def _frame(self, unique):
+        """
+        Internal helper: model input frame of feature tuples, skills as list cells.
+        """
+        frame = pd.DataFrame([f[:-1] for f in unique], columns=list(self.FEATURES[:-1]))
+        frame[self.FEATURES[-1]] = [list(f[-1]) for f in unique]
+        return frame[self.columns]
+
+    def _record(self, start, cache_hit=False):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+            self._counters["requests"] += 1
+            self._counters["cache_hits"] += cache_hit
+
+    # ---- metrics ----
+    def stats(self):
+        """
+        Counters plus p50 / p99 latency (ms, over the recent window) and throughput.
+        """
+        with self._lock:
+            latencies = np.fromiter(self._latencies, dtype=float)
+            counters = dict(self._counters)
+        uptime = time.perf_counter() - self._started
+        result = dict(
+            counters,
+            cache_size=len(self.cache),
+            queue_depth=self._queue.qsize(),
+            uptime_s=round(uptime, 3),
+            throughput_rps=round(counters["requests"] / uptime, 1) if uptime else 0.0,
+            avg_batch_rows=round(counters["batched_rows"] / counters["batches"], 1) if counters["batches"] else 0.0,
+        )
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            result.update(p50_ms=round(float(p50), 3), p99_ms=round(float(p99), 3))
+        return result
+
+    def close(self):
+        """
+        Stop the worker and fail the requests still queued, so no caller waits on them.
+        """
+        self._stopping.set()
+        self._worker.join(timeout=1.0)
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("Salary prediction service closed"))
+
+    # ---- HTTP endpoint ----
+    def serve(self, host="127.0.0.1", port=8765):
+        """
+        Blocking local HTTP endpoint:
+        POST /predict  one JSON posting or a list -> {"salary": x} or a list of them
+        GET  /stats    the stats() counters
+        """
+        server = ThreadingHTTPServer((host, port), _handler_for(self))
+        print(f"💰 Salary prediction service on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.close()
+
+
+REQUEST_TIMEOUT = 5.0
+
+
+def _handler_for(service):
+    class SalaryRequestHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, service.stats())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                postings = payload if isinstance(payload, list) else [payload]
+                features = [service.posting_features(posting) for posting in postings]
+            except (ValueError, TypeError, AttributeError) as e:
+                self._reply(400, {"error": str(e)})
+                return
+            # Malformed requests are rejected above; failures from here on are the service's
+            try:
+                futures = [service.submit(f) for f in features]
+                salaries = [{"salary": future.result(REQUEST_TIMEOUT)} for future in futures]
+            except TimeoutError:
+                self._reply(503, {"error": "prediction timed out"})
+                return
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+                return
+            self._reply(200, salaries if isinstance(payload, list) else salaries[0])
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet at thousands of requests per second
+
+    return SalaryRequestHandler
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve salary estimates over HTTP")
+    arg_parser.add_argument("--platform", default="NO_FLUFF_JOBS", choices=[p.name for p in CollectionEnum])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--max-batch", type=int, default=256)
+    arg_parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    arg_parser.add_argument("--cache-size", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    service = SalaryPredictionService.load(
+        CollectionEnum[args.platform], max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms, cache_size=args.cache_size,
+    )
+    service.serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
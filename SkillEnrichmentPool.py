@@ -0,0 +1,258 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup
+from pymongo import UpdateOne
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from DetailPageCache import DetailPageCache
+from HostLimiter import HostLimiter
+
+
+MUSTS_SELECTOR = 'section[branch="musts"]'
+
+
+def parse_must_have_skills(html):
+    """
+    Extract the lower-cased must-have skills from a NoFluff job detail page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    must_section = soup.select_one(MUSTS_SELECTOR)
+
+    skills = []
+    if must_section:
+        for tag in must_section.select('span[id^="item-tag-"]'):
+            skills.append(tag.get_text(strip=True).lower())
+    return skills
+
+
+class HttpDetailFetcher:
+    """
+    Fetches the server-rendered detail page over plain HTTP with a keep-alive session.
+    With a cache, fresh entries are served locally and stale ones are
+    revalidated with a conditional request.
+    """
+
+    def __init__(self, timeout=15, cache=None, limiter=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = limiter or HostLimiter()
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "Mozilla/5.0 (X11; Linux x86_64)"})
+
+    def fetch(self, url):
+        entry = self.cache.get(url) if self.cache else None
+        if self.cache and self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            return entry["body"]
+
+        headers = DetailPageCache.conditional_headers(entry)
+        with self.limiter.slot(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry:
+            self.cache.mark_revalidated(url)
+            return entry["body"]
+        response.raise_for_status()
+
+        if self.cache:
+            self.cache.record("misses")
+            self.cache.put(
+                url, response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class HeadlessDriverFetcher:
+    """
+    Renders the detail page in a headless Chrome and waits until the requirement
+    sections are present instead of sleeping a fixed amount of time.
+    """
+
+    def __init__(self, timeout=15, cache=None, limiter=None):
+        self.cache = cache
+        self.limiter = limiter or HostLimiter()
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        self.driver = webdriver.Chrome(options=options)
+        self.wait = WebDriverWait(self.driver, timeout)
+
+    @staticmethod
+    def _requirements_rendered(driver):
+        # Postings without a must-have list still render their other requirement sections
+        return driver.find_elements(By.CSS_SELECTOR, MUSTS_SELECTOR) or (
+            driver.execute_script("return document.readyState") == "complete"
+            and driver.find_elements(By.CSS_SELECTOR, "section[branch]")
+        )
+
+    def fetch(self, url):
+        # A browser cannot send conditional requests, so only the TTL applies
+        if self.cache:
+            entry = self.cache.get(url)
+            if self.cache.is_fresh(entry):
+                self.cache.record("hits")
+                return entry["body"]
+
+        with self.limiter.slot(url):
+            self.driver.get(url)
+            try:
+                self.wait.until(self._requirements_rendered)
+            except TimeoutException:
+                # A half-rendered page has no requirement section: neither cache
+                # it nor parse it, the job is counted as failed instead
+                raise TimeoutException(f"Requirements of {url} did not render in time") from None
+            html = self.driver.page_source
+
+        if self.cache:
+            self.cache.record("misses")
+            self.cache.put(url, html)
+        return html
+
+    def close(self):
+        self.driver.quit()
+
+
+class CacheOnlyFetcher:
+    """
+    Replays detail pages from the cache without touching the network.
+    """
+
+    def __init__(self, timeout=15, cache=None, limiter=None):
+        if cache is None:
+            raise ValueError("❌ Offline enrichment needs a DetailPageCache")
+        self.cache = cache
+
+    def fetch(self, url):
+        entry = self.cache.get(url)
+        if entry is None:
+            self.cache.record("misses")
+            raise LookupError(f"{url} is not in the detail page cache")
+        self.cache.record("hits")
+        return entry["body"]
+
+    def close(self):
+        pass
+
+
+class SkillEnrichmentPool:
+    """
+    Pool of workers that fetch job detail pages concurrently and write the
+    parsed must-have skills back in batched `bulk_write` updates.
+    Each worker thread owns one fetcher ("http", headless "browser" or
+    "offline" cache replay); a shared HostLimiter keeps the crawl polite
+    towards each host.
+    """
+
+    FETCHERS = {"http": HttpDetailFetcher, "browser": HeadlessDriverFetcher, "offline": CacheOnlyFetcher}
+
+    def __init__(self, collection, workers=4, mode="browser", limiter=None,
+                 batch_size=50, timeout=15, cache=None, on_change=None):
+        """
+        :param collection: pymongo collection holding the jobs to enrich.
+        :param workers: Number of concurrent fetchers.
+        :param mode: "browser" for headless Chrome, "http" for plain requests,
+                     "offline" to replay pages from `cache` only.
+        :param limiter: HostLimiter shared with other crawlers, built per pool if omitted.
+        :param batch_size: Number of skill updates per bulk_write.
+        :param cache: Optional DetailPageCache shared by all workers.
+        :param on_change: Optional callback receiving (old_doc, new_doc) pairs of
+                          every flushed batch, e.g. SkillStatsView.apply.
+        """
+        if mode not in self.FETCHERS:
+            raise ValueError(f"Unknown fetch mode '{mode}', expected one of {list(self.FETCHERS)}")
+        self.collection = collection
+        self.workers = workers
+        self.mode = mode
+        self.limiter = limiter or HostLimiter(max_concurrent=workers)
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.cache = cache
+        self.on_change = on_change
+
+        self._local = threading.local()
+        self._fetchers = []
+        self._fetchers_lock = threading.Lock()
+
+    def _fetcher(self):
+        """
+        Internal helper: Lazily build the fetcher owned by the current worker thread.
+        """
+        fetcher = getattr(self._local, "fetcher", None)
+        if fetcher is None:
+            fetcher = self.FETCHERS[self.mode](
+                timeout=self.timeout, cache=self.cache, limiter=self.limiter
+            )
+            self._local.fetcher = fetcher
+            with self._fetchers_lock:
+                self._fetchers.append(fetcher)
+        return fetcher
+
+    def _enrich(self, job):
+        html = self._fetcher().fetch(job["jump_url"])
+        return parse_must_have_skills(html)
+
+    def _flush(self, operations, changes):
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+            operations.clear()
+        if self.on_change and changes:
+            self.on_change(changes)
+        changes.clear()
+
+    def run(self, jobs):
+        """
+        Enrich the given job documents (needing `_id` and `jump_url`; their current
+        `must_have_skills` lets unchanged postings skip the write).
+        :return: dict with enriched / unchanged / failed counts.
+        """
+        stats = {"enriched": 0, "unchanged": 0, "failed": 0}
+        operations = []
+        changes = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {
+                    executor.submit(self._enrich, job): job
+                    for job in jobs if job.get("jump_url")
+                }
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        skills = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        print(f"❌ Error scraping {job['jump_url']} : {e}")
+                        continue
+
+                    if skills == job.get("must_have_skills"):
+                        # No write: the posting keeps its cluster label
+                        stats["unchanged"] += 1
+                        continue
+
+                    # A stored cluster label no longer matches the new skills
+                    operations.append(UpdateOne(
+                        {"_id": job["_id"]},
+                        {"$set": {"must_have_skills": skills}, "$unset": {"cluster": ""}},
+                    ))
+                    changes.append((job, dict(job, must_have_skills=skills)))
+                    stats["enriched"] += 1
+                    print(f"✔ {job.get('job_title')} → {skills}")
+
+                    if len(operations) >= self.batch_size:
+                        self._flush(operations, changes)
+            self._flush(operations, changes)
+        finally:
+            for fetcher in self._fetchers:
+                fetcher.close()
+            self._fetchers.clear()
+
+        return stats
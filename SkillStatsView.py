@@ -0,0 +1,221 @@
+from collections import defaultdict
+from datetime import datetime
+
+from pymongo import DESCENDING, UpdateOne
+
+
+class SkillStatsView:
+    """
+    Materialized skill-frequency view over jobs_processed and jobs_processed_jj.
+    One document per skill in `skill_stats` holds its job count (total and per
+    source), salary sums for the averages, the exact number of distinct titles
+    and a bounded sample of example titles. Ingestion keeps it current with
+    per-posting deltas; `rebuild` recomputes it from scratch with `$merge`.
+    """
+
+    SOURCE_COLLECTIONS = ("jobs_processed", "jobs_processed_jj")
+    SOURCES = ("nofluffjobs", "justjoin")
+    # Fields of a posting that contribute to the view
+    FIELDS = ("must_have_skills", "job_title", "min_salary", "max_salary", "source")
+    TITLE_SAMPLE_SIZE = 10
+
+    def __init__(self, db, name="skill_stats"):
+        self.db = db
+        self.stats = db[name]
+        self.titles = db[f"{name}_titles"]
+        self.meta = db[f"{name}_meta"]
+        self._built = None
+
+    # ---- state ----
+    def is_built(self):
+        """
+        Deltas are only meaningful once the view was built from the full collections.
+        """
+        if not self._built:
+            self._built = self.meta.find_one({"_id": "built"}) is not None
+        return self._built
+
+    def _ensure_indexes(self):
+        self.stats.create_index([("job_count", DESCENDING)])
+        for source in self.SOURCES:
+            self.stats.create_index([(f"sources.{source}", DESCENDING)])
+
+    # ---- full rebuild ----
+    def _unwound_postings(self):
+        base = [
+            {"$match": {"must_have_skills": {"$exists": True, "$ne": []}}},
+            {"$project": {field: 1 for field in self.FIELDS}},
+            {"$unwind": "$must_have_skills"},
+        ]
+        first, *others = self.SOURCE_COLLECTIONS
+        return first, base + [{"$unionWith": {"coll": coll, "pipeline": base}} for coll in others]
+
+    def rebuild(self):
+        """
+        Recompute the view from both job collections on the server.
+        """
+        self.stats.drop()
+        self.titles.drop()
+        first, unwound = self._unwound_postings()
+
+        # Distinct (skill, title) pairs with their posting count
+        self.db[first].aggregate(unwound + [
+            {"$group": {"_id": {"s": "$must_have_skills", "t": "$job_title"}, "n": {"$sum": 1}}},
+            {"$merge": {"into": self.titles.name, "whenMatched": "replace"}},
+        ], allowDiskUse=True)
+
+        # Counts and salary sums per skill and source
+        self.db[first].aggregate(unwound + [
+            {"$group": {
+                "_id": {"skill": "$must_have_skills", "source": {"$ifNull": ["$source", "unknown"]}},
+                "job_count": {"$sum": 1},
+                "min_salary_sum": {"$sum": "$min_salary"},
+                "min_salary_count": {"$sum": {"$cond": [{"$isNumber": "$min_salary"}, 1, 0]}},
+                "max_salary_sum": {"$sum": "$max_salary"},
+                "max_salary_count": {"$sum": {"$cond": [{"$isNumber": "$max_salary"}, 1, 0]}},
+            }},
+            {"$group": {
+                "_id": "$_id.skill",
+                "job_count": {"$sum": "$job_count"},
+                "sources": {"$push": {"k": "$_id.source", "v": "$job_count"}},
+                "min_salary_sum": {"$sum": "$min_salary_sum"},
+                "min_salary_count": {"$sum": "$min_salary_count"},
+                "max_salary_sum": {"$sum": "$max_salary_sum"},
+                "max_salary_count": {"$sum": "$max_salary_count"},
+            }},
+            {"$addFields": {"sources": {"$arrayToObject": "$sources"}}},
+            {"$merge": {"into": self.stats.name, "whenMatched": "replace"}},
+        ], allowDiskUse=True)
+
+        # Distinct title count and a bounded title sample per skill
+        self.titles.aggregate([
+            {"$group": {"_id": "$_id.s", "unique_titles_count": {"$sum": 1}, "example_titles": {"$push": "$_id.t"}}},
+            {"$project": {
+                "unique_titles_count": 1,
+                "example_titles": {"$slice": ["$example_titles", self.TITLE_SAMPLE_SIZE]},
+            }},
+            {"$merge": {"into": self.stats.name, "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ], allowDiskUse=True)
+
+        self._ensure_indexes()
+        self.meta.replace_one({"_id": "built"}, {"_id": "built", "date": datetime.now()}, upsert=True)
+        self._built = True
+        print(f"✅ Rebuilt {self.stats.name}: {self.stats.estimated_document_count()} skills")
+
+    # ---- incremental maintenance ----
+    @staticmethod
+    def _contribution(doc):
+        """
+        Internal helper: The view fields of one posting, None if it adds nothing.
+        """
+        if not doc or not doc.get("must_have_skills"):
+            return None
+        return {field: doc.get(field) for field in SkillStatsView.FIELDS}
+
+    def apply(self, changes):
+        """
+        Fold posting changes into the view.
+        :param changes: Iterable of (old_doc, new_doc); old_doc is None for inserts
+                        and new_doc None for deletions. Both need the view FIELDS.
+        """
+        if not self.is_built():
+            return
+
+        # Counts stay integers in the view, only salary sums may be doubles
+        skill_delta = defaultdict(lambda: defaultdict(int))
+        title_delta = defaultdict(int)
+
+        for old, new in changes:
+            old, new = self._contribution(old), self._contribution(new)
+            if old == new:
+                continue
+            for doc, sign in ((old, -1), (new, 1)):
+                if doc is None:
+                    continue
+                source = doc.get("source") or "unknown"
+                for skill in doc["must_have_skills"]:
+                    delta = skill_delta[skill]
+                    delta["job_count"] += sign
+                    delta[f"sources.{source}"] += sign
+                    if isinstance(doc.get("min_salary"), (int, float)):
+                        delta["min_salary_sum"] += sign * doc["min_salary"]
+                        delta["min_salary_count"] += sign
+                    if isinstance(doc.get("max_salary"), (int, float)):
+                        delta["max_salary_sum"] += sign * doc["max_salary"]
+                        delta["max_salary_count"] += sign
+                    title_delta[(skill, doc.get("job_title"))] += sign
+
+        skill_delta = {skill: {k: v for k, v in d.items() if v} for skill, d in skill_delta.items()}
+        title_delta = {pair: n for pair, n in title_delta.items() if n}
+        if not skill_delta and not title_delta:
+            return
+
+        operations = [
+            UpdateOne({"_id": skill}, {"$inc": delta}, upsert=True)
+            for skill, delta in skill_delta.items() if delta
+        ]
+        # Ordered: skill documents are upserted before their title samples change
+        operations += self._title_operations(title_delta)
+        if operations:
+            self.stats.bulk_write(operations, ordered=True)
+        self.stats.delete_many({"job_count": {"$lte": 0}})
+
+    def _title_operations(self, title_delta):
+        """
+        Internal helper: Update the (skill, title) pair counts and return the
+        skill_stats operations for titles that appeared or disappeared.
+        """
+        pairs = list(title_delta.items())
+        if not pairs:
+            return []
+        result = self.titles.bulk_write([
+            UpdateOne({"_id": {"s": skill, "t": title}}, {"$inc": {"n": n}}, upsert=True)
+            for (skill, title), n in pairs
+        ], ordered=False)
+
+        operations = []
+        for index in result.upserted_ids:
+            skill, title = pairs[index][0]
+            operations.append(UpdateOne({"_id": skill}, {
+                "$inc": {"unique_titles_count": 1},
+                "$push": {"example_titles": {"$each": [title], "$slice": self.TITLE_SAMPLE_SIZE}},
+            }))
+
+        touched = [{"s": skill, "t": title} for (skill, title), n in pairs if n < 0]
+        if touched:
+            gone = list(self.titles.find({"_id": {"$in": touched}, "n": {"$lte": 0}}, {"_id": 1}))
+            if gone:
+                self.titles.delete_many({"_id": {"$in": [doc["_id"] for doc in gone]}})
+            for doc in gone:
+                operations.append(UpdateOne({"_id": doc["_id"]["s"]}, {
+                    "$inc": {"unique_titles_count": -1},
+                    "$pull": {"example_titles": doc["_id"]["t"]},
+                }))
+        return operations
+
+    # ---- queries ----
+    @staticmethod
+    def _present(doc):
+        result = {
+            "_id": doc["_id"],
+            "job_count": int(doc.get("job_count", 0)),
+            "unique_titles_count": int(doc.get("unique_titles_count", 0)),
+            "example_titles": doc.get("example_titles", []),
+            "sources": {k: int(v) for k, v in (doc.get("sources") or {}).items() if v},
+        }
+        if doc.get("min_salary_count"):
+            result["avg_min_salary"] = doc["min_salary_sum"] / doc["min_salary_count"]
+        if doc.get("max_salary_count"):
+            result["avg_max_salary"] = doc["max_salary_sum"] / doc["max_salary_count"]
+        return result
+
+    def top(self, n=None, source=None):
+        """
+        Most frequent skills, overall or for one source, served from the index.
+        """
+        sort_key = "job_count" if source is None else f"sources.{source}"
+        query = {} if source is None else {sort_key: {"$gt": 0}}
+        cursor = self.stats.find(query).sort(sort_key, DESCENDING)
+        if n:
+            cursor = cursor.limit(n)
+        return [self._present(doc) for doc in cursor]
@@ -0,0 +1,225 @@
+import json
+import math
+import os
+import threading
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import TfidfTransformer
+
+
+class SkillVocabulary:
+    """
+    Global skill -> integer id map shared by the analytics classes.
+    Skills are normalized (trimmed, lowercased, inner whitespace collapsed)
+    but never tokenized, so "spring boot", "c" and "c#" stay single skills.
+    Ids are only ever appended and the map is persisted as JSON, so a skill
+    keeps its column id across runs. Growing and pickling (joblib.dump,
+    clone) are thread-safe, so concurrent pipeline stages can share one instance.
+    """
+
+    DEFAULT_PATH = os.path.join("artifacts", "skill_vocabulary.json")
+
+    def __init__(self, terms=(), path=DEFAULT_PATH):
+        self.path = path
+        self.terms = list(terms)
+        self.ids = {term: i for i, term in enumerate(self.terms)}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Fitted transformers pickle their vocabulary, the lock stays behind.
+        # terms / ids are copied under it so a concurrent encode(grow=True)
+        # can neither break the iteration nor leave them out of step.
+        with self._lock:
+            state = dict(self.__dict__, terms=list(self.terms), ids=dict(self.ids))
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """
+        The persisted vocabulary at `path`, empty if none was saved yet.
+        """
+        if not os.path.exists(path):
+            return cls(path=path)
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["terms"], path=path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            terms = list(self.terms)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"terms": terms}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.terms)
+
+    @staticmethod
+    def normalize(skills):
+        """
+        Normalized form of a Series of skill strings.
+        """
+        return skills.astype(str).str.strip().str.lower().str.replace(r"\s+", " ", regex=True)
+
+    def encode(self, skill_lists, grow=True):
+        """
+        Flatten skill lists into id arrays in CSR layout.
+        Unknown skills get new ids when `grow` is set and are dropped otherwise.
+        :param skill_lists: Iterable (e.g. Series) of lists of skill strings.
+        :return: (ids, indptr) where the ids of row i are ids[indptr[i]:indptr[i + 1]].
+        """
+        lists = [skills if isinstance(skills, (list, tuple, np.ndarray)) else [] for skills in skill_lists]
+        lengths = np.fromiter((len(skills) for skills in lists), dtype=np.int64, count=len(lists))
+        raw = pd.Series(list(chain.from_iterable(lists)), dtype=object)
+        # Null elements stay NaN (code -1) instead of normalizing to "none" / "nan"
+        valid = raw.notna()
+        flat = self.normalize(raw[valid]).reindex(raw.index) if not valid.all() else self.normalize(raw)
+
+        # Look up each distinct skill once
+        codes, uniques = pd.factorize(flat)
+        unique_ids = np.fromiter((self.ids.get(term, -1) for term in uniques), dtype=np.int64, count=len(uniques))
+        if grow:
+            with self._lock:
+                for i in np.flatnonzero(unique_ids < 0):
+                    term = uniques[i]
+                    if not term:
+                        continue
+                    term_id = self.ids.get(term)
+                    if term_id is None:
+                        term_id = len(self.terms)
+                        self.terms.append(term)
+                        self.ids[term] = term_id
+                    unique_ids[i] = term_id
+        ids = np.where(codes >= 0, unique_ids[codes], -1) if len(uniques) else np.full(len(codes), -1, dtype=np.int64)
+
+        keep = ids >= 0
+        if not keep.all():
+            rows = np.repeat(np.arange(len(lists)), lengths)
+            lengths = np.bincount(rows[keep], minlength=len(lists))
+            ids = ids[keep]
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        return ids, indptr
+
+    def count_matrix(self, ids, indptr, n_columns=None):
+        """
+        Binary job x skill CSR matrix built straight from encoded ids.
+        """
+        n_columns = len(self) if n_columns is None else n_columns
+        matrix = sparse.csr_matrix(
+            (np.ones(len(ids), dtype=np.float64), ids, indptr),
+            shape=(len(indptr) - 1, n_columns),
+        )
+        # A skill listed twice in one posting still counts once
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return matrix
+
+
+class SkillTfidf:
+    """
+    TF-IDF over skill ids, the drop-in replacement of TfidfVectorizer on
+    joined skill strings. Columns outside [min_df, max_df] document frequency
+    are masked out; `transform` reuses the fitted columns and idf weights.
+    """
+
+    def __init__(self, vocabulary, min_df=0.015, max_df=0.99):
+        """
+        :param min_df / max_df: Float share or int count of postings, as in scikit-learn.
+        """
+        self.vocabulary = vocabulary
+        self.min_df = min_df
+        self.max_df = max_df
+        self.columns = None
+        self.n_vocabulary = 0
+        self.transformer = None
+
+    @staticmethod
+    def _limit(value, n_rows, rounding):
+        return value if isinstance(value, int) else rounding(value * n_rows)
+
+    def fit_transform(self, skill_lists):
+        ids, indptr = self.vocabulary.encode(skill_lists, grow=True)
+        self.n_vocabulary = len(self.vocabulary)
+        counts = self.vocabulary.count_matrix(ids, indptr, self.n_vocabulary)
+
+        n_rows = counts.shape[0]
+        document_frequency = np.bincount(counts.indices, minlength=self.n_vocabulary)
+        self.columns = np.flatnonzero(
+            (document_frequency >= self._limit(self.min_df, n_rows, math.ceil))
+            & (document_frequency <= self._limit(self.max_df, n_rows, math.floor))
+        )
+        counts = counts[:, self.columns]
+        self.transformer = TfidfTransformer().fit(counts)
+        return self.transformer.transform(counts)
+
+    def _counts(self, skill_lists):
+        ids, indptr = self.vocabulary.encode(skill_lists, grow=False)
+        # Skills added to the shared vocabulary after fitting are unknown here
+        if len(ids) and ids.max() >= self.n_vocabulary:
+            keep = ids < self.n_vocabulary
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            ids = ids[keep]
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(rows[keep], minlength=len(indptr) - 1))])
+        return self.vocabulary.count_matrix(ids, indptr, self.n_vocabulary)
+
+    def transform(self, skill_lists):
+        return self.transformer.transform(self._counts(skill_lists)[:, self.columns])
+
+    def oov_rate(self, skill_lists):
+        """
+        Share of skill mentions without a fitted column (unknown or masked by min_df/max_df).
+        """
+        total = sum(len(skills) for skills in skill_lists if isinstance(skills, (list, tuple, np.ndarray)))
+        if not total:
+            return 0.0
+        known = self._counts(skill_lists)[:, self.columns].nnz
+        return 1.0 - known / total
+
+    def get_feature_names_out(self):
+        return np.asarray(self.vocabulary.terms, dtype=object)[self.columns]
+
+
+class SkillMultiHot(BaseEstimator, TransformerMixin):
+    """
+    scikit-learn transformer: a column of skill lists -> sparse multi-hot CSR
+    over the fixed ids of a SkillVocabulary. Skills seen in fewer than
+    `min_count` training postings, and skills unknown to the vocabulary,
+    have no column. The output stays sparse end to end.
+    """
+
+    def __init__(self, vocabulary=None, min_count=1):
+        self.vocabulary = vocabulary
+        self.min_count = min_count
+
+    def _counts(self, X):
+        skill_lists = X.iloc[:, 0] if isinstance(X, pd.DataFrame) else X
+        ids, indptr = self.vocabulary.encode(skill_lists, grow=False)
+        keep = ids < self.n_vocabulary_
+        if not keep.all():
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            ids = ids[keep]
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(rows[keep], minlength=len(indptr) - 1))])
+        return self.vocabulary.count_matrix(ids, indptr, self.n_vocabulary_)
+
+    def fit(self, X, y=None):
+        self.n_vocabulary_ = len(self.vocabulary)
+        document_frequency = np.bincount(self._counts(X).indices, minlength=self.n_vocabulary_)
+        self.columns_ = np.flatnonzero(document_frequency >= self.min_count)
+        return self
+
+    def transform(self, X):
+        return self._counts(X)[:, self.columns_]
+
+    def get_feature_names_out(self, input_features=None):
+        terms = np.asarray(self.vocabulary.terms, dtype=object)[self.columns_]
+        return np.asarray([f"skill={term}" for term in terms], dtype=object)
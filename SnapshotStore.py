@@ -0,0 +1,325 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from constant import CollectionEnum
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+except ImportError:  # pyarrow is optional, only snapshots need it
+    pa = None
+
+
+# Collection -> source value of its postings (the partition key)
+COLLECTION_SOURCES = {"jobs_processed": "nofluffjobs", "jobs_processed_jj": "justjoin"}
+PLATFORM_SOURCES = {CollectionEnum.NO_FLUFF_JOBS: "nofluffjobs", CollectionEnum.JUST_JOIN: "justjoin"}
+EXPORT_BATCH_SIZE = 100_000
+# The leading underscore keeps the manifest out of the dataset file discovery
+MANIFEST = "_manifest.json"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Snapshots need pyarrow: pip install pyarrow")
+
+
+def _schemas():
+    """
+    Internal helper: (file schema, partition schema) of a snapshot.
+    """
+    partition = pa.schema([("source", pa.string()), ("scrape_date", pa.string())])
+    data = pa.schema([
+        ("job_title", pa.string()),
+        ("company_name", pa.string()),
+        ("location", pa.string()),
+        ("jump_url", pa.string()),
+        ("query_term", pa.string()),
+        ("min_salary", pa.float64()),
+        ("max_salary", pa.float64()),
+        ("cluster", pa.float64()),
+        ("must_have_skills", pa.list_(pa.string())),
+        ("processed_at", pa.timestamp("ms")),
+    ])
+    return pa.schema(list(data) + list(partition)), partition
+
+
+def _skills(value):
+    if isinstance(value, (list, tuple)):
+        return [str(skill) for skill in value if skill is not None]
+    if isinstance(value, str) and value.strip():
+        return [value]
+    return []
+
+
+def _record_batches(docs, default_source, schema, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Internal helper: Job documents -> Arrow record batches of `schema`.
+    """
+    fields = [field.name for field in schema]
+    columns = {field: [] for field in fields}
+    for doc in docs:
+        processed_at = doc.get("processed_at")
+        for field in fields:
+            if field == "source":
+                value = doc.get("source") or default_source
+            elif field == "scrape_date":
+                value = processed_at.date().isoformat() if isinstance(processed_at, datetime) else "unknown"
+            elif field == "must_have_skills":
+                value = _skills(doc.get(field))
+            elif field == "processed_at":
+                value = processed_at if isinstance(processed_at, datetime) else None
+            else:
+                value = doc.get(field)
+                if schema.field(field).type == pa.float64() and not isinstance(value, (int, float)):
+                    value = None
+            columns[field].append(value)
+        if len(columns["source"]) >= batch_size:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {field: [] for field in fields}
+    if columns["source"]:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+class Snapshot:
+    """
+    One exported snapshot: a Parquet dataset partitioned as
+    source=<source>/scrape_date=<YYYY-MM-DD>/ plus a _manifest.json.
+    Files are read through memory maps and only the requested columns
+    and partitions are touched.
+    """
+
+    def __init__(self, path):
+        _require_pyarrow()
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.name = self.manifest["name"]
+        self._dataset = None
+
+    @property
+    def dataset(self):
+        if self._dataset is None:
+            _, partition = _schemas()
+            self._dataset = ds.dataset(
+                self.path, format="parquet",
+                partitioning=ds.partitioning(partition, flavor="hive"),
+                filesystem=fs.LocalFileSystem(use_mmap=True),
+            )
+        return self._dataset
+
+    def jobs_for(self, platform_name):
+        """
+        Read-only stand-in for MongoAccess.jobs_for on this snapshot.
+        """
+        if platform_name not in PLATFORM_SOURCES:
+            raise NameError(f"Collection for {platform_name} not found.")
+        return SnapshotRepository(self, PLATFORM_SOURCES[platform_name])
+
+    def __repr__(self):
+        return f"Snapshot({self.name!r}, rows={self.manifest.get('rows')})"
+
+
+class SnapshotRepository:
+    """
+    The read side of JobsRepository (load_frame, skill_counts, state) over one
+    source of a snapshot. Supports the simple filters the analytics classes
+    use: equality, $exists, $ne, $in and range operators.
+    """
+
+    RANGE_OPERATORS = {"$gt": "greater", "$gte": "greater_equal", "$lt": "less", "$lte": "less_equal"}
+
+    def __init__(self, snapshot, source):
+        self.snapshot = snapshot
+        self.source = source
+        self.name = f"{snapshot.name}/{source}"
+
+    def _filter(self, query):
+        """
+        Internal helper: MongoDB filter -> (dataset expression, list fields that must be non-empty).
+        """
+        schema = self.snapshot.dataset.schema
+        expression = ds.field("source") == self.source
+        non_empty = []
+        for field, condition in (query or {}).items():
+            is_list = pa.types.is_list(schema.field(field).type)
+            operators = condition if isinstance(condition, dict) else {"$eq": condition}
+            for op, value in operators.items():
+                column = ds.field(field)
+                if is_list:
+                    # Missing skill lists are exported as [], so only emptiness is testable
+                    if (op == "$ne" and value == []) or (op == "$exists" and value is True):
+                        if op == "$ne":
+                            non_empty.append(field)
+                        continue
+                    raise ValueError(f"Unsupported snapshot filter on list field {field}: {op} {value!r}")
+                if op == "$eq":
+                    expression &= column.is_null() if value is None else column == value
+                elif op == "$ne":
+                    expression &= column.is_valid() if value is None else column != value
+                elif op == "$exists":
+                    expression &= column.is_valid() if value else column.is_null()
+                elif op == "$in":
+                    expression &= column.isin(list(value))
+                elif op in self.RANGE_OPERATORS:
+                    expression &= getattr(pc, self.RANGE_OPERATORS[op])(column, value)
+                else:
+                    raise ValueError(f"Unsupported snapshot filter operator {op}")
+        return expression, non_empty
+
+    def _table(self, columns, query=None):
+        expression, non_empty = self._filter(query)
+        table = self.snapshot.dataset.to_table(columns=list(dict.fromkeys(columns + non_empty)),
+                                               filter=expression, use_threads=True)
+        for field in non_empty:
+            table = table.filter(pc.fill_null(pc.greater(pc.list_value_length(table.column(field)), 0), False))
+        return table
+
+    def load_frame(self, fields, query=None):
+        """
+        Columns `fields` of the matching postings, like MongoFrameLoader.load_frame.
+        List columns hold NumPy arrays of strings.
+        """
+        fields = list(fields)
+        table = self._table(fields, query)
+        return pd.DataFrame({field: table.column(field).to_pandas() for field in fields}, columns=fields)
+
+    def skill_counts(self, limit=None):
+        """
+        (skill, posting count) pairs, most frequent first, computed with Arrow kernels.
+        """
+        skills = pc.list_flatten(self._table(["must_have_skills"]).column("must_have_skills"))
+        skills = pc.utf8_lower(pc.utf8_trim_whitespace(skills))
+        skills = pc.filter(skills, pc.fill_null(pc.not_equal(skills, ""), False))
+        counts = pc.value_counts(skills)
+        table = pa.table({"skill": counts.field("values"), "count": counts.field("counts")})
+        table = table.sort_by([("count", "descending"), ("skill", "ascending")])
+        if limit:
+            table = table.slice(0, limit)
+        return list(zip(table.column("skill").to_pylist(), table.column("count").to_pylist()))
+
+    def state(self):
+        return {"snapshot": self.snapshot.name, "count": self.snapshot.dataset.count_rows(
+            filter=ds.field("source") == self.source)}
+
+    def bulk_write(self, operations, ordered=False):
+        raise PermissionError(f"Snapshot {self.name} is read-only")
+
+
+class SnapshotStore:
+    """
+    Local Parquet snapshots of jobs_processed and jobs_processed_jj for offline,
+    repeatable analytics. Each export is a directory under `root`, written to a
+    temporary name and renamed when complete; only the newest `keep_snapshots`
+    are kept.
+
+        snapshot = SnapshotStore().export()
+        JobClusterManager(snapshot=snapshot).load_and_preprocess_data()
+    """
+
+    DEFAULT_ROOT = "snapshots"
+
+    def __init__(self, root=DEFAULT_ROOT, keep_snapshots=3):
+        self.root = root
+        self.keep_snapshots = keep_snapshots
+
+    def export(self, name=None, sources=None):
+        """
+        Write a new snapshot.
+        :param sources: collection name -> iterable of job documents
+                        (default: both processed collections from MongoDB).
+        :return: the Snapshot.
+        """
+        _require_pyarrow()
+        name = name or datetime.now().strftime("%Y%m%dT%H%M%S")
+        if sources is None:
+            from MongoAccess import MongoAccess
+            sources = {
+                repository.name: repository.collection.find({}, {"_id": 0}, batch_size=5000)
+                for repository in (MongoAccess.jobs_processed(), MongoAccess.jobs_processed_jj())
+            }
+
+        schema, partition = _schemas()
+        path = os.path.join(self.root, name)
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        rows = {}
+        for collection, docs in sources.items():
+            counted = {"rows": 0}
+
+            def batches():
+                for batch in _record_batches(docs, COLLECTION_SOURCES.get(collection, collection), schema):
+                    counted["rows"] += batch.num_rows
+                    yield batch
+
+            ds.write_dataset(
+                batches(), tmp_path, schema=schema, format="parquet",
+                partitioning=ds.partitioning(partition, flavor="hive"),
+                basename_template=f"{collection}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            rows[collection] = counted["rows"]
+
+        os.makedirs(tmp_path, exist_ok=True)
+        with open(os.path.join(tmp_path, MANIFEST), "w") as f:
+            json.dump({"name": name, "created_at": datetime.now().isoformat(),
+                       "collections": rows, "rows": sum(rows.values())}, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self._evict()
+        print(f"📸 Snapshot {name}: {sum(rows.values())} postings written to {path}")
+        return Snapshot(path)
+
+    def names(self):
+        """
+        Complete snapshots, newest first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        names = [
+            entry for entry in os.listdir(self.root)
+            if not entry.endswith(".tmp") and os.path.exists(os.path.join(self.root, entry, MANIFEST))
+        ]
+        return sorted(names, key=lambda entry: os.path.getmtime(os.path.join(self.root, entry, MANIFEST)),
+                      reverse=True)
+
+    def open(self, name=None):
+        """
+        Snapshot `name`, or the newest one.
+        """
+        names = self.names()
+        if name is None and not names:
+            raise LookupError(f"No snapshot in {self.root}: run SnapshotStore().export() first.")
+        return Snapshot(os.path.join(self.root, name or names[0]))
+
+    def _evict(self):
+        for name in self.names()[self.keep_snapshots:]:
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+
+def resolve(snapshot):
+    """
+    A Snapshot from a Snapshot, a snapshot directory or None (live MongoDB).
+    """
+    if snapshot is None or isinstance(snapshot, Snapshot):
+        return snapshot
+    return Snapshot(snapshot)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Export the processed job collections to a Parquet snapshot")
+    arg_parser.add_argument("--root", default=SnapshotStore.DEFAULT_ROOT)
+    arg_parser.add_argument("--name", help="Snapshot name (default: the current timestamp)")
+    arg_parser.add_argument("--keep", type=int, default=3, help="Number of snapshots to keep")
+    args = arg_parser.parse_args()
+    SnapshotStore(args.root, keep_snapshots=args.keep).export(args.name)
+
+
+if __name__ == "__main__":
+    main()
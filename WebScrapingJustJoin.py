@@ -1,10 +1,7 @@
 import os
-import requests 
 from datetime import datetime
 
-from dotenv import load_dotenv
-
-from pymongo import MongoClient
+from MongoAccess import MongoAccess
 
 import re
 import time
@@ -14,35 +11,33 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from JustJoinPager import JustJoinPager
+from Instrumentation import instrumented
+
 
 class WebScrapingJustJoin:
-    def __init__(self, query_term="backend"):
+    def __init__(self, query_term="backend", max_items=300, max_workers=4,
+                 api_url=JustJoinPager.DEFAULT_BASE_URL, limiter=None):
+        """
+        :param max_items: Cap on jobs fetched per run, None to fetch everything.
+        :param max_workers: Number of API pages fetched concurrently.
+        :param api_url: `by-cursor` endpoint, override to point at a stub server.
+        :param limiter: Optional HostLimiter shared with other crawlers.
+        """
         print("Initialise WebScrapingJustJoin instance")
         self.query_term = query_term
-        self.api_url = (
-            "https://api.justjoin.it/v2/user-panel/offers/by-cursor"
-            "?cityRadiusKm=30"
-            "&currency=pln"
-            "&from=0"
-            "&itemsCount=100"
-            f"&keywords[]={query_term.replace(' ', '%20')}"
-            "&orderBy=DESC"
-            "&sortBy=published"
+        self.pager = JustJoinPager(
+            base_url=api_url, max_items=max_items, max_workers=max_workers, limiter=limiter
         )
         self._init_db()
 
     def _init_db(self):
-        mode = os.getenv("MONGO_MODE", "local")
-        db_name = os.getenv("DB_NAME", "BD_final")
-
-        if mode == "atlas":
-            uri = os.getenv("ATLAS_MONGO_URI")
-        else:
-            uri = "mongodb://localhost:27017/"
-
-        self.client = MongoClient(uri)
-        self.db = self.client[db_name]
-        print("✅ JustJoin connected to DB")
+        """
+        Bind to the shared, lazily connected MongoDB access layer.
+        """
+        self.client = MongoAccess.client()
+        self.db = MongoAccess.db()
+        self.jobs = MongoAccess.jobs_processed_jj()
 
     # ---- salary normalization (matches NoFluff logic) ----
     def normalize_salary(self, emp):
@@ -60,48 +55,43 @@ class WebScrapingJustJoin:
 
         return from_sal, to_sal  # month
 
+    def process_job(self, job):
+        """
+        Map one raw API job onto the shared job document structure.
+        """
+        emp = (job.get("employmentTypes") or [{}])[0]
+        min_sal, max_sal = self.normalize_salary(emp)
+
+        return {
+            "source": "justjoin",
+            "job_title": job.get("title"),
+            "company_name": job.get("companyName"),
+            "min_salary": min_sal,
+            "max_salary": max_sal,
+            "location": job.get("city"),
+            "jump_url": f"https://justjoin.it/offers/{job.get('slug')}",
+            "must_have_skills": [
+                skill.lower() for skill in job.get("requiredSkills", [])
+            ],
+            "processed_at": datetime.now(),
+            "query_term": self.query_term,
+            "query_terms": [self.query_term]
+
+        }
+
+    @instrumented()
+    def fetch_jobs(self):
+        """
+        Fetch and map all jobs for this query term without storing them.
+        """
+        return [self.process_job(job) for job in self.pager.fetch(self.query_term)]
+
+    @instrumented()
     def scrape_and_process(self):
-        import requests
-
-        processed = []
-        items_per_request = 100   # max jobs per API request
-        max_items = 300           # total jobs we want
-
-        for start in range(0, max_items, items_per_request):
-            paged_url = (
-                "https://api.justjoin.it/v2/user-panel/offers/by-cursor"
-                "?cityRadiusKm=30"
-                "&currency=pln"
-                f"&from={start}"
-                f"&itemsCount={items_per_request}"
-                f"&keywords[]={self.query_term.replace(' ', '%20')}"
-                "&orderBy=DESC"
-                "&sortBy=published"
-            )
-
-            response = requests.get(paged_url)
-            raw = response.json()
-
-            for job in raw.get("data", []):
-                emp = job.get("employmentTypes", [{}])[0]
-                min_sal, max_sal = self.normalize_salary(emp)
-
-                processed.append({
-                    "source": "justjoin",
-                    "job_title": job.get("title"),
-                    "company_name": job.get("companyName"),
-                    "min_salary": min_sal,
-                    "max_salary": max_sal,
-                    "location": job.get("city"),
-                    "jump_url": f"https://justjoin.it/offers/{job.get('slug')}",
-                    "must_have_skills": [
-                        skill.lower() for skill in job.get("requiredSkills", [])
-                    ],
-                    "processed_at": datetime.now(),
-                    "query_term": self.query_term
-
-                })
-        print(f"✅ Saved {len(processed)} JustJoin jobs")
-
-        self.db.jobs_processed_jj.drop()
-        self.db.jobs_processed_jj.insert_many(processed)
+        processed = self.fetch_jobs()
+
+        stats = self.jobs.ingest(processed)
+        print(f"✅ Saved {len(processed)} JustJoin jobs "
+              f"(inserted: {stats['inserted']}, updated: {stats['updated']}, "
+              f"unchanged: {stats['unchanged']})")
+        return stats
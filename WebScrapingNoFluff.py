@@ -1,12 +1,8 @@
 import os
-import re
 import time
 from datetime import datetime
 
 
-from dotenv import load_dotenv
-
-
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,12 +11,17 @@ from selenium.webdriver.support import expected_conditions as EC
 
 
 # Database
-from pymongo import MongoClient
+from MongoAccess import MongoAccess
+from HostLimiter import HostLimiter
+from SkillEnrichmentPool import SkillEnrichmentPool
+from DetailPageCache import DetailPageCache
+from NoFluffListingParser import PARSERS, parse_salary, normalize_location
+from SkillStatsView import SkillStatsView
+from Instrumentation import instrumented
 
 # HTML webpage scrapping
 class WebScrapingNoFluff:
     def __init__(self, query_term='backend'):
-        load_dotenv()
         print('Initialise WebScraping instance')
         self.query_term = query_term
         self.target_url = f"https://nofluffjobs.com/pl/?lang=en&criteria=jobPosition%3D{self.query_term}"
@@ -31,40 +32,30 @@ class WebScrapingNoFluff:
 
     def _init_db(self):
         """
-        You don't need .env, cause you will deploy on local db
-        MONGO_MODE from .env:
-        "local": connect with local mongodb
-        "atlas": connect with remote mongodb
+        Bind to the shared, lazily connected MongoDB access layer.
+        MONGO_MODE / ATLAS_MONGO_URI / DB_NAME are read by MongoAccess;
+        no connection is opened until the first query.
         """
-
-        mode = os.getenv("MONGO_MODE", "local")
-        db_name = os.getenv("DB_NAME", "BD_final")
-
-        print("DB MODE: ", mode)
-
-        if mode == "atlas":
-            uri = os.getenv("ATLAS_MONGO_URI")
-            if not uri:
-                raise ValueError("❌ Error: ATLAS_MONGO_URI not found in .env while mode is 'atlas'")
-            print(f"🌐 Connecting to Remote MongoDB Atlas...")
-        else:
-            uri = "mongodb://localhost:27017/"
-            print(f" Connecting to Local MongoDB ({uri})...")
-
-        try:
-            self.client = MongoClient(uri)
-            # test connection
-            self.client.admin.command('ping')
-            self.db = self.client[db_name]
-            print(f"✅ Successfully connected to database: {db_name}")
-        except Exception as e:
-            print(f"❌ Database connection failed: {e}")
-            raise
-
-    def scrape_save_raw_to_db(self, clicks=3):
-        driver = webdriver.Chrome()
+        self.client = MongoAccess.client()
+        self.db = MongoAccess.db()
+        self.jobs = MongoAccess.jobs_processed()
+        self.raw_pages = MongoAccess.jobs_raw()
+        print("DB MODE: ", MongoAccess.settings()["mode"])
+
+    @instrumented()
+    def scrape_save_raw_to_db(self, clicks=3, headless=False):
+        """
+        :param headless: Run Chrome without a window (unattended runs, no display).
+        """
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--window-size=1920,1080")
+        driver = webdriver.Chrome(options=options)
         driver.get(self.target_url)
-        driver.maximize_window()
+        if not headless:
+            driver.maximize_window()
         # Give you 15 seconds to accept/cancel all popup window
         wait = WebDriverWait(driver, 15)
 
@@ -98,22 +89,20 @@ class WebScrapingNoFluff:
 
         driver.quit()
 
-    def save_raw_to_mongodb(self):
+    @instrumented()
+    def save_raw_to_mongodb(self, keep_versions=5):
         """
-        Reference your initial logic to store the raw HTML into NoSQL
+        Archive the captured HTML as a new compressed version in jobs_raw.
+        Identical captures are deduplicated and only the newest `keep_versions`
+        captures of this query term are kept.
         """
-        # only hold one raw_json html data
-        self.db.jobs_raw.drop()
-        website_document = {
-            'url': self.target_url,
-            'content': self.final_html,
-            'date': datetime.now(),
-            'query_term': self.query_term
-        }
-
-        # Store in the jobs_raw collection
-        result = self.db.jobs_raw.insert_one(website_document)
-        print(f"Raw HTML saved to MongoDB! Document ID: {result.inserted_id}")
+        doc_id, is_new = self.raw_pages.save(
+            self.target_url, self.final_html, self.query_term, keep_versions=keep_versions
+        )
+        if is_new:
+            print(f"Raw HTML saved to MongoDB! Document ID: {doc_id}")
+        else:
+            print(f"Raw HTML unchanged since last capture, reusing Document ID: {doc_id}")
 
     # parse and split salary to min and max two value
     def parse_salary(self, salary_str):
@@ -122,26 +111,7 @@ class WebScrapingNoFluff:
         Example input: "10 000 - 15 000 PLN", "20 000 PLN", "Undisclosed"
         Output: (min_salary, max_salary)
         """
-        if not salary_str or "Undisclosed" in salary_str or "Agreement" in salary_str:
-            return None, None
-
-        # Remove spaces and thousands separators
-        clean_str = salary_str.replace('\xa0', '').replace(' ', '')
-
-        # Match all digits
-        numbers = re.findall(r'\d+', clean_str)
-
-        try:
-            if len(numbers) >= 2:
-                # Range salary: [10000, 15000]
-                return float(numbers[0]), float(numbers[1])
-            elif len(numbers) == 1:
-                # Fixed salary: [20000]
-                return float(numbers[0]), float(numbers[0])
-        except Exception:
-            pass
-
-        return None, None
+        return parse_salary(salary_str)
 
     # parse job location
     def parse_location(self, card):
@@ -149,135 +119,89 @@ class WebScrapingNoFluff:
         Internal helper method: Parse location
         """
         location_tag = card.select_one('span.posting-info__location, nfj-posting-item-city')
-        if not location_tag:
-            return "Unknown"
-
-        loc_text = location_tag.get_text(strip=True)
-
-        # Special case handling: Remote work
-        if "Remote" in loc_text or "Zdalna" in loc_text:
-            return "Remote"
+        return normalize_location(location_tag.get_text(strip=True) if location_tag else None)
 
-        # Extract city name (some include '+1', filter via split)
-        city = loc_text.split('+')[0].strip()
-        return city
-
-    # parse job title,company name, Min/Max Salary,Location, Jump URL and save into db
-    def process_and_save(self):
+    def parse_postings(self, parser="lxml", version=0, query_term=None):
         """
-        Read HTML from jobs_raw and extract fields to store in jobs_processed
-        extract raw html and parse fields then save into
+        Yield job documents parsed from an archived capture without storing them.
+        :param parser: "lxml" streams cards with the fast parser, "bs4" uses the
+                       original BeautifulSoup path. Both produce identical documents.
+        :param version: 0 re-parses the latest capture, 1 the one before, ...
+                        or the ObjectId of an archived capture.
+        :param query_term: Only consider captures of this term, None for any.
         """
-        # Get the most recently scraped HTML document
-        raw_data = self.db.jobs_raw.find_one(sort=[("date", -1)])
+        # Get the requested scraped HTML document (latest by default)
+        raw_data = self.raw_pages.load(query_term=query_term, version=version)
         if not raw_data:
             print("No raw data found in MongoDB!")
             return
 
-        soup = BeautifulSoup(raw_data['content'], 'html.parser')
-
-        # Locate all job cards
-        postings = soup.select('a.posting-list-item')
-        print(f"Found {len(postings)} job postings in HTML.")
-
-        processed_list = []
-        base_domain = "https://nofluffjobs.com"  # Used to concatenate the full URL
-
-        for post in postings:
-            try:
-                # --- Field 1: Job Title ---
-                title_el = post.select_one('h3.posting-title__position, .posting-title__can-hide')
-                if title_el:
-                    # Find and remove any potential "NEW" tags or other badges
-                    # NFJ's badge class names usually contain title-badge
-                    for badge in title_el.select('.title-badge, .title-badge--new'):
-                        badge.decompose()
-                    job_title = title_el.get_text(strip=True)
-                else:
-                    job_title = "N/A"
-                # print('JOB TITLE:', job_title)
-
-                # --- Field 2: Company Name ---
-                company_el = post.select_one('span.d-block, .company-name')
-                company_name = company_el.get_text(strip=True) if company_el else "N/A"
-
-                # --- Fields 3 & 4: Min/Max Salary ---
-                salary_el = post.select_one('span.text-truncate, nfj-posting-item-salary')
-                salary_str = salary_el.get_text(strip=True) if salary_el else ""
-                min_sal, max_sal = self.parse_salary(salary_str)
+        for posting in PARSERS[parser](raw_data['content']):
+            posting['processed_at'] = datetime.now()
+            posting['query_term'] = raw_data['query_term']
+            posting['query_terms'] = [raw_data['query_term']]
+            yield posting
 
-                # --- Field 5: Location ---
-                location = self.parse_location(post)
-
-                # --- Field 6: Jump URL ---
-                # Get relative path from the <a> tag's href attribute and concatenate domain
-                relative_url = post.get('href')
-                jump_url = base_domain + relative_url if relative_url else "N/A"
-
-                # Construct document
-                job_doc = {
-                    "source": "nofluffjobs",
-                    'job_title': job_title,
-                    'company_name': company_name,
-                    'min_salary': min_sal,
-                    'max_salary': max_sal,
-                    'location': location,
-                    'jump_url': jump_url,  # Add to the document
-                    'processed_at': datetime.now(),
-                    'query_term': raw_data['query_term']
-                }
-
-                processed_list.append(job_doc)
-
-            except Exception as e:
-                print(f"Error parsing a single post: {e}")
-                continue
-
-        # Batch save to the new collection
-        if processed_list:
-            self.db.jobs_processed.drop()
-            self.db.jobs_processed.insert_many(processed_list)
-            print(f"Successfully processed {len(processed_list)} jobs and saved to 'jobs_processed'.")
+    # parse job title,company name, Min/Max Salary,Location, Jump URL and save into db
+    @instrumented()
+    def process_and_save(self, parser="lxml", version=0, query_term=None):
+        """
+        Read HTML from jobs_raw and extract fields to store in jobs_processed
+        extract raw html and parse fields then save into
+        Arguments are those of parse_postings; cards are handed to the
+        ingestor as they are parsed.
+        """
+        parsed = {"count": 0}
+
+        def job_docs():
+            for posting in self.parse_postings(parser, version, query_term):
+                parsed["count"] += 1
+                yield posting
+
+        # Incremental upsert into the processed collection
+        stats = self.jobs.ingest(job_docs())
+        print(f"Found {parsed['count']} job postings in HTML.")
+        if parsed["count"]:
+            print(f"Successfully processed {parsed['count']} jobs and saved to 'jobs_processed' "
+                  f"(inserted: {stats['inserted']}, updated: {stats['updated']}, "
+                  f"unchanged: {stats['unchanged']}).")
+        return stats
 
     # scrape the job detail page and add must-have skill set into each job
-    def scrape_must_have_skills(self, limit=0):
-        driver = webdriver.Chrome()
-        driver.maximize_window()
-        wait = WebDriverWait(driver, 15)
-
-
-        jobs = list(self.db.jobs_processed.find().limit(limit))
-        print(f"Scraping Must-have skills for {len(jobs)} jobs")
-
-        for job in jobs:
-            url = job.get("jump_url")
-            if not url:
-                continue
-
-            try:
-                driver.get(url)
-                time.sleep(2)  # wait for page to render
-
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                must_section = soup.select_one('section[branch="musts"]')
-
-                skills = []
-                if must_section:
-                    skill_tags = must_section.select('span[id^="item-tag-"]')
-                    for tag in skill_tags:
-                        skills.append(tag.get_text(strip=True).lower())
-
-                # Update MongoDB document
-                self.db.jobs_processed.update_one(
-                    {"_id": job["_id"]},
-                    {"$set": {"must_have_skills": skills}}
-                )
-
-                print(f"✔ {job['job_title']} → {skills}")
-
-            except Exception as e:
-                print(f"❌ Error scraping {url} : {e}")
-
-        driver.quit()
-        print("Finished scraping Must-have skills.")
-        
\ No newline at end of file
+    @instrumented()
+    def scrape_must_have_skills(self, limit=0, workers=1, mode="browser",
+                                max_per_host=4, min_interval=0.0,
+                                use_cache=True, cache_ttl=24 * 3600):
+        """
+        Visit each job detail page with a pool of workers and store its must-have skills.
+        :param workers: Number of concurrent fetchers, throughput scales with it
+                        until `max_per_host` is reached.
+        :param mode: "browser" for headless Chrome workers, "http" for plain HTTP fetches,
+                     "offline" to replay detail pages from the local cache only.
+        :param max_per_host: Politeness cap on simultaneous requests per host.
+        :param min_interval: Minimum delay in seconds between request starts per host.
+        :param use_cache: Keep detail pages in the on-disk DetailPageCache.
+        :param cache_ttl: Seconds a cached page is used without revalidation.
+        """
+        # The skill_stats view needs the posting's previous contribution
+        projection = {field: 1 for field in ("_id", "jump_url") + SkillStatsView.FIELDS}
+        jobs = list(self.jobs.find({}, projection, limit=limit))
+        print(f"Scraping Must-have skills for {len(jobs)} jobs with {workers} {mode} worker(s)")
+
+        cache = DetailPageCache(ttl=cache_ttl) if use_cache or mode == "offline" else None
+        pool = SkillEnrichmentPool(
+            self.jobs.collection,
+            workers=workers,
+            mode=mode,
+            limiter=HostLimiter(max_concurrent=max_per_host, min_interval=min_interval),
+            cache=cache,
+            on_change=self.jobs.skill_stats().apply,
+        )
+        stats = pool.run(jobs)
+        print(f"Finished scraping Must-have skills "
+              f"(enriched: {stats['enriched']}, unchanged: {stats['unchanged']}, failed: {stats['failed']}).")
+        if cache:
+            stats["cache"] = cache.summary()
+            cache.close()
+            print(f"Detail page cache: {stats['cache']}")
+        return stats
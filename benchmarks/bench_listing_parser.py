@@ -0,0 +1,115 @@
+"""
+Benchmark: NoFluff listing parser, lxml streaming path vs. BeautifulSoup path.
+
+Runs both parsers over HTML fixtures of increasing size, checks that they
+produce identical postings field for field and reports time and peak memory.
+
+    python -m benchmarks.bench_listing_parser
+    python -m benchmarks.bench_listing_parser --fixtures path/to/saved_pages
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from NoFluffListingParser import iter_postings, iter_postings_bs4
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE_SIZES = (100, 1000, 10000)
+
+CARD_TEMPLATE = """
+<a class="posting-list-item posting-list-item--backend" href="/pl/job/{slug}">
+  <div class="posting-title">
+    <h3 class="posting-title__position">{title} <span class="title-badge title-badge--new">NEW</span></h3>
+    <span class="d-block company-name">{company}</span>
+  </div>
+  <nfj-posting-item-salary><span class="text-truncate">{salary}</span></nfj-posting-item-salary>
+  <nfj-posting-item-city><span class="posting-info__location">{city}</span></nfj-posting-item-city>
+</a>"""
+
+TITLES = ("Senior Python Developer", "Java Engineer", "Junior Backend Developer", "Regular .NET Developer")
+SALARIES = ("15 000&nbsp;–&nbsp;22 000 PLN", "20 000 PLN", "Undisclosed", "9 500 – 13 000 PLN")
+CITIES = ("Warszawa +2", "Remote", "Kraków", "Zdalna")
+
+
+def build_listing_html(n_cards):
+    """
+    Synthetic "load more" page with `n_cards` posting cards.
+    """
+    cards = "".join(
+        CARD_TEMPLATE.format(
+            slug=f"job-{i}",
+            title=TITLES[i % len(TITLES)],
+            company=f"Company {i}",
+            salary=SALARIES[i % len(SALARIES)],
+            city=CITIES[i % len(CITIES)],
+        )
+        for i in range(n_cards)
+    )
+    return f"<html><body><nfj-postings-list><div class='list-container'>{cards}</div></nfj-postings-list></body></html>"
+
+
+def ensure_fixtures(directory=FIXTURE_DIR, sizes=FIXTURE_SIZES):
+    """
+    Write the synthetic fixtures once and return their paths, smallest first.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for n in sizes:
+        path = os.path.join(directory, f"listing_{n}.html")
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(build_listing_html(n))
+        paths.append(path)
+    return paths
+
+
+def measure(parse, html):
+    """
+    Fully consume a parser generator and return (postings, seconds, peak bytes).
+    Peak memory is measured in a separate pass so tracing does not skew timing.
+    """
+    start = time.perf_counter()
+    postings = list(parse(html))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in parse(html):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return postings, elapsed, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--fixtures", help="Directory of saved listing pages (*.html)")
+    args = arg_parser.parse_args()
+
+    if args.fixtures:
+        paths = sorted(
+            (os.path.join(args.fixtures, name) for name in os.listdir(args.fixtures) if name.endswith(".html")),
+            key=os.path.getsize,
+        )
+    else:
+        paths = ensure_fixtures()
+
+    print(f"{'fixture':<24}{'cards':>8}{'bs4 s':>10}{'lxml s':>10}{'speedup':>9}{'bs4 MB':>10}{'lxml MB':>10}")
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        reference, bs4_time, bs4_peak = measure(iter_postings_bs4, html)
+        fast, lxml_time, lxml_peak = measure(iter_postings, html)
+
+        if fast != reference:
+            mismatch = next((i for i, (a, b) in enumerate(zip(fast, reference)) if a != b), min(len(fast), len(reference)))
+            raise AssertionError(f"{path}: parsers differ at posting #{mismatch}")
+
+        print(f"{os.path.basename(path):<24}{len(fast):>8}{bs4_time:>10.3f}{lxml_time:>10.3f}"
+              f"{bs4_time / max(lxml_time, 1e-9):>8.1f}x{bs4_peak / 2**20:>10.1f}{lxml_peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
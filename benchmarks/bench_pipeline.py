@@ -0,0 +1,229 @@
+"""
+Benchmark: the full ingest-to-analytics pipeline on synthetic postings.
+
+For each size, half NoFluff and half JustJoin postings are generated
+(benchmarks.synthetic_jobs) into a throw-away database, then every stage is
+timed with wall time, CPU time and peak traced memory:
+
+    process_and_save      NoFluff listing HTML -> jobs_processed
+    bulk_load             JustJoin API pages -> jobs_processed_jj, NoFluff skills
+    load_frames           JobClusterManager.load_and_preprocess_data
+    vectorize_skills      TF-IDF matrix
+    run_clustering        KMeans / MiniBatchKMeans
+    analyze_skill_gap     analyze_salaries + analyze_skill_gap
+    train_and_evaluate    SalaryModelManager, both platforms
+    word_cloud_counts     top skill counts of both platforms (MongoDB aggregation)
+    word_cloud_render     both clouds laid out from scratch, in parallel
+    word_cloud_cached     the same clouds again, served from the cache
+
+Results are written as JSON together with the git commit, so runs of
+different commits can be compared.
+
+    python -m benchmarks.bench_pipeline --in-memory --sizes 1000 10000
+    python -m benchmarks.bench_pipeline --mongo-uri mongodb://localhost:27017/ --sizes 100000
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")  # figures of the analytics stages are drawn off-screen
+import matplotlib.pyplot as plt
+from pymongo import UpdateOne
+
+from ArtifactStore import ArtifactStore
+from JobClusterManager import JobClusterManager
+from JobDataCloudImageGenerator import JobDataCloudImageGenerator
+from MongoAccess import MongoAccess
+from ReportRenderer import word_cloud_images
+from SalaryModelManager import SalaryModelManager
+from SkillVocabulary import SkillVocabulary
+from WebScrapingJustJoin import WebScrapingJustJoin
+from WebScrapingNoFluff import WebScrapingNoFluff
+from constant import CollectionEnum
+from benchmarks.synthetic_jobs import generate_postings, justjoin_api_pages, nofluff_listing_html, nofluff_skills
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+IN_MEMORY_URI = "mongomock://bench"
+QUERY_TERM = "bench"
+
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+class StageTimer:
+    """
+    Run stages and collect wall / CPU time, peak memory and row counts.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    def run(self, name, fn, rows_in=None, rows_out=None):
+        """
+        :param rows_out: Callable deriving the output row count from the stage result.
+        """
+        if self.trace_memory:
+            tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = None
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        plt.close("all")
+
+        record = {"wall_s": round(wall, 3), "cpu_s": round(cpu, 3)}
+        if peak is not None:
+            record["peak_mb"] = round(peak / 2**20, 1)
+        if rows_in is not None:
+            record["rows_in"] = rows_in
+        if rows_out is not None:
+            record["rows_out"] = rows_out(result)
+        self.stages[name] = record
+        print(f"  {name:<20}{record['wall_s']:>10.3f}s{record['cpu_s']:>10.3f}s cpu"
+              f"{record.get('peak_mb', float('nan')):>10.1f} MB")
+        return result
+
+
+def connect(args, db_name):
+    """
+    Point MongoAccess at the benchmark database (local mongod or mongomock).
+    """
+    if args.in_memory:
+        import mongomock
+        import mongomock.gridfs
+        mongomock.gridfs.enable_gridfs_integration()
+        MongoAccess.use_client(mongomock.MongoClient(), IN_MEMORY_URI)
+        MongoAccess.configure(uri=IN_MEMORY_URI, db_name=db_name)
+    else:
+        MongoAccess.configure(uri=args.mongo_uri, db_name=db_name)
+    MongoAccess.client().drop_database(db_name)
+
+
+def bench_size(n, args, workdir):
+    n_nofluff = n // 2
+    nofluff = generate_postings(n_nofluff, source="nofluffjobs", seed=args.seed, vocab_size=args.vocab)
+    justjoin = generate_postings(n - n_nofluff, source="justjoin", seed=args.seed + 1, vocab_size=args.vocab)
+
+    db_name = f"bench_pipeline_{n}"
+    connect(args, db_name)
+    timer = StageTimer(trace_memory=not args.no_memory)
+    artifacts = ArtifactStore(root=os.path.join(workdir, f"artifacts_{n}"))
+    vocabulary = SkillVocabulary(path=os.path.join(workdir, f"vocabulary_{n}.json"))
+
+    # Setup: the captured listing page sits in jobs_raw like after a scrape
+    scraper_nf = WebScrapingNoFluff(query_term=QUERY_TERM)
+    scraper_nf.final_html = nofluff_listing_html(nofluff)
+    scraper_nf.save_raw_to_mongodb()
+    scraper_nf.final_html = ""
+
+    timer.run("process_and_save", scraper_nf.process_and_save, rows_in=n_nofluff,
+              rows_out=lambda stats: stats["inserted"] + stats["updated"])
+
+    scraper_jj = WebScrapingJustJoin(query_term=QUERY_TERM, max_items=None)
+
+    def bulk_load():
+        stats = scraper_jj.jobs.ingest(
+            scraper_jj.process_job(job) for page in justjoin_api_pages(justjoin) for job in page["data"]
+        )
+        # Skills of the NoFluff postings, as stored by the detail-page enrichment
+        operations = [
+            UpdateOne({"jump_url": url}, {"$set": {"must_have_skills": skills}})
+            for url, skills in nofluff_skills(nofluff)
+        ]
+        for i in range(0, len(operations), 1000):
+            scraper_nf.jobs.bulk_write(operations[i:i + 1000])
+        return stats["inserted"] + len(operations)
+
+    timer.run("bulk_load", bulk_load, rows_in=n, rows_out=lambda rows: rows)
+
+    manager = JobClusterManager(artifacts=artifacts, vocabulary=vocabulary)
+    timer.run("load_frames", manager.load_and_preprocess_data, rows_out=len)
+    timer.run("vectorize_skills", lambda: manager.vectorize_skills(), rows_in=len(manager.df),
+              rows_out=lambda X: X.shape[0])
+    timer.run("run_clustering",
+              lambda: manager.run_clustering(args.k, algorithm=args.algorithm, n_init=args.n_init),
+              rows_in=len(manager.df))
+
+    def skill_gap():
+        return manager.analyze_skill_gap(manager.analyze_salaries(plot=False), plot=False)
+
+    timer.run("analyze_skill_gap", skill_gap, rows_in=len(manager.df), rows_out=len)
+
+    salary = SalaryModelManager(artifacts=artifacts, vocabulary=vocabulary)
+    platforms = [CollectionEnum.NO_FLUFF_JOBS, CollectionEnum.JUST_JOIN]
+    timer.run("train_and_evaluate", lambda: [salary.train_and_evaluate(p, plot=False) for p in platforms], rows_in=n)
+
+    cloud = JobDataCloudImageGenerator(cache_dir=os.path.join(workdir, f"word_clouds_{n}"))
+    frequencies = timer.run("word_cloud_counts", lambda: cloud._platform_frequencies(platforms), rows_in=n,
+                            rows_out=lambda counts: sum(len(c) for c in counts.values()))
+
+    def word_clouds():
+        return word_cloud_images(frequencies, cloud.wc_params, cloud.max_words, cloud.cache_dir)
+
+    timer.run("word_cloud_render", word_clouds, rows_out=len)
+    timer.run("word_cloud_cached", word_clouds, rows_out=len)
+
+    if not args.keep_db:
+        MongoAccess.client().drop_database(db_name)
+    return timer.stages
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--in-memory", action="store_true", help="Use mongomock instead of a mongod")
+    arg_parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/")
+    arg_parser.add_argument("--vocab", type=int, default=400)
+    arg_parser.add_argument("--k", type=int, default=12)
+    arg_parser.add_argument("--algorithm", default="kmeans", choices=JobClusterManager.CLUSTERING_ALGORITHMS)
+    arg_parser.add_argument("--n-init", type=int, default=1)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows stages down)")
+    arg_parser.add_argument("--keep-db", action="store_true", help="Keep the benchmark databases")
+    arg_parser.add_argument("--output", help="JSON results path (default benchmarks/results/pipeline-<commit>.json)")
+    args = arg_parser.parse_args()
+
+    commit, dirty = git_revision()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": "mongomock" if args.in_memory else "mongod",
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "keep_db")},
+        "sizes": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as workdir:
+        for n in args.sizes:
+            print(f"\n=== {n} postings ===")
+            results["sizes"][str(n)] = bench_size(n, args, workdir)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{(commit or 'unknown')[:10]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
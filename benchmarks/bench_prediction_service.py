@@ -0,0 +1,103 @@
+"""
+Benchmark: SalaryPredictionService micro-batching vs. one predict() per request.
+
+Fits a salary pipeline on synthetic postings, then fires requests from
+concurrent client threads at the service and at a naive per-request
+predict, reporting throughput and p50/p99 latency.
+
+    python -m benchmarks.bench_prediction_service
+    python -m benchmarks.bench_prediction_service --requests 50000 --clients 32 --cache-size 0
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from SalaryModelManager import SalaryModelManager
+from SalaryPredictionService import SalaryPredictionService
+from SkillVocabulary import SkillVocabulary
+from benchmarks.synthetic_jobs import generate_postings
+
+
+def training_frame(n, seed=42):
+    rows = []
+    for source in ("nofluffjobs", "justjoin"):
+        for posting in generate_postings(n // 2, source=source, seed=seed):
+            if posting["min_salary"] is None:
+                continue
+            rows.append({
+                "location": "Remote" if posting["remote"] else posting["city"],
+                "source": source,
+                "job_level": SalaryModelManager._categorize_job_level(posting["title"]),
+                "must_have_skills": [skill.lower() for skill in posting["skills"]],
+                "avg_salary": (posting["min_salary"] + posting["max_salary"]) / 2,
+            })
+    return pd.DataFrame(rows)
+
+
+def run_clients(call, requests, clients):
+    """
+    Issue `requests` calls from `clients` threads; returns (seconds, latencies).
+    """
+    def one(features):
+        start = time.perf_counter()
+        call(features)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = list(executor.map(one, requests))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def report(label, seconds, latencies):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{label:<22}{len(latencies) / seconds:>12.0f}{p50:>10.2f}{p99:>10.2f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--train-rows", type=int, default=20000)
+    arg_parser.add_argument("--requests", type=int, default=20000)
+    arg_parser.add_argument("--clients", type=int, default=16)
+    arg_parser.add_argument("--max-batch", type=int, default=256)
+    arg_parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    arg_parser.add_argument("--cache-size", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    df = training_frame(args.train_rows)
+    workdir = tempfile.mkdtemp(prefix="bench_prediction_")
+    manager = SalaryModelManager(vocabulary=SkillVocabulary(path=os.path.join(workdir, "vocabulary.json")))
+    features = manager.categorical_features + [manager.SKILL_FEATURE]
+    manager.vocabulary.encode(df[manager.SKILL_FEATURE], grow=True)
+    pipeline = manager._build_pipeline("forest")
+    pipeline.fit(df[features], df["avg_salary"])
+
+    rng = np.random.default_rng(0)
+    sample = df.iloc[rng.integers(len(df), size=args.requests)]
+    requests = [
+        SalaryPredictionService.features(row.location, row.source, row.job_level, skills=row.must_have_skills)
+        for row in sample.itertuples()
+    ]
+
+    service = SalaryPredictionService(pipeline, max_batch=args.max_batch,
+                                      max_wait_ms=args.max_wait_ms, cache_size=args.cache_size)
+    print(f"{'mode':<22}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    naive_requests = requests[: max(1, args.requests // 20)]
+    seconds, latencies = run_clients(lambda f: pipeline.predict(service._frame([f])), naive_requests, args.clients)
+    report("predict per request", seconds, latencies)
+
+    seconds, latencies = run_clients(lambda f: service.submit(f).result(), requests, args.clients)
+    report("micro-batched service", seconds, latencies)
+    stats = service.stats()
+    service.close()
+    print(f"\nbatches: {stats['batches']}, avg rows/batch: {stats['avg_batch_rows']}, "
+          f"cache hits: {stats['cache_hits']}/{stats['requests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: SalaryModelManager feature engineering at 100k+ postings.
+
+Compares the per-row job level apply with the vectorized str.contains /
+np.select version, builds the category + multi-hot skill matrix of the
+salary pipeline and reports its sparse footprint against the dense
+equivalent. With --fit the forest is trained with and without skill
+features and the hold-out MAE is compared.
+
+    python -m benchmarks.bench_salary_features
+    python -m benchmarks.bench_salary_features --sizes 100000 500000 --fit --trees 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from scipy import sparse
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+from SalaryModelManager import SalaryModelManager
+from SkillVocabulary import SkillVocabulary
+from benchmarks.synthetic_jobs import generate_postings
+
+
+def salary_frame(n, seed, vocab_size):
+    """
+    The frame _fetch_and_clean_data would load, minus job_level.
+    """
+    rows = []
+    for source in ("nofluffjobs", "justjoin"):
+        for posting in generate_postings(n // 2, source=source, seed=seed, vocab_size=vocab_size):
+            if posting["min_salary"] is None:
+                continue
+            rows.append({
+                "location": "Remote" if posting["remote"] else posting["city"],
+                "source": source,
+                "job_title": posting["title"],
+                "must_have_skills": [skill.lower() for skill in posting["skills"]],
+                "avg_salary": (posting["min_salary"] + posting["max_salary"]) / 2,
+            })
+    return pd.DataFrame(rows)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def matrix_mb(matrix):
+    if sparse.issparse(matrix):
+        matrix = matrix.tocsr()
+        return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+    return matrix.nbytes / 2**20
+
+
+def bench_size(n, args, manager):
+    df = salary_frame(n, args.seed, args.vocab)
+    print(f"\n=== {len(df)} postings with salary ===")
+
+    applied, apply_s = timed(lambda: df["job_title"].apply(manager._categorize_job_level))
+    vectorized, vectorized_s = timed(lambda: manager._job_levels(df["job_title"]))
+    assert (applied.to_numpy() == vectorized.to_numpy()).all()
+    print(f"  job_level apply       {apply_s:>10.3f}s")
+    print(f"  job_level vectorized  {vectorized_s:>10.3f}s  ({apply_s / max(vectorized_s, 1e-9):.1f}x)")
+    df["job_level"] = vectorized
+
+    _, grow_s = timed(lambda: manager.vocabulary.encode(df[manager.SKILL_FEATURE], grow=True))
+    features = manager.categorical_features + [manager.SKILL_FEATURE]
+    preprocessor = manager._build_pipeline("forest").named_steps["preprocessor"]
+    X, transform_s = timed(lambda: preprocessor.fit_transform(df[features]))
+    dense_mb = X.shape[0] * X.shape[1] * 8 / 2**20
+    print(f"  vocabulary encode     {grow_s:>10.3f}s")
+    print(f"  feature matrix        {transform_s:>10.3f}s  {X.shape[0]} x {X.shape[1]}, "
+          f"nnz {X.nnz}, {matrix_mb(X):.1f} MB sparse vs {dense_mb:.1f} MB dense")
+
+    if not args.fit:
+        return
+
+    train, test = train_test_split(df, test_size=0.2, random_state=42)
+    for label, skills in (("categories only", False), ("categories + skills", True)):
+        columns = manager.categorical_features + ([manager.SKILL_FEATURE] if skills else [])
+        pipeline = manager._build_pipeline("forest", skills=skills)
+        pipeline.set_params(regressor__n_estimators=args.trees)
+        _, fit_s = timed(lambda: pipeline.fit(train[columns], train["avg_salary"]))
+        mae = mean_absolute_error(test["avg_salary"], pipeline.predict(test[columns]))
+        print(f"  fit {label:<20}{fit_s:>10.3f}s  MAE {mae:.0f} PLN")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 300_000])
+    arg_parser.add_argument("--vocab", type=int, default=2000)
+    arg_parser.add_argument("--min-skill-count", type=int, default=5)
+    arg_parser.add_argument("--fit", action="store_true", help="Also train the forest with and without skills")
+    arg_parser.add_argument("--trees", type=int, default=30)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_salary_features_") as workdir:
+        for n in args.sizes:
+            vocabulary = SkillVocabulary(path=os.path.join(workdir, f"vocabulary_{n}.json"))
+            manager = SalaryModelManager(vocabulary=vocabulary, min_skill_count=args.min_skill_count)
+            bench_size(n, args, manager)
+
+
+if __name__ == "__main__":
+    main()
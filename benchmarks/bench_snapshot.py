@@ -0,0 +1,96 @@
+"""
+Benchmark: loading postings from a Parquet snapshot.
+
+Synthetic postings (half NoFluff, half JustJoin) are exported with
+SnapshotStore, then the reads of the analytics classes are timed against
+the memory-mapped dataset: the JobClusterManager frame, the salary frame
+of one platform and the word-cloud skill counts.
+
+    python -m benchmarks.bench_snapshot
+    python -m benchmarks.bench_snapshot --sizes 100000 1000000 --repeat 5
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from SnapshotStore import SnapshotStore
+from constant import CollectionEnum
+from benchmarks.synthetic_jobs import generate_postings
+
+
+CLUSTER_FIELDS = ["job_title", "company_name", "must_have_skills", "min_salary", "max_salary", "source", "jump_url"]
+SALARY_FIELDS = ["source", "job_title", "min_salary", "max_salary", "location", "must_have_skills"]
+SKILL_QUERY = {"must_have_skills": {"$exists": True, "$ne": []}}
+
+
+def job_documents(n, source, seed, vocab_size, days=14):
+    """
+    Processed-job documents as the scrapers store them, spread over `days` scrape dates.
+    """
+    today = datetime.now().replace(hour=6, minute=0, second=0, microsecond=0)
+    for i, posting in enumerate(generate_postings(n, source=source, seed=seed, vocab_size=vocab_size)):
+        yield {
+            "source": source,
+            "job_title": posting["title"],
+            "company_name": posting["company"],
+            "min_salary": posting["min_salary"],
+            "max_salary": posting["max_salary"],
+            "location": "Remote" if posting["remote"] else posting["city"],
+            "jump_url": f"https://example.com/{posting['slug']}",
+            "must_have_skills": [skill.lower() for skill in posting["skills"]],
+            "processed_at": today - timedelta(days=i % days),
+            "query_term": "bench",
+        }
+
+
+def timed(fn, repeat):
+    """
+    Best-of-`repeat` wall time and the last result.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def bench_size(n, args, workdir):
+    store = SnapshotStore(root=workdir, keep_snapshots=1)
+    start = time.perf_counter()
+    snapshot = store.export(f"bench_{n}", sources={
+        "jobs_processed": job_documents(n // 2, "nofluffjobs", args.seed, args.vocab),
+        "jobs_processed_jj": job_documents(n - n // 2, "justjoin", args.seed + 1, args.vocab),
+    })
+    print(f"  {'export':<20}{time.perf_counter() - start:>10.3f}s")
+
+    repositories = [snapshot.jobs_for(p) for p in (CollectionEnum.NO_FLUFF_JOBS, CollectionEnum.JUST_JOIN)]
+    seconds, frames = timed(lambda: [r.load_frame(CLUSTER_FIELDS, SKILL_QUERY) for r in repositories], args.repeat)
+    print(f"  {'cluster frame':<20}{seconds:>10.3f}s  {sum(len(f) for f in frames)} rows")
+    seconds, frame = timed(lambda: repositories[1].load_frame(SALARY_FIELDS), args.repeat)
+    print(f"  {'salary frame':<20}{seconds:>10.3f}s  {len(frame)} rows")
+    seconds, counts = timed(lambda: [r.skill_counts(15) for r in repositories], args.repeat)
+    print(f"  {'skill counts':<20}{seconds:>10.3f}s  top: {counts[0][:3]}")
+    lengths = frames[0]["must_have_skills"].map(len).to_numpy()
+    print(f"  {'skills/posting':<20}{np.mean(lengths):>10.2f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    arg_parser.add_argument("--vocab", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_snapshot_") as workdir:
+        for n in args.sizes:
+            print(f"\n=== {n} postings ===")
+            bench_size(n, args, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: dense vs. sparse (CSR) clustering in JobClusterManager.
+
+Builds synthetic TF-IDF skill matrices with Zipf-distributed skills and
+compares, per corpus size, the legacy dense path (toarray + KMeans + cdist)
+with KMeans and MiniBatchKMeans on CSR input. Reports fit time, distortion
+time and peak traced memory. The dense path is skipped when its matrix alone
+would exceed --max-dense-gb.
+
+    python -m benchmarks.bench_sparse_clustering
+    python -m benchmarks.bench_sparse_clustering --sizes 10000 100000 --output results.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+from scipy import sparse
+from scipy.spatial.distance import cdist
+from sklearn.feature_extraction.text import TfidfTransformer
+
+from JobClusterManager import JobClusterManager
+
+
+def synthetic_tfidf(n_jobs, vocab_size=400, mean_skills=6, zipf_s=1.1, seed=42):
+    """
+    CSR TF-IDF matrix of `n_jobs` postings with Zipf-distributed skill ids.
+    """
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, vocab_size + 1)
+    p = 1.0 / ranks ** zipf_s
+    p /= p.sum()
+
+    lengths = np.clip(rng.poisson(mean_skills, n_jobs), 1, None)
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    indices = rng.choice(vocab_size, size=indptr[-1], p=p)
+    counts = sparse.csr_matrix((np.ones_like(indices, dtype=np.float64), indices, indptr),
+                               shape=(n_jobs, vocab_size))
+    counts.sum_duplicates()
+    return TfidfTransformer().fit_transform(counts).tocsr()
+
+
+def run_case(X, mode, algorithm, k, n_init):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    data = X.toarray() if mode == "dense" else X
+    km = JobClusterManager.make_kmeans(k, algorithm, n_init=n_init)
+    km.fit(data)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if mode == "dense":
+        distortion = float(np.mean(np.min(cdist(data, km.cluster_centers_, 'euclidean'), axis=1)))
+    else:
+        distortion = JobClusterManager.distortion(data, km.cluster_centers_)
+    distortion_s = time.perf_counter() - start
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"fit_s": round(fit_s, 3), "distortion_s": round(distortion_s, 3),
+            "peak_mb": round(peak / 2**20, 1), "distortion": round(distortion, 4)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    arg_parser.add_argument("--vocab", type=int, default=400)
+    arg_parser.add_argument("--k", type=int, default=12)
+    arg_parser.add_argument("--n-init", type=int, default=1)
+    arg_parser.add_argument("--max-dense-gb", type=float, default=4.0)
+    arg_parser.add_argument("--output", help="Write results as JSON to this path")
+    args = arg_parser.parse_args()
+
+    cases = (("dense", "kmeans"), ("sparse", "kmeans"), ("sparse", "minibatch"))
+    results = []
+    print(f"{'jobs':>10} {'mode':<8}{'algorithm':<11}{'fit s':>9}{'dist s':>9}{'peak MB':>10}")
+    for n in args.sizes:
+        X = synthetic_tfidf(n, vocab_size=args.vocab)
+        dense_gb = n * args.vocab * 8 / 2**30
+        for mode, algorithm in cases:
+            row = {"jobs": n, "mode": mode, "algorithm": algorithm, "nnz": int(X.nnz)}
+            if mode == "dense" and dense_gb > args.max_dense_gb:
+                row["skipped"] = f"dense matrix needs {dense_gb:.1f} GB"
+                print(f"{n:>10} {mode:<8}{algorithm:<11}  skipped ({row['skipped']})")
+            else:
+                row.update(run_case(X, mode, algorithm, args.k, args.n_init))
+                print(f"{n:>10} {mode:<8}{algorithm:<11}{row['fit_s']:>9}{row['distortion_s']:>9}{row['peak_mb']:>10}")
+            results.append(row)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
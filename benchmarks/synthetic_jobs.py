@@ -0,0 +1,175 @@
+"""
+Reproducible synthetic job postings for the benchmarks.
+
+Postings get realistic titles, companies, salaries and locations and
+Zipf-distributed skill lists, and can be rendered in both source formats:
+NoFluff "load more" listing HTML and JustJoin `by-cursor` API pages.
+
+    from benchmarks.synthetic_jobs import generate_postings, nofluff_listing_html
+    postings = generate_postings(10_000, source="nofluffjobs")
+    html = nofluff_listing_html(postings)
+"""
+import html as html_lib
+
+import numpy as np
+
+from NoFluffListingParser import BASE_DOMAIN
+from benchmarks.bench_listing_parser import CARD_TEMPLATE
+
+
+# Most frequent first; the tail is padded with generated names up to vocab_size
+SKILLS = (
+    "Python", "Java", "SQL", "JavaScript", "TypeScript", "Docker", "Git", "AWS", "Kubernetes",
+    "React", "Spring Boot", "C#", ".NET", "Linux", "PostgreSQL", "Angular", "Node.js", "REST API",
+    "Kotlin", "Go", "Azure", "Terraform", "Microservices", "Kafka", "MongoDB", "Django", "CI/CD",
+    "GCP", "Redis", "Scala", "C++", "C", "PHP", "Hibernate", "Jenkins", "Vue.js", "Spark",
+    "Elasticsearch", "RabbitMQ", "GraphQL", "Flask", "FastAPI", "Airflow", "Pandas", "Rust",
+    "Oracle", "MySQL", "Ansible", "Selenium", "English", "Scrum", "Machine Learning",
+)
+
+LEVELS = ("Senior", "Junior", "Mid", "Regular", "Lead", "")
+LEVEL_WEIGHTS = (0.30, 0.12, 0.15, 0.13, 0.05, 0.25)
+LEVEL_BASE_SALARY = {"Senior": 24000, "Junior": 8000, "Mid": 15000, "Regular": 15000, "Lead": 28000, "": 16000}
+ROLES = (
+    "Python Developer", "Java Engineer", "Backend Developer", ".NET Developer", "Data Engineer",
+    "DevOps Engineer", "Frontend Developer", "Fullstack Developer", "QA Automation Engineer",
+    "Go Developer", "Machine Learning Engineer", "Platform Engineer",
+)
+COMPANY_PREFIXES = ("Nova", "Blue", "Data", "Cloud", "Code", "Smart", "Bit", "Next", "Green", "Pixel")
+COMPANY_SUFFIXES = ("Soft", "Labs", "Systems", "Tech", "Works", "Solutions", "Group", "Digital")
+CITIES = ("Warszawa", "Kraków", "Wrocław", "Gdańsk", "Poznań", "Łódź", "Katowice", "Lublin")
+REMOTE_SHARE = 0.35
+UNDISCLOSED_SHARE = 0.2
+
+
+def skill_universe(vocab_size):
+    names = list(SKILLS[:vocab_size])
+    names += [f"Skill-{i}" for i in range(len(names), vocab_size)]
+    return names
+
+
+def generate_postings(n, source="nofluffjobs", seed=42, vocab_size=400, mean_skills=6, zipf_s=1.1):
+    """
+    `n` synthetic postings as dicts with slug, title, level, company, city,
+    remote, min_salary, max_salary (None when undisclosed) and skills.
+    """
+    rng = np.random.default_rng(seed)
+    skills = skill_universe(vocab_size)
+    p = 1.0 / np.arange(1, vocab_size + 1) ** zipf_s
+    p /= p.sum()
+
+    levels = rng.choice(len(LEVELS), size=n, p=LEVEL_WEIGHTS)
+    roles = rng.integers(len(ROLES), size=n)
+    companies = rng.integers(len(COMPANY_PREFIXES) * len(COMPANY_SUFFIXES) * 50, size=n)
+    cities = rng.integers(len(CITIES), size=n)
+    remote = rng.random(n) < REMOTE_SHARE
+    undisclosed = rng.random(n) < UNDISCLOSED_SHARE
+    spread = rng.uniform(1.0, 1.5, size=n)
+    noise = rng.lognormal(0.0, 0.2, size=n)
+
+    lengths = np.clip(rng.poisson(mean_skills, n), 1, None)
+    skill_ids = rng.choice(vocab_size, size=int(lengths.sum()), p=p)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    postings = []
+    for i in range(n):
+        level = LEVELS[levels[i]]
+        title = f"{level} {ROLES[roles[i]]}".strip()
+        company_id = companies[i]
+        company = (f"{COMPANY_PREFIXES[company_id % len(COMPANY_PREFIXES)]}"
+                   f"{COMPANY_SUFFIXES[(company_id // len(COMPANY_PREFIXES)) % len(COMPANY_SUFFIXES)]}"
+                   f" {company_id}")
+        if undisclosed[i]:
+            min_salary = max_salary = None
+        else:
+            min_salary = float(round(LEVEL_BASE_SALARY[level] * noise[i], -2))
+            max_salary = float(round(min_salary * spread[i], -2))
+        # Unique, order-preserving skill list of the posting
+        posting_skills = list(dict.fromkeys(skills[j] for j in skill_ids[offsets[i]:offsets[i + 1]]))
+        postings.append({
+            "slug": f"{source}-{title.lower().replace(' ', '-').replace('.', '')}-{i}",
+            "title": title,
+            "level": level,
+            "company": company,
+            "city": CITIES[cities[i]],
+            "remote": bool(remote[i]),
+            "min_salary": min_salary,
+            "max_salary": max_salary,
+            "skills": posting_skills,
+        })
+    return postings
+
+
+def _pln(value):
+    return f"{int(value):,}".replace(",", " ")
+
+
+def nofluff_listing_html(postings):
+    """
+    NoFluff listing page with one card per posting (cards carry no skills,
+    those come from the detail pages).
+    """
+    cards = []
+    for i, posting in enumerate(postings):
+        if posting["min_salary"] is None:
+            salary = "Undisclosed"
+        elif posting["min_salary"] == posting["max_salary"]:
+            salary = f"{_pln(posting['min_salary'])} PLN"
+        else:
+            salary = f"{_pln(posting['min_salary'])}&nbsp;–&nbsp;{_pln(posting['max_salary'])} PLN"
+        city = "Remote" if posting["remote"] else f"{posting['city']} +{i % 3}" if i % 3 else posting["city"]
+        cards.append(CARD_TEMPLATE.format(
+            slug=posting["slug"],
+            title=html_lib.escape(posting["title"]),
+            company=html_lib.escape(posting["company"]),
+            salary=salary,
+            city=city,
+        ))
+    return f"<html><body><nfj-postings-list><div class='list-container'>{''.join(cards)}</div></nfj-postings-list></body></html>"
+
+
+def nofluff_skills(postings):
+    """
+    (jump_url, must_have_skills) pairs as the detail-page enrichment would store them.
+    """
+    return [(f"{BASE_DOMAIN}/pl/job/{posting['slug']}", [s.lower() for s in posting["skills"]])
+            for posting in postings]
+
+
+def _employment_type(posting, i):
+    if posting["min_salary"] is None:
+        return {"type": "b2b", "from": None, "to": None, "currency": "pln", "unit": "month"}
+    # A share of offers is quoted per day or per hour, as on JustJoin
+    unit = ("month", "month", "day", "hour")[i % 4]
+    divisor = {"month": 1, "day": 20, "hour": 160}[unit]
+    return {
+        "type": "b2b",
+        "from": round(posting["min_salary"] / divisor, 2),
+        "to": round(posting["max_salary"] / divisor, 2),
+        "currency": "pln",
+        "unit": unit,
+    }
+
+
+def justjoin_api_pages(postings, page_size=100):
+    """
+    Yield `by-cursor` API responses ({"data": [...], "meta": {...}}) over the postings.
+    """
+    total = len(postings)
+    for start in range(0, total, page_size):
+        data = [
+            {
+                "slug": posting["slug"],
+                "title": posting["title"],
+                "companyName": posting["company"],
+                "city": "Remote" if posting["remote"] else posting["city"],
+                "requiredSkills": posting["skills"],
+                "employmentTypes": [_employment_type(posting, start + i)],
+            }
+            for i, posting in enumerate(postings[start:start + page_size])
+        ]
+        next_cursor = start + page_size if start + page_size < total else None
+        yield {
+            "data": data,
+            "meta": {"totalItems": total, "next": {"cursor": next_cursor, "itemsCount": page_size}},
+        }
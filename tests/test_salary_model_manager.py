@@ -0,0 +1,87 @@
+"""
+SalaryModelManager.train_all with skill features on threads sharing one
+SkillVocabulary, on synthetic postings instead of MongoDB.
+
+    python -m pytest tests
+"""
+import pickle
+import threading
+
+import joblib
+import pytest
+
+from ArtifactStore import ArtifactStore
+from SalaryModelManager import SalaryModelManager
+from SkillVocabulary import SkillVocabulary
+from constant import CollectionEnum
+from benchmarks.bench_salary_features import salary_frame
+
+# Different seeds and skill universes, so both threads add skills to the vocabulary
+PLATFORM_DATA = {
+    CollectionEnum.NO_FLUFF_JOBS: {"n": 2000, "seed": 1, "vocab_size": 300},
+    CollectionEnum.JUST_JOIN: {"n": 2000, "seed": 2, "vocab_size": 600},
+}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    frames = {}
+    for platform, spec in PLATFORM_DATA.items():
+        df = salary_frame(spec["n"], spec["seed"], spec["vocab_size"])
+        df["job_level"] = SalaryModelManager._job_levels(df["job_title"])
+        frames[platform] = df
+
+    monkeypatch.setattr(SalaryModelManager, "_init_db", lambda self, *args: None)
+    monkeypatch.setattr(SalaryModelManager, "_fetch_and_clean_data", lambda self, platform: frames[platform].copy())
+    vocabulary = SkillVocabulary(path=str(tmp_path / "skill_vocabulary.json"))
+    return SalaryModelManager(artifacts=ArtifactStore(str(tmp_path / "artifacts")),
+                              vocabulary=vocabulary, min_skill_count=1)
+
+
+def test_train_all_with_skills_on_threads(manager, tmp_path):
+    models = manager.train_all(list(PLATFORM_DATA), plot=False, skills=True, n_jobs=1)
+
+    assert set(models) == set(PLATFORM_DATA)
+    for platform, model in models.items():
+        df = manager._fetch_and_clean_data(platform)
+        features = manager.categorical_features + [manager.SKILL_FEATURE]
+        assert len(model.predict(df[features].head(50))) == 50
+        # The stored pipeline pickles a consistent copy of the shared vocabulary
+        vocabulary = joblib.load(next((tmp_path / "artifacts").glob(
+            f"salary_model_{platform.name.lower()}/*/artifact.joblib"
+        ))).named_steps["preprocessor"].named_transformers_["skills"].vocabulary
+        assert len(vocabulary.terms) == len(vocabulary.ids)
+        assert all(vocabulary.ids[term] == i for i, term in enumerate(vocabulary.terms))
+
+    # Both threads' training skills were registered and persisted
+    skills = {skill for df in map(manager._fetch_and_clean_data, PLATFORM_DATA)
+              for skills in df[manager.SKILL_FEATURE] for skill in skills}
+    saved = SkillVocabulary.load(manager.vocabulary.path)
+    assert saved.terms == manager.vocabulary.terms
+    assert set(saved.terms) <= skills
+    assert any(term.startswith("skill-") and int(term[6:]) >= 300 for term in saved.terms)
+
+
+def test_vocabulary_pickles_while_growing(tmp_path):
+    vocabulary = SkillVocabulary(path=str(tmp_path / "skill_vocabulary.json"))
+    done = threading.Event()
+    errors = []
+
+    def grow():
+        try:
+            for start in range(0, 20000, 50):
+                vocabulary.encode([[f"skill {i}" for i in range(start, start + 50)]], grow=True)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    thread = threading.Thread(target=grow)
+    thread.start()
+    while not done.is_set():
+        copy = pickle.loads(pickle.dumps(vocabulary))
+        assert len(copy.terms) == len(copy.ids)
+    thread.join()
+
+    assert not errors
+    assert len(pickle.loads(pickle.dumps(vocabulary))) == 20000